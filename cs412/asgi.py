@@ -3,6 +3,10 @@ ASGI config for cs412 project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project with an ASGI server (e.g. ``uvicorn cs412.asgi:application``) so the
+asynchronous news feed stream (gaming.views.NewsFeedStreamView) can hold many open
+connections without tying up a worker thread per subscriber.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
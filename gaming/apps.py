@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GamingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "gaming"
+
+    def ready(self):
+        # Connect the handlers that keep derived tables in sync
+        from . import checks, signals  # noqa: F401
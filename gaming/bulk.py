@@ -0,0 +1,549 @@
+# gaming/bulk.py
+
+"""
+Bulk Progress Writes for the Gaming Application.
+
+Writing Progress entries one save() at a time costs several queries per entry, from the
+save itself and from the signal handlers that keep derived data in step. The bulk paths in
+this module write many entries with bulk_create and bulk_update instead, and bring the
+derived data (rollups, leaderboards, cached summaries and feed fragments, friend
+suggestions) in step once per batch, since bulk writes bypass the model signals.
+
+Constants:
+- IMPORT_COLUMNS: The columns of a game-library export.
+- IMPORT_CHUNK_SIZE: Number of rows written per import transaction.
+- MAX_IMPORT_COUNT: Largest accepted hours_played or achievements value of an imported row.
+- MAX_BATCH_SESSIONS: Maximum number of play sessions in one ingested batch.
+- SESSION_LIMITS: Largest accepted value of each play-session field.
+
+Functions:
+- sync_progress_writes: Update the data derived from Progress after bulk writes.
+- read_library: Parse a CSV or JSON game-library export into rows.
+- import_library: Import game-library rows into a user's progress.
+- bulk_edit_progress: Set the completion status and/or platform of several of a user's entries.
+- clean_sessions: Validate a batch of play-session events.
+- ingest_sessions: Apply a batch of play sessions to a user's progress, once per batch id.
+"""
+
+import csv
+import io
+import json
+import time
+from datetime import date
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Lower, Mod
+
+from .feed import bump_content_version
+from .leaderboards import invalidate_leaderboards
+from .models import FeedItem, Game, Genre, Platform, Profile, Progress, SessionBatch, StatusMessage
+from .pagination import MAX_ID
+from .rollups import apply_changes
+from .stats import invalidate_summary
+from .suggestions import progress_changed
+
+IMPORT_COLUMNS = (
+    'title', 'platform', 'completion_status', 'hours_played', 'achievements', 'rating', 'notes',
+    'genre', 'release_date', 'developer', 'publisher',
+)
+
+IMPORT_CHUNK_SIZE = 500
+
+# The range of the PositiveIntegerField columns; larger values overflow at insert time
+MAX_IMPORT_COUNT = 2 ** 31 - 1
+
+MAX_BATCH_SESSIONS = 1000
+
+# Values above these would overflow the id columns or, summed over a batch, the counters
+SESSION_LIMITS = {
+    'game_id': MAX_ID,
+    'platform_id': MAX_ID,
+    'minutes': 24 * 60,
+    'achievements': 1000,
+}
+
+# Number of imported game titles named in the summarizing status message
+ANNOUNCED_TITLES = 3
+
+
+def sync_progress_writes(user_id, changes, updated_ids=(), mark_suggestions=True):
+    """
+    Update the data derived from a user's Progress entries after bulk writes.
+
+    Does what the Progress signal handlers do for single saves: applies the rollup deltas,
+    invalidates the touched leaderboards and the cached summary, and invalidates the cached
+    feed fragments of updated entries. The friend suggestions the changes may affect are
+    marked stale once the transaction commits. Call it inside the transaction of the writes.
+
+    Args:
+        user_id (int): The primary key of the user whose entries were written.
+        changes (list): (old state, new state) pairs as returned by Progress.rollup_state.
+        updated_ids (iterable): Primary keys of the updated (not created) entries.
+        mark_suggestions (bool): If False, the caller marks the friend suggestions stale itself,
+            e.g. once after several batches.
+
+    Returns:
+        None
+    """
+    invalidate_leaderboards(apply_changes(changes))
+    invalidate_summary(user_id)
+    content_type_id = ContentType.objects.get_for_model(Progress).pk
+    for pk in updated_ids:
+        bump_content_version(content_type_id, pk)
+    if mark_suggestions:
+        game_ids = {state['game_id'] for pair in changes for state in pair if state is not None}
+        transaction.on_commit(lambda: progress_changed(user_id, game_ids))
+
+
+def read_library(uploaded_file):
+    """
+    Parse a game-library export into rows.
+
+    CSV exports need a header row naming IMPORT_COLUMNS; JSON exports are a list of objects
+    with those keys, optionally wrapped as {"games": [...]}. Unknown columns are ignored.
+
+    Args:
+        uploaded_file (File): The uploaded export. A .json name or a leading '[' or '{' marks JSON.
+
+    Returns:
+        list: One dict per game, with the known columns as stripped strings.
+
+    Raises:
+        ValueError: If the file cannot be decoded or parsed.
+    """
+    try:
+        text = uploaded_file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("The file is not UTF-8 encoded text.")
+
+    if uploaded_file.name.lower().endswith('.json') or text.lstrip()[:1] in ('[', '{'):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"The file is not valid JSON: {error}")
+        if isinstance(data, dict):
+            data = data.get('games')
+        if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+            raise ValueError('A JSON export must be a list of games, or {"games": [...]}.')
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or 'title' not in reader.fieldnames:
+            raise ValueError("A CSV export needs a header row with at least a 'title' column.")
+        data = list(reader)
+
+    return [
+        {column: str(item[column]).strip() for column in IMPORT_COLUMNS if item.get(column) not in (None, '')}
+        for item in data
+    ]
+
+
+def _clean_row(row, platforms, genres):
+    """
+    Validate one library row and convert its values.
+
+    Returns:
+        dict: The converted values, keyed by IMPORT_COLUMNS; platform and genre are instances.
+
+    Raises:
+        ValueError: With a message for the row's first invalid value.
+    """
+    cleaned = {'title': row.get('title', '')}
+    if not cleaned['title']:
+        raise ValueError("The title is missing.")
+
+    cleaned['platform'] = platforms.get(row.get('platform', '').lower())
+    if cleaned['platform'] is None:
+        raise ValueError(f"Unknown platform '{row.get('platform', '')}'.")
+
+    if 'completion_status' in row:
+        statuses = {status.lower(): status for status in Progress.STATUS_KEYS}
+        cleaned['completion_status'] = statuses.get(row['completion_status'].lower())
+        if cleaned['completion_status'] is None:
+            raise ValueError(f"Unknown completion status '{row['completion_status']}'.")
+
+    for column in ('hours_played', 'achievements', 'rating'):
+        if column in row:
+            try:
+                cleaned[column] = int(row[column])
+            except ValueError:
+                raise ValueError(f"{column} must be a whole number.")
+            if cleaned[column] < 0:
+                raise ValueError(f"{column} cannot be negative.")
+            if cleaned[column] > MAX_IMPORT_COUNT:
+                raise ValueError(f"{column} cannot be more than {MAX_IMPORT_COUNT}.")
+    if 'rating' in cleaned and not 1 <= cleaned['rating'] <= 5:
+        raise ValueError("rating must be between 1 and 5.")
+
+    if 'genre' in row:
+        cleaned['genre'] = genres.get(row['genre'].lower())
+        if cleaned['genre'] is None:
+            raise ValueError(f"Unknown genre '{row['genre']}'.")
+    if 'release_date' in row:
+        try:
+            cleaned['release_date'] = date.fromisoformat(row['release_date'])
+        except ValueError:
+            raise ValueError("release_date must be a YYYY-MM-DD date.")
+    for column in ('notes', 'developer', 'publisher'):
+        if column in row:
+            cleaned[column] = row[column]
+    return cleaned
+
+
+def _resolve_games(rows):
+    """
+    Find or create the games of a chunk of cleaned rows and make sure they list the rows' platforms.
+
+    Existing games are matched case-insensitively by title in one query. Missing games are
+    created with bulk_create, and missing game-platform links with one bulk_create on the
+    through table. Rows naming a missing game without its genre and release date fail.
+
+    Returns:
+        tuple: ({lowercased title: Game}, {row number: error message}, number of games created)
+    """
+    titles = {row['title'].lower() for row in rows.values()}
+    games = {}
+    for game in Game.objects.annotate(lower_title=Lower('title')).filter(lower_title__in=titles).order_by('-pk'):
+        games[game.lower_title] = game  # The oldest game wins when titles are duplicated
+
+    errors, new_games = {}, {}
+    for number, row in rows.items():
+        title = row['title'].lower()
+        if title in games or title in new_games:
+            continue
+        if 'genre' not in row or 'release_date' not in row:
+            errors[number] = f"'{row['title']}' is not a known game; give its genre and release_date to add it."
+            continue
+        new_games[title] = Game(
+            title=row['title'], genre=row['genre'], release_date=row['release_date'],
+            developer=row.get('developer', ''), publisher=row.get('publisher', ''),
+        )
+    Game.objects.bulk_create(new_games.values())
+    games.update(new_games)
+
+    Game.platforms.through.objects.bulk_create(
+        {
+            (games[row['title'].lower()].pk, row['platform'].pk): Game.platforms.through(
+                game_id=games[row['title'].lower()].pk, platform_id=row['platform'].pk,
+            )
+            for number, row in rows.items() if number not in errors
+        }.values(),
+        ignore_conflicts=True,
+    )
+    return games, errors, len(new_games)
+
+
+def _announce(user, summary, games):
+    """
+    Share one status message, and its feed item, summarizing a bulk change to some games.
+    """
+    profile = Profile.objects.filter(user=user).first()
+    if profile is None or not games:
+        return
+    titles = ', '.join(game.title for game in games[:ANNOUNCED_TITLES])
+    more = len(games) - ANNOUNCED_TITLES
+    message = f"{summary}: {titles}" + (f" and {more} more." if more > 0 else ".")
+    status = StatusMessage.objects.create(profile=profile, message=message)
+    FeedItem.objects.create(user=user, content_object=status)
+
+
+def import_library(user, rows, share_to_feed=True, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import game-library rows into a user's progress.
+
+    Each row is matched to the user's entry for the same game and platform, which is updated
+    with the row's values, or a new entry is created. Rows are written in chunks, each in one
+    transaction: games resolved in one query, entries read in one query, then written with
+    bulk_create and bulk_update. Invalid rows are reported and skipped; when a file names the
+    same game and platform twice, the last row wins.
+
+    Args:
+        user (User): The user whose progress is imported.
+        rows (list): Rows as returned by read_library.
+        share_to_feed (bool): If True, one status message and feed item announce the new games.
+        chunk_size (int): Number of rows written per transaction.
+
+    Returns:
+        dict: {'rows', 'created', 'updated', 'games_created', 'errors': [{'row', 'error'}],
+            'seconds', 'rows_per_second'}. Row numbers count data rows from 1.
+    """
+    started = time.perf_counter()
+    platforms = {platform.name.lower(): platform for platform in Platform.objects.all()}
+    genres = {}
+    for genre in Genre.objects.order_by('-pk'):
+        genres[genre.name.lower()] = genre
+
+    report = {'rows': len(rows), 'created': 0, 'updated': 0, 'games_created': 0, 'errors': []}
+    cleaned, errors = {}, {}
+    for number, row in enumerate(rows, start=1):
+        try:
+            cleaned[number] = _clean_row(row, platforms, genres)
+        except ValueError as error:
+            errors[number] = str(error)
+
+    numbers = list(cleaned)
+    imported_games = []
+    changed_game_ids = set()
+    for start in range(0, len(numbers), chunk_size):
+        chunk = {number: cleaned[number] for number in numbers[start:start + chunk_size]}
+        with transaction.atomic():
+            games, game_errors, games_created = _resolve_games(chunk)
+            errors.update(game_errors)
+            report['games_created'] += games_created
+
+            # Last row wins per (game, platform)
+            values = {}
+            for number, row in chunk.items():
+                if number not in game_errors:
+                    values[games[row['title'].lower()].pk, row['platform'].pk] = row
+
+            existing = {}
+            for progress in Progress.objects.filter(user=user, game_id__in={game_id for game_id, _ in values}):
+                existing.setdefault((progress.game_id, progress.platform_id), progress)
+
+            created, updated, changes = [], [], []
+            for (game_id, platform_id), row in values.items():
+                progress = existing.get((game_id, platform_id))
+                old_state = progress.rollup_state() if progress is not None else None
+                if progress is None:
+                    progress = Progress(user=user, platform=row['platform'])
+                    created.append(progress)
+                else:
+                    updated.append(progress)
+                progress.game = games[row['title'].lower()]
+                for column in ('completion_status', 'hours_played', 'achievements', 'rating', 'notes'):
+                    if column in row:
+                        setattr(progress, column, row[column])
+                progress.refresh_sort_columns()
+                changes.append((old_state, progress))
+
+            Progress.objects.bulk_create(created)
+            Progress.objects.bulk_update(updated, [
+                'completion_status', 'hours_played', 'achievements', 'rating', 'notes', 'status_key', 'game_title',
+            ])
+            sync_progress_writes(
+                user.pk,
+                [(old, progress.rollup_state()) for old, progress in changes],
+                [progress.pk for progress in updated],
+                mark_suggestions=False,
+            )
+        report['created'] += len(created)
+        report['updated'] += len(updated)
+        imported_games.extend(progress.game for progress in created)
+        changed_game_ids.update(progress.game_id for _, progress in changes)
+
+    if changed_game_ids:
+        transaction.on_commit(lambda: progress_changed(user.pk, changed_game_ids))
+    if share_to_feed:
+        imported_games = list(dict.fromkeys(imported_games))
+        _announce(user, f"Imported {len(imported_games)} games into my library", imported_games)
+
+    report['errors'] = [{'row': number, 'error': errors[number]} for number in sorted(errors)]
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    report['rows_per_second'] = round(len(rows) / report['seconds']) if report['seconds'] else len(rows)
+    return report
+
+
+def bulk_edit_progress(user, entries, completion_status=None, platform=None, share_to_feed=False):
+    """
+    Set the completion status and/or platform of several of a user's progress entries.
+
+    The entries are written with one bulk_update in one transaction, and entries that already
+    have the new values are skipped. When shared, one status message and feed item summarize
+    the change instead of one feed item per entry.
+
+    Args:
+        user (User): The owner of the entries.
+        entries (iterable): The Progress instances to edit, with their games selected.
+        completion_status (str): The new completion status, or None to keep each entry's.
+        platform (Platform): The new platform, or None to keep each entry's.
+        share_to_feed (bool): If True, announce the edited games in the user's feed.
+
+    Returns:
+        int: The number of entries changed.
+    """
+    values = {'completion_status': completion_status, 'platform_id': platform.pk if platform else None}
+    values = {field: value for field, value in values.items() if value is not None}
+    changes = []
+    for progress in entries:
+        if all(getattr(progress, field) == value for field, value in values.items()):
+            continue
+        old_state = progress.rollup_state()
+        for field, value in values.items():
+            setattr(progress, field, value)
+        progress.refresh_sort_columns()
+        changes.append((old_state, progress))
+    if not changes:
+        return 0
+
+    edited = [progress for _, progress in changes]
+    with transaction.atomic():
+        Progress.objects.bulk_update(edited, [*values, 'status_key', 'game_title'])
+        sync_progress_writes(
+            user.pk,
+            [(old, progress.rollup_state()) for old, progress in changes],
+            [progress.pk for progress in edited],
+        )
+        if share_to_feed:
+            games = list(dict.fromkeys(progress.game for progress in edited))
+            if completion_status:
+                summary = f"Marked {len(games)} games as {completion_status}" + (f" on {platform.name}" if platform else "")
+            else:
+                summary = f"Moved {len(games)} games to {platform.name}"
+            _announce(user, summary, games)
+    return len(edited)
+
+
+def clean_sessions(data):
+    """
+    Validate a batch of play-session events.
+
+    Args:
+        data (dict): The decoded request body: {'batch_id': str, 'sessions': [{'game': game id,
+            'platform': platform id, 'minutes': int, 'achievements': int (optional)}]}.
+
+    Returns:
+        tuple: (batch id, list of sessions as {'game_id', 'platform_id', 'minutes', 'achievements'})
+
+    Raises:
+        ValueError: With a message for the first invalid value; the whole batch is rejected.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The body must be a JSON object.")
+    batch_id = data.get('batch_id')
+    max_length = SessionBatch._meta.get_field('batch_id').max_length
+    if not isinstance(batch_id, str) or not 0 < len(batch_id) <= max_length:
+        raise ValueError(f"batch_id must be a non-empty string of at most {max_length} characters.")
+    events = data.get('sessions')
+    if not isinstance(events, list) or not events:
+        raise ValueError("sessions must be a non-empty list.")
+    if len(events) > MAX_BATCH_SESSIONS:
+        raise ValueError(f"A batch can hold at most {MAX_BATCH_SESSIONS} sessions.")
+
+    sessions = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise ValueError(f"Session {index} must be an object.")
+        session = {
+            'game_id': event.get('game'),
+            'platform_id': event.get('platform'),
+            'minutes': event.get('minutes'),
+            'achievements': event.get('achievements', 0),
+        }
+        for field, value in session.items():
+            # bool is an int subclass, but never a valid id or amount
+            if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= SESSION_LIMITS[field]:
+                raise ValueError(
+                    f"Session {index}: {field.removesuffix('_id')} must be an integer "
+                    f"from 0 to {SESSION_LIMITS[field]}."
+                )
+        sessions.append(session)
+
+    game_ids = {session['game_id'] for session in sessions}
+    platform_ids = {session['platform_id'] for session in sessions}
+    unknown_games = game_ids - set(Game.objects.filter(pk__in=game_ids).values_list('pk', flat=True))
+    unknown_platforms = platform_ids - set(Platform.objects.filter(pk__in=platform_ids).values_list('pk', flat=True))
+    if unknown_games:
+        raise ValueError(f"Unknown game ids: {sorted(unknown_games)}.")
+    if unknown_platforms:
+        raise ValueError(f"Unknown platform ids: {sorted(unknown_platforms)}.")
+    return batch_id, sessions
+
+
+def ingest_sessions(user, batch_id, sessions):
+    """
+    Apply a batch of play sessions to a user's progress, once per batch id.
+
+    Sessions are summed in memory per (game, platform), so each progress entry is written
+    once per batch, with an atomic UPDATE that adds the minutes and achievements to the
+    stored values; minutes that do not make up a whole hour are carried in session_minutes.
+    Games the user does not track on the platform yet get a new 'In Progress' entry. The
+    batch is recorded in the same transaction, keyed by its id, so a retried batch returns
+    the stored result without being applied again.
+
+    Args:
+        user (User): The user the sessions were logged for.
+        batch_id (str): The client-supplied batch id.
+        sessions (list): Sessions as returned by clean_sessions.
+
+    Returns:
+        tuple: (result dict {'batch_id', 'sessions', 'entries': [{'progress_id', 'game_id',
+            'platform_id', 'hours_played', 'achievements'}]}, True if the batch was a duplicate)
+    """
+    stored = SessionBatch.objects.filter(user=user, batch_id=batch_id).values_list('result', flat=True).first()
+    if stored is not None:
+        return stored, True
+
+    totals = {}
+    for session in sessions:
+        total = totals.setdefault((session['game_id'], session['platform_id']), {'minutes': 0, 'achievements': 0})
+        total['minutes'] += session['minutes']
+        total['achievements'] += session['achievements']
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                batch = SessionBatch.objects.create(user=user, batch_id=batch_id, session_count=len(sessions))
+        except IntegrityError:
+            # A concurrent request with the same batch id was applied first
+            return SessionBatch.objects.get(user=user, batch_id=batch_id).result, True
+
+        # Lock the entries being incremented, so their old states stay exact for the rollups
+        existing = {}
+        for progress in (
+            Progress.objects.select_for_update()
+            .filter(user=user, game_id__in={game_id for game_id, _ in totals})
+            .order_by('pk')
+        ):
+            existing.setdefault((progress.game_id, progress.platform_id), progress)
+
+        games = Game.objects.in_bulk({game_id for game_id, platform_id in totals if (game_id, platform_id) not in existing})
+        created = []
+        for (game_id, platform_id), total in totals.items():
+            progress = existing.get((game_id, platform_id))
+            if progress is None:
+                progress = Progress(
+                    user=user, game=games[game_id], platform_id=platform_id, completion_status='In Progress',
+                    hours_played=total['minutes'] // 60, session_minutes=total['minutes'] % 60,
+                    achievements=total['achievements'],
+                )
+                progress.refresh_sort_columns()
+                created.append(progress)
+                continue
+            minutes = F('session_minutes') + Value(total['minutes'])
+            Progress.objects.filter(pk=progress.pk).update(
+                hours_played=F('hours_played') + minutes / Value(60),
+                session_minutes=Mod(minutes, Value(60)),
+                achievements=F('achievements') + Value(total['achievements']),
+            )
+        Progress.objects.bulk_create(created)
+
+        updated = {progress.pk: progress for progress in existing.values() if (progress.game_id, progress.platform_id) in totals}
+        written = created + list(Progress.objects.filter(pk__in=updated).order_by('pk'))
+        sync_progress_writes(
+            user.pk,
+            [(updated[progress.pk].rollup_state() if progress.pk in updated else None, progress.rollup_state())
+             for progress in written],
+            list(updated),
+            # Session minutes do not affect suggestion scores; only a newly tracked game can
+            mark_suggestions=bool(created),
+        )
+
+        result = {
+            'batch_id': batch_id,
+            'sessions': len(sessions),
+            'entries': [
+                {
+                    'progress_id': progress.pk,
+                    'game_id': progress.game_id,
+                    'platform_id': progress.platform_id,
+                    'hours_played': progress.hours_played,
+                    'achievements': progress.achievements,
+                }
+                for progress in sorted(written, key=lambda progress: progress.pk)
+            ],
+        }
+        batch.result = result
+        batch.save(update_fields=['result'])
+    return result, False
@@ -0,0 +1,39 @@
+# gaming/checks.py
+
+"""
+System Checks for the Gaming Application.
+
+Cached derived data (feed fragment versions, friend-id sets, summaries, leaderboards) is
+invalidated from whichever process handles the write, so every process must share the
+cache that holds it.
+
+Functions:
+- check_shared_cache: Warn when the default cache is private to each process.
+"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries live in one process's memory
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warn when the default cache is private to each process.
+
+    Returns:
+        list: A gaming.W001 warning if the default cache backend is process-local.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_BACKENDS:
+        return []
+    return [Warning(
+        "The default cache is private to each process, so cache invalidations do not reach "
+        "other worker processes and they keep serving stale feed fragments and friend lists.",
+        hint="Configure a shared cache backend (file-based, database, Memcached or Redis) in CACHES.",
+        id='gaming.W001',
+    )]
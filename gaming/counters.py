@@ -0,0 +1,139 @@
+# gaming/counters.py
+
+"""
+Denormalized Like and Comment Counters for the Gaming Application.
+
+StatusMessage and Progress carry like_count and comment_count columns so the news feed never
+counts Like or Comment rows at render time. The views adjust the counters with atomic F()
+updates; reconcile_counters repairs any drift (e.g. rows deleted through the admin) in bulk.
+
+Constants:
+- COUNTED_MODELS: The models that carry like_count and comment_count columns.
+
+Functions:
+- adjust_counter: Atomically add a delta to a counter column.
+- sync_like_count: Recompute one object's like count in a single statement.
+- reconcile_counters: Recompute drifted counters from the Like and Comment tables.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .feed import bump_content_version
+from .models import Comment, Like, Progress, StatusMessage
+
+COUNTED_MODELS = (StatusMessage, Progress)
+
+# Counter column -> model whose rows it counts
+COUNTER_SOURCES = {
+    'like_count': Like,
+    'comment_count': Comment,
+}
+
+
+def adjust_counter(content_object, field, delta):
+    """
+    Atomically add a delta to a counter column of a content object.
+
+    The update is a single UPDATE ... SET field = field + delta statement, so concurrent
+    requests never lose increments. Counters never drop below zero. The object's cached
+    feed fragments are invalidated.
+
+    Args:
+        content_object (Model): A StatusMessage or Progress instance.
+        field (str): 'like_count' or 'comment_count'.
+        delta (int): The amount to add (negative to subtract).
+
+    Returns:
+        None
+    """
+    model = type(content_object)
+    if model not in COUNTED_MODELS or not delta:
+        return
+    model.objects.filter(pk=content_object.pk).update(**{field: Greatest(F(field) + delta, Value(0))})
+    bump_content_version(ContentType.objects.get_for_model(model).pk, content_object.pk)
+
+
+def sync_like_count(model, pk):
+    """
+    Set an object's like_count to its actual number of likes and return it.
+
+    The count is recomputed inside a single UPDATE, so concurrent toggles that race on the
+    Like unique constraint still leave an exact count. The object's cached feed fragments
+    are invalidated.
+
+    Args:
+        model (Model class): StatusMessage or Progress.
+        pk (int): The primary key of the liked object.
+
+    Returns:
+        int: The object's like count.
+    """
+    model.objects.filter(pk=pk).update(like_count=_actual_count(model, Like))
+    bump_content_version(ContentType.objects.get_for_model(model).pk, pk)
+    return model.objects.filter(pk=pk).values_list('like_count', flat=True).first() or 0
+
+
+def _actual_count(model, source):
+    """
+    Build a subquery counting the source rows that point at each row of model.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    counts = (
+        source.objects
+        .filter(content_type=content_type, object_id=OuterRef('pk'))
+        .order_by()
+        .values('object_id')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def _write_counters(model, objects):
+    """
+    Save repaired counters in one UPDATE and invalidate the objects' cached feed fragments.
+    """
+    model.objects.bulk_update(objects, list(COUNTER_SOURCES))
+    content_type_id = ContentType.objects.get_for_model(model).pk
+    for obj in objects:
+        bump_content_version(content_type_id, obj.pk)
+
+
+def reconcile_counters(dry_run=False, batch_size=500):
+    """
+    Recompute counters that have drifted from the Like and Comment tables.
+
+    Only drifted rows are loaded and rewritten, in batches with bulk_update.
+
+    Args:
+        dry_run (bool): If True, report drifted rows without writing them.
+        batch_size (int): Number of rows written per UPDATE batch.
+
+    Returns:
+        dict: Number of repaired rows per model name.
+    """
+    repaired = {}
+    for model in COUNTED_MODELS:
+        annotations = {f'actual_{field}': _actual_count(model, source) for field, source in COUNTER_SOURCES.items()}
+        in_sync = Q()
+        for field in COUNTER_SOURCES:
+            in_sync &= Q(**{field: F(f'actual_{field}')})
+        drifted = model.objects.annotate(**annotations).exclude(in_sync).only('pk', *COUNTER_SOURCES)
+
+        batch = []
+        count = 0
+        for obj in drifted.iterator(chunk_size=batch_size):
+            for field in COUNTER_SOURCES:
+                setattr(obj, field, getattr(obj, f'actual_{field}'))
+            batch.append(obj)
+            count += 1
+            if len(batch) >= batch_size:
+                if not dry_run:
+                    _write_counters(model, batch)
+                batch = []
+        if batch and not dry_run:
+            _write_counters(model, batch)
+        repaired[model.__name__] = count
+    return repaired
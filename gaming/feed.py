@@ -0,0 +1,308 @@
+# gaming/feed.py
+
+"""
+News Feed Loading for the Gaming Application.
+
+FeedItems point at their content through a GenericForeignKey, so rendering a page naively
+resolves every content object (and its game, platform, images and comments) one
+query at a time. This module resolves a whole page at once: feed items are grouped by
+content type and every type is fetched with a single query plus a fixed set of prefetches.
+Only the latest few comments of each item are loaded, for the whole page in one windowed
+query; older comments are paged in on demand.
+
+The shared part of each rendered item is fragment-cached under a content version that is
+bumped whenever the content, its images, likes or comments change (see gaming.signals), so
+the cached HTML can be reused by every friend who views the item. The fragments also render
+game, platform and profile names, so a site-wide names version is part of every item's
+version and is bumped when one of those is renamed or removed.
+
+Constants:
+- FEED_LOADERS: The related data loaded with each content type.
+- LATEST_COMMENTS: Number of comments shown per feed item before "load more".
+- FRAGMENT_CACHE_TIMEOUT: Seconds a rendered feed item fragment stays cached.
+- VERSION_CACHE_TIMEOUT: Seconds a content version stays cached.
+
+Functions:
+- load_feed_items: Attach fully loaded content objects to a page of feed items.
+- annotate_user_liked: Mark which content objects a profile has liked, in one query.
+- attach_latest_comments: Attach the latest comments of many content objects, in one query.
+- attach_content_versions: Attach the cache version of many content objects, in one cache call.
+- bump_content_version: Invalidate the cached fragments of a content object.
+- bump_names_version: Invalidate every cached fragment after a rename.
+- get_names_version: Return the current names version.
+- feed_query_budget: The maximum number of queries load_feed_items issues for a page.
+"""
+
+import time
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import Comment, Like, Progress, StatusMessage
+from .pagination import encode_cursor
+
+# Related data needed to render each kind of feed content without further queries.
+FEED_LOADERS = {
+    Progress: {
+        'select_related': ('user', 'game', 'platform'),
+        'prefetch_related': (),
+    },
+    StatusMessage: {
+        'select_related': ('profile__user',),
+        'prefetch_related': ('images',),
+    },
+}
+
+LATEST_COMMENTS = 3
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# A fragment is never served past its own timeout, so its version need not outlive it;
+# an expired version is replaced by a fresh one, which only causes a cache miss
+VERSION_CACHE_TIMEOUT = FRAGMENT_CACHE_TIMEOUT
+
+VERSION_KEY = 'gaming:content-version:{}:{}'
+
+NAMES_VERSION_KEY = 'gaming:content-version:names'
+
+
+def _new_version():
+    """
+    Return a fresh version number that cannot repeat one evicted from the cache.
+    """
+    return time.time_ns() // 1000
+
+
+def feed_query_budget(feed_items):
+    """
+    Return the maximum number of queries load_feed_items issues for a page, whatever its size.
+
+    One query per content type on the page plus one per prefetched relation of that type,
+    one for the latest comments and one for the viewer's likes.
+
+    Args:
+        feed_items (iterable): The FeedItem instances on the page.
+
+    Returns:
+        int: The per-page query budget.
+    """
+    content_type_ids = {item.content_type_id for item in feed_items}
+    models = [ContentType.objects.get_for_id(content_type_id).model_class() for content_type_id in content_type_ids]
+    return sum(1 + len(FEED_LOADERS.get(model, {}).get('prefetch_related', ())) for model in models) + 2
+
+
+def _ids_by_content_type(content_objects):
+    """
+    Group content objects' primary keys by content type id.
+    """
+    ids_by_type = defaultdict(set)
+    for obj in content_objects:
+        ids_by_type[ContentType.objects.get_for_model(obj).pk].add(obj.pk)
+    return ids_by_type
+
+
+def _matching(ids_by_type):
+    """
+    Build a filter matching generic (content_type, object_id) rows for the grouped ids.
+    """
+    matches = Q()
+    for content_type_id, object_ids in ids_by_type.items():
+        matches |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+    return matches
+
+
+def annotate_user_liked(content_objects, profile):
+    """
+    Set user_liked on each content object according to whether the profile has liked it.
+
+    The likes for all objects are fetched with a single query, whatever their content types.
+
+    Args:
+        content_objects (iterable): StatusMessage, Progress or other likeable instances. None is skipped.
+        profile (Profile): The viewing profile, or None for anonymous viewers.
+
+    Returns:
+        None
+    """
+    objects = [obj for obj in content_objects if obj is not None]
+    if not objects:
+        return
+
+    liked = set()
+    if profile is not None:
+        matches = _matching(_ids_by_content_type(objects))
+        liked = set(Like.objects.filter(matches, profile=profile).values_list('content_type_id', 'object_id'))
+
+    for obj in objects:
+        obj.user_liked = (ContentType.objects.get_for_model(obj).pk, obj.pk) in liked
+
+
+def attach_latest_comments(content_objects, limit=LATEST_COMMENTS):
+    """
+    Set latest_comments on each content object to its newest comments, oldest first.
+
+    The comments of all objects are fetched with a single windowed query that ranks each
+    object's comments by (timestamp, id) and keeps the top ones. Objects with more comments
+    than were loaded also get comments_cursor, the cursor for paging in older comments.
+
+    Args:
+        content_objects (iterable): StatusMessage or Progress instances. None is skipped.
+        limit (int): The maximum number of comments attached per object.
+
+    Returns:
+        None
+    """
+    objects = [obj for obj in content_objects if obj is not None]
+    if not objects:
+        return
+
+    ranked = (
+        Comment.objects
+        .filter(_matching(_ids_by_content_type(objects)))
+        .select_related('profile')
+        .annotate(rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('content_type_id'), F('object_id')],
+            order_by=[F('timestamp').desc(), F('id').desc()],
+        ))
+        .filter(rank__lte=limit)
+    )
+    comments = defaultdict(list)
+    for comment in ranked:
+        comments[comment.content_type_id, comment.object_id].append(comment)
+
+    for obj in objects:
+        latest = sorted(
+            comments[ContentType.objects.get_for_model(obj).pk, obj.pk],
+            key=lambda comment: (comment.timestamp, comment.pk),
+        )
+        obj.latest_comments = latest
+        obj.comments_cursor = None
+        if latest and getattr(obj, 'comment_count', 0) > len(latest):
+            obj.comments_cursor = encode_cursor(latest[0].timestamp, latest[0].pk)
+
+
+def bump_content_version(content_type_id, object_id):
+    """
+    Move a content object to a new version, so its cached feed fragments are no longer used.
+
+    Args:
+        content_type_id (int): The content type of the changed object.
+        object_id (int): The primary key of the changed object.
+
+    Returns:
+        None
+    """
+    _bump(VERSION_KEY.format(content_type_id, object_id))
+
+
+def bump_names_version():
+    """
+    Move every content object to a new version, after a name rendered in the fragments changed.
+
+    Returns:
+        None
+    """
+    _bump(NAMES_VERSION_KEY)
+
+
+def get_names_version():
+    """
+    Return the current names version, starting it afresh if it is not cached.
+
+    Returns:
+        int: The version, which changes whenever a game, platform or profile is renamed or removed.
+    """
+    version = cache.get(NAMES_VERSION_KEY)
+    if version is None:
+        version = _new_version()
+        cache.set(NAMES_VERSION_KEY, version, timeout=VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def _bump(key):
+    """
+    Advance a version key, starting it afresh if it is not cached.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=VERSION_CACHE_TIMEOUT)
+
+
+def attach_content_versions(content_objects):
+    """
+    Set cache_version on each content object from the cache, in one round trip.
+
+    The version combines the object's own version with the names version. Objects without
+    a version yet are given a fresh one.
+
+    Args:
+        content_objects (iterable): StatusMessage or Progress instances. None is skipped.
+
+    Returns:
+        None
+    """
+    keys = {
+        obj: VERSION_KEY.format(ContentType.objects.get_for_model(obj).pk, obj.pk)
+        for obj in content_objects if obj is not None
+    }
+    if not keys:
+        return
+    versions = cache.get_many([NAMES_VERSION_KEY, *keys.values()])
+    missing = {key: _new_version() for key in [NAMES_VERSION_KEY, *keys.values()] if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=VERSION_CACHE_TIMEOUT)
+        versions.update(missing)
+    for obj, key in keys.items():
+        obj.cache_version = f'{versions[key]}.{versions[NAMES_VERSION_KEY]}'
+
+
+def load_feed_items(feed_items, profile=None):
+    """
+    Resolve the content objects for a page of feed items in one query per content type.
+
+    Each feed item's content_type and content_object are populated from the batched
+    results, so templates can dereference them without issuing queries. Items whose
+    content object no longer exists get a content_object of None. Content objects also
+    get their latest comments (see attach_latest_comments), their fragment cache version
+    (see attach_content_versions) and user_liked for the viewing profile (see
+    annotate_user_liked).
+
+    Args:
+        feed_items (list): The FeedItem instances on the page.
+        profile (Profile): The viewing profile, or None.
+
+    Returns:
+        list: The same feed items, with their content objects attached.
+    """
+    ids_by_type = defaultdict(set)
+    for item in feed_items:
+        ids_by_type[item.content_type_id].add(item.object_id)
+
+    objects_by_type = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        spec = FEED_LOADERS.get(model, {})
+        queryset = (
+            model._default_manager
+            .filter(pk__in=object_ids)
+            .select_related(*spec.get('select_related', ()))
+            .prefetch_related(*spec.get('prefetch_related', ()))
+        )
+        objects_by_type[content_type_id] = {obj.pk: obj for obj in queryset}
+
+    content_object_field = type(feed_items[0])._meta.get_field('content_object') if feed_items else None
+    for item in feed_items:
+        item.content_type = ContentType.objects.get_for_id(item.content_type_id)
+        obj = objects_by_type[item.content_type_id].get(item.object_id)
+        content_object_field.set_cached_value(item, obj)
+
+    content_objects = [item.content_object for item in feed_items]
+    attach_latest_comments(content_objects)
+    attach_content_versions(content_objects)
+    annotate_user_liked(content_objects, profile)
+    return feed_items
@@ -16,6 +16,8 @@ Forms Included:
 - ProgressForm
 - CommentForm
 - FriendsProgressFilterForm
+- ProgressImportForm
+- ProgressBulkEditForm
 """
 
 from django import forms
@@ -25,6 +27,7 @@ from django.forms.widgets import (
     CheckboxSelectMultiple,
     FileInput
 )
+from .bulk import read_library
 from .models import (
     Profile, 
     StatusMessage, 
@@ -271,3 +274,130 @@ class FriendsProgressFilterForm(forms.Form):
         super().__init__(*args, **kwargs)
         if user_profile:
             self.fields['friend'].queryset = user_profile.get_friends()
+
+
+class ProgressImportForm(forms.Form):
+    """
+    Form for importing progress entries from a CSV or JSON game-library export.
+
+    The file is parsed while cleaning, so cleaned_data['file'] holds the library rows.
+    """
+    MAX_ROWS = 5000
+
+    file = forms.FileField(
+        label='Library Export',
+        help_text="A CSV file with a header row, or a JSON list of games.",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.json'})
+    )
+    share_to_feed = forms.BooleanField(
+        required=False,
+        initial=True,
+        label='Share the imported games to my feed',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
+    def clean_file(self):
+        """
+        Parses the uploaded export into library rows.
+
+        Returns:
+            list: The rows, as returned by gaming.bulk.read_library.
+
+        Raises:
+            ValidationError: If the file cannot be parsed, is empty, or has too many rows.
+        """
+        try:
+            rows = read_library(self.cleaned_data['file'])
+        except ValueError as error:
+            raise ValidationError(str(error))
+        if not rows:
+            raise ValidationError("The file does not list any games.")
+        if len(rows) > self.MAX_ROWS:
+            raise ValidationError(f"An import can list at most {self.MAX_ROWS} games.")
+        return rows
+
+
+class ProgressBulkEditForm(forms.Form):
+    """
+    Form for setting the completion status and/or platform of several progress entries at once.
+
+    The selectable entries are limited to the user's own, so cleaning the selection checks
+    ownership of every entry in one filtered query.
+    """
+    MAX_ENTRIES = 500
+
+    entries = forms.ModelMultipleChoiceField(
+        queryset=Progress.objects.none(),
+        widget=forms.MultipleHiddenInput,
+        error_messages={'invalid_choice': "You can only edit your own progress entries."},
+    )
+    completion_status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Keep Status')] + Progress.COMPLETION_STATUS_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    platform = forms.ModelChoiceField(
+        required=False,
+        queryset=Platform.objects.all(),
+        empty_label="Keep Platform",
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    share_to_feed = forms.BooleanField(
+        required=False,
+        label='Share to my feed',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the form and limits the selectable entries to the user's own.
+
+        Args:
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments. Expects 'user', the owner of the entries.
+        """
+        user = kwargs.pop('user')
+        super().__init__(*args, **kwargs)
+        self.fields['entries'].queryset = Progress.objects.filter(user=user).select_related('game')
+
+    def clean_entries(self):
+        """
+        Limits the number of entries edited at once.
+
+        Returns:
+            QuerySet: The selected Progress entries, already evaluated.
+
+        Raises:
+            ValidationError: If too many entries are selected.
+        """
+        entries = self.cleaned_data['entries']
+        if len(entries) > self.MAX_ENTRIES:
+            raise ValidationError(f"At most {self.MAX_ENTRIES} entries can be edited at once.")
+        return entries
+
+    def clean(self):
+        """
+        Requires a change, and a platform every selected game is available on.
+
+        Returns:
+            dict: The cleaned data.
+
+        Raises:
+            ValidationError: If nothing would change or a game is not available on the platform.
+        """
+        cleaned_data = super().clean()
+        platform = cleaned_data.get('platform')
+        if not cleaned_data.get('completion_status') and not platform:
+            raise ValidationError("Choose a new status or platform.")
+        entries = cleaned_data.get('entries')
+        if platform and entries:
+            games = {progress.game for progress in entries}
+            available = set(
+                Game.platforms.through.objects
+                .filter(platform=platform, game__in=games)
+                .values_list('game_id', flat=True)
+            )
+            unavailable = sorted(game.title for game in games if game.pk not in available)
+            if unavailable:
+                raise ValidationError(f"Not available on {platform.name}: {', '.join(unavailable)}.")
+        return cleaned_data
@@ -0,0 +1,125 @@
+# gaming/leaderboards.py
+
+"""
+Leaderboards for the Gaming Application.
+
+Players are ranked by hours played, globally and per game, genre or platform. The rankings
+are materialized by the per-user rollup tables (see gaming.rollups), which are updated by
+deltas on every Progress write, and each scope has an index ordered by hours. A top-N page
+is therefore an index range read, cached until a change touches the scope's hours, and a
+player's rank is one index-only count of the players ahead of them. Ties share a rank.
+Rollups rebuilt by the rebuild_user_stats command show up once the cached pages expire.
+
+Constants:
+- SCOPES: The leaderboard scopes, with the rollup model and columns that rank them.
+- LEADERBOARD_SIZE: Number of players shown on a leaderboard page.
+- LEADERBOARD_CACHE_TIMEOUT: Seconds a cached top-N page is kept.
+
+Functions:
+- top_players: Return the top players of a leaderboard, from the cache when possible.
+- get_rank: Return a player's rank and hours on a leaderboard.
+- invalidate_leaderboards: Discard the cached leaderboards touched by applied rollup deltas.
+"""
+
+from django.core.cache import cache
+
+from .models import UserGameStats, UserGamingStats, UserGenreStats, UserPlatformStats
+
+# Scope -> (rollup model, scope column or None for the global board, hours column)
+SCOPES = {
+    'global': (UserGamingStats, None, 'total_hours'),
+    'game': (UserGameStats, 'game_id', 'hours'),
+    'genre': (UserGenreStats, 'genre_id', 'hours'),
+    'platform': (UserPlatformStats, 'platform_id', 'hours'),
+}
+
+LEADERBOARD_SIZE = 25
+
+LEADERBOARD_CACHE_TIMEOUT = 5 * 60
+
+LEADERBOARD_KEY = 'gaming:leaderboard:{}:{}'
+
+
+def _ranked_rows(scope, key):
+    """
+    Return the rollup rows ranked on a leaderboard; players without hours are not ranked.
+    """
+    model, column, hours = SCOPES[scope]
+    rows = model.objects.filter(**{f'{hours}__gt': 0})
+    if column is not None:
+        rows = rows.filter(**{column: key})
+    return rows
+
+
+def top_players(scope, key=None):
+    """
+    Return the top players of a leaderboard, reading and caching them on a miss.
+
+    Args:
+        scope (str): A key of SCOPES.
+        key (int): The primary key of the game, genre or platform; None for the global board.
+
+    Returns:
+        list: Up to LEADERBOARD_SIZE dicts with rank, user_id, username and hours, best first.
+    """
+    cache_key = LEADERBOARD_KEY.format(scope, key)
+    leaders = cache.get(cache_key)
+    if leaders is None:
+        hours = SCOPES[scope][2]
+        rows = (
+            _ranked_rows(scope, key)
+            .order_by(f'-{hours}', 'user_id')
+            .values_list('user_id', 'user__username', hours)[:LEADERBOARD_SIZE]
+        )
+        leaders = []
+        for position, (user_id, username, played) in enumerate(rows, start=1):
+            tied = leaders and leaders[-1]['hours'] == played
+            leaders.append({
+                'rank': leaders[-1]['rank'] if tied else position,
+                'user_id': user_id,
+                'username': username,
+                'hours': played,
+            })
+        cache.set(cache_key, leaders, timeout=LEADERBOARD_CACHE_TIMEOUT)
+    return leaders
+
+
+def get_rank(user, scope, key=None):
+    """
+    Return a player's rank and hours on a leaderboard.
+
+    The player's row is read through its unique index and the players ahead of them are
+    counted on the scope's hours index, without aggregating any Progress entries.
+
+    Args:
+        user (User): The player.
+        scope (str): A key of SCOPES.
+        key (int): The primary key of the game, genre or platform; None for the global board.
+
+    Returns:
+        dict: {'rank': int, 'hours': int}, or None if the player is not ranked in the scope.
+    """
+    hours = SCOPES[scope][2]
+    rows = _ranked_rows(scope, key)
+    played = rows.filter(user=user).values_list(hours, flat=True).first()
+    if played is None:
+        return None
+    return {'rank': rows.filter(**{f'{hours}__gt': played}).count() + 1, 'hours': played}
+
+
+def invalidate_leaderboards(deltas):
+    """
+    Discard the cached leaderboards whose hours were changed by applied rollup deltas.
+
+    Args:
+        deltas (dict): The deltas returned by gaming.rollups.apply_changes.
+
+    Returns:
+        None
+    """
+    keys = set()
+    for scope, (model, _, hours) in SCOPES.items():
+        for (_, key), delta in deltas.get(model, {}).items():
+            if delta[hours]:
+                keys.add(LEADERBOARD_KEY.format(scope, key))
+    cache.delete_many(keys)
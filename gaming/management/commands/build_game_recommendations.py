@@ -0,0 +1,28 @@
+# gaming/management/commands/build_game_recommendations.py
+
+"""
+Management command to rebuild the "players like you also played" co-occurrence index.
+
+Usage:
+    python manage.py build_game_recommendations
+    python manage.py build_game_recommendations --k 30
+"""
+
+from django.core.management.base import BaseCommand
+
+from gaming.recommendations import build_cooccurrence
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the GameCooccurrence table from Progress entries.
+    """
+    help = "Rebuild the game co-occurrence index used for game recommendations."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=20, help="Related games stored per game.")
+        parser.add_argument('--chunk-size', type=int, help="Games processed per vectorized step.")
+
+    def handle(self, *args, **options):
+        stored = build_cooccurrence(k=options['k'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"{stored} co-occurrence(s) stored."))
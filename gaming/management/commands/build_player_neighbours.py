@@ -0,0 +1,50 @@
+# gaming/management/commands/build_player_neighbours.py
+
+"""
+Management command to precompute rating-similarity neighbours.
+
+Usage:
+    python manage.py build_player_neighbours
+    python manage.py build_player_neighbours --metric pearson --k 30 --min-overlap 2
+"""
+
+from django.core.management.base import BaseCommand
+
+from gaming.similarity import METRICS, RatingMatrix, store_neighbours, top_k_neighbours
+
+
+class Command(BaseCommand):
+    """
+    Builds the user x game rating matrix from Progress and stores every player's top-k neighbours.
+    """
+    help = "Recompute the PlayerNeighbour table from the Progress rating matrix."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', choices=METRICS, default='cosine', help="Similarity metric.")
+        parser.add_argument('--k', type=int, default=20, help="Neighbours stored per player.")
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help="Players processed per vectorized step (derived from the block size limit by default).",
+        )
+        parser.add_argument(
+            '--max-game-players',
+            type=int,
+            default=200,
+            help="Players paired through each game; 0 pairs everyone for exact similarities.",
+        )
+        parser.add_argument('--min-overlap', type=int, default=1, help="Minimum number of shared games.")
+
+    def handle(self, *args, **options):
+        matrix = RatingMatrix.from_progress()
+        self.stdout.write(f"Rating matrix: {matrix.shape[0]} users x {matrix.shape[1]} games, {matrix.nnz} entries")
+        chunks = top_k_neighbours(
+            matrix,
+            k=options['k'],
+            metric=options['metric'],
+            chunk_size=options['chunk_size'],
+            min_overlap=options['min_overlap'],
+            max_game_players=options['max_game_players'] or None,
+        )
+        stored = store_neighbours(chunks)
+        self.stdout.write(self.style.SUCCESS(f"{stored} neighbour(s) stored."))
@@ -0,0 +1,39 @@
+# gaming/management/commands/check_user_stats.py
+
+"""
+Management command to check the per-user statistics rollups against Progress entries.
+
+Usage:
+    python manage.py check_user_stats
+    python manage.py check_user_stats --fix
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from gaming.rollups import check_user_stats, rebuild_user_stats
+
+
+class Command(BaseCommand):
+    """
+    Reports users whose statistics rollups have drifted from their Progress entries.
+    """
+    help = "Check the per-user statistics rollups against Progress entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Rebuild the rollups of drifted users.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Users checked per batch.")
+
+    def handle(self, *args, **options):
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        drifted = []
+        for start in range(0, len(user_ids), batch_size):
+            drifted.extend(check_user_stats(user_ids[start:start + batch_size]))
+
+        for user_id in drifted:
+            self.stdout.write(f"User {user_id}: statistics rollup has drifted")
+        if drifted and options['fix']:
+            rebuild_user_stats(drifted)
+            self.stdout.write(f"{len(drifted)} user(s) rebuilt")
+        self.stdout.write(self.style.SUCCESS(f"Statistics check finished: {len(drifted)} drifted user(s)."))
@@ -0,0 +1,33 @@
+# gaming/management/commands/issue_api_token.py
+
+"""
+Management command to issue a user's API token for posting play sessions.
+
+The token is printed once; only its digest is stored. Issuing a new token revokes the
+user's previous one.
+
+Usage:
+    python manage.py issue_api_token alice
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from gaming.models import ApiToken
+
+
+class Command(BaseCommand):
+    """
+    Issues a new API token for a user, revoking their previous one.
+    """
+    help = "Issue a new API token for a user's automated play-session trackers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="The user the token acts for.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"No user named {options['username']!r}.")
+        self.stdout.write(ApiToken.issue(user))
+        self.stdout.write(self.style.SUCCESS(f"API token issued for {user.username}; it will not be shown again."))
@@ -0,0 +1,42 @@
+# gaming/management/commands/rebuild_timelines.py
+
+"""
+Management command to rebuild materialized news feed timelines.
+
+Usage:
+    python manage.py rebuild_timelines
+    python manage.py rebuild_timelines --user alice --user bob
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gaming.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    """
+    Recomputes TimelineEntry rows from FeedItem and Friend data.
+    """
+    help = "Rebuild the materialized news feed timelines for all users or the given users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help="Username whose timeline should be rebuilt. May be given more than once.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+
+        for user in users.iterator():
+            with transaction.atomic():
+                count = rebuild_timeline(user)
+            self.stdout.write(f"{user.username}: {count} timeline entries")
+
+        self.stdout.write(self.style.SUCCESS("Timelines rebuilt."))
@@ -0,0 +1,33 @@
+# gaming/management/commands/rebuild_user_stats.py
+
+"""
+Management command to rebuild the per-user statistics rollups from Progress entries.
+
+Usage:
+    python manage.py rebuild_user_stats
+    python manage.py rebuild_user_stats --user 42 --user 43
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from gaming.rollups import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    """
+    Recomputes UserGamingStats and its per-genre, per-platform and per-game rows.
+    """
+    help = "Rebuild the per-user statistics rollups from Progress entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help="Rebuild only this user id.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Users rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        user_ids = options['users'] or list(User.objects.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        rebuilt = 0
+        for start in range(0, len(user_ids), batch_size):
+            rebuilt += rebuild_user_stats(user_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f"Statistics rebuilt for {rebuilt} user(s)."))
@@ -0,0 +1,40 @@
+# gaming/management/commands/reconcile_counters.py
+
+"""
+Management command to repair denormalized like and comment counters.
+
+Usage:
+    python manage.py reconcile_counters
+    python manage.py reconcile_counters --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from gaming.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    """
+    Recomputes like_count and comment_count on StatusMessage and Progress where they have drifted.
+    """
+    help = "Repair like_count and comment_count columns that have drifted from the Like and Comment tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report drifted rows without writing them.",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Number of rows written per UPDATE batch.",
+        )
+
+    def handle(self, *args, **options):
+        repaired = reconcile_counters(dry_run=options['dry_run'], batch_size=options['batch_size'])
+        verb = "would be repaired" if options['dry_run'] else "repaired"
+        for model_name, count in repaired.items():
+            self.stdout.write(f"{model_name}: {count} row(s) {verb}")
+        self.stdout.write(self.style.SUCCESS("Counter reconciliation finished."))
@@ -0,0 +1,48 @@
+# gaming/management/commands/refresh_friend_suggestions.py
+
+"""
+Management command to precompute friend suggestions.
+
+Each profile is refreshed in its own transaction, so disjoint primary key ranges can be
+processed by several commands running in parallel. With --stale, only the profiles marked
+stale by progress changes are refreshed; run it frequently, e.g. every few minutes.
+
+Usage:
+    python manage.py refresh_friend_suggestions
+    python manage.py refresh_friend_suggestions --stale
+    python manage.py refresh_friend_suggestions --start 1 --end 5000
+    python manage.py refresh_friend_suggestions --start 5000 --end 10000
+"""
+
+from django.core.management.base import BaseCommand
+
+from gaming.suggestions import refresh_profile_range
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the stored friend suggestions of every profile in a primary key range.
+    """
+    help = "Recompute the FriendSuggestion rows of profiles, optionally limited to a primary key range."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=int,
+            help="Smallest profile primary key to refresh.",
+        )
+        parser.add_argument(
+            '--end',
+            type=int,
+            help="Profile primary key to stop before.",
+        )
+        parser.add_argument(
+            '--stale',
+            action='store_true',
+            help="Only refresh profiles whose suggestions are marked stale.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed, stored = refresh_profile_range(options['start'], options['end'], stale_only=options['stale'])
+        self.stdout.write(f"{refreshed} profile(s) refreshed, {stored} suggestion(s) stored")
+        self.stdout.write(self.style.SUCCESS("Friend suggestions refreshed."))
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_timelines(apps, schema_editor):
+    """
+    Deliver existing feed items to their authors' and friends' timelines.
+    """
+    Profile = apps.get_model('gaming', 'Profile')
+    Friend = apps.get_model('gaming', 'Friend')
+    FeedItem = apps.get_model('gaming', 'FeedItem')
+    TimelineEntry = apps.get_model('gaming', 'TimelineEntry')
+
+    user_by_profile = dict(Profile.objects.values_list('pk', 'user_id'))
+    readers = {user_id: {user_id} for user_id in user_by_profile.values()}
+    for p1, p2 in Friend.objects.values_list('profile1_id', 'profile2_id'):
+        u1, u2 = user_by_profile.get(p1), user_by_profile.get(p2)
+        if u1 is not None and u2 is not None:
+            readers[u1].add(u2)
+            readers[u2].add(u1)
+
+    entries = []
+    for pk, user_id, timestamp in FeedItem.objects.values_list('pk', 'user_id', 'timestamp').iterator():
+        for owner_id in readers.get(user_id, {user_id}):
+            entries.append(TimelineEntry(owner_id=owner_id, feed_item_id=pk, timestamp=timestamp))
+    TimelineEntry.objects.bulk_create(entries, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gaming', '0018_comment_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('feed_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='gaming.feeditem')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-timestamp', '-feed_item'],
+                'indexes': [models.Index(fields=['owner', '-timestamp', '-feed_item'], name='gaming_timeline_owner_ts')],
+                'unique_together': {('owner', 'feed_item')},
+            },
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """
+    Fill the new counters from the existing Like and Comment rows.
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Like = apps.get_model('gaming', 'Like')
+    Comment = apps.get_model('gaming', 'Comment')
+
+    for model_name in ('statusmessage', 'progress'):
+        content_type = ContentType.objects.filter(app_label='gaming', model=model_name).first()
+        if content_type is None:
+            continue
+        model = apps.get_model('gaming', model_name)
+        counts = {}
+        for field, source in (('like_count', Like), ('comment_count', Comment)):
+            rows = (
+                source.objects
+                .filter(content_type=content_type, object_id=OuterRef('pk'))
+                .order_by()
+                .values('object_id')
+                .annotate(total=Count('pk'))
+                .values('total')
+            )
+            counts[field] = Coalesce(Subquery(rows), Value(0))
+        model.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('gaming', '0019_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progress',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='progress',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='statusmessage',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='statusmessage',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
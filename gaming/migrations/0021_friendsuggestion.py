@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0020_like_comment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FriendSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveIntegerField()),
+                ('reasons', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suggested_to', to='gaming.profile')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='friend_suggestions', to='gaming.profile')),
+            ],
+            options={
+                'ordering': ['-score', 'candidate'],
+                'indexes': [models.Index(fields=['profile', '-score', 'candidate'], name='gaming_suggestion_rank')],
+                'unique_together': {('profile', 'candidate')},
+            },
+        ),
+    ]
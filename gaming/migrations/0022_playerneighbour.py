@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0021_friendsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity', models.FloatField()),
+                ('shared_games', models.PositiveIntegerField()),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gaming.profile')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_neighbours', to='gaming.profile')),
+            ],
+            options={
+                'ordering': ['-similarity', 'neighbour'],
+                'indexes': [models.Index(fields=['profile', '-similarity'], name='gaming_neighbour_rank')],
+                'unique_together': {('profile', 'neighbour')},
+            },
+        ),
+    ]
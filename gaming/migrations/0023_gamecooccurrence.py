@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0022_playerneighbour'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='gaming.game')),
+                ('related_game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gaming.game')),
+            ],
+            options={
+                'ordering': ['-score', 'related_game'],
+                'indexes': [models.Index(fields=['game', '-score'], name='gaming_cooccurrence_rank')],
+                'unique_together': {('game', 'related_game')},
+            },
+        ),
+    ]
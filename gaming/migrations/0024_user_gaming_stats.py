@@ -0,0 +1,115 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Sum
+
+STATUS_FIELDS = {
+    'Completed': 'completed_count',
+    'In Progress': 'in_progress_count',
+    'Not Started': 'not_started_count',
+    'Wishlist': 'wishlist_count',
+}
+
+
+def populate_rollups(apps, schema_editor):
+    """
+    Fill the new rollup tables from the existing Progress entries.
+    """
+    Progress = apps.get_model('gaming', 'Progress')
+    progress = Progress.objects.order_by()
+
+    totals = {}
+    for row in progress.values('user_id', 'completion_status').annotate(count=Count('pk'), hours=Sum('hours_played')):
+        stats = totals.setdefault(row['user_id'], {'entry_count': 0, 'total_hours': 0})
+        stats['entry_count'] += row['count']
+        stats['total_hours'] += row['hours']
+        field = STATUS_FIELDS[row['completion_status']]
+        stats[field] = stats.get(field, 0) + row['count']
+    UserGamingStats = apps.get_model('gaming', 'UserGamingStats')
+    UserGamingStats.objects.bulk_create(
+        [UserGamingStats(user_id=user_id, **stats) for user_id, stats in totals.items()], batch_size=1000,
+    )
+
+    for model_name, key_field, lookup in (
+        ('UserGenreStats', 'genre_id', 'game__genre_id'),
+        ('UserPlatformStats', 'platform_id', 'platform_id'),
+        ('UserGameStats', 'game_id', 'game_id'),
+    ):
+        model = apps.get_model('gaming', model_name)
+        rows = (
+            progress.filter(**{f'{lookup}__isnull': False})
+            .values('user_id', lookup)
+            .annotate(count=Count('pk'), hours=Sum('hours_played'))
+        )
+        model.objects.bulk_create([
+            model(user_id=row['user_id'], entry_count=row['count'], hours=row['hours'], **{key_field: row[lookup]})
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gaming', '0023_gamecooccurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserGamingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_hours', models.PositiveIntegerField(default=0)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('not_started_count', models.PositiveIntegerField(default=0)),
+                ('wishlist_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='gaming_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserPlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('hours', models.PositiveIntegerField(default=0)),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gaming.platform')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='platform_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'platform')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserGenreStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('hours', models.PositiveIntegerField(default=0)),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gaming.genre')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'genre')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserGameStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('hours', models.PositiveIntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gaming.game')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-hours'], name='gaming_game_stats_hours')],
+                'unique_together': {('user', 'game')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
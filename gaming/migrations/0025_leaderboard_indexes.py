@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0024_user_gaming_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usergamestats',
+            index=models.Index(fields=['game', '-hours', 'user'], name='gaming_game_stats_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='usergamingstats',
+            index=models.Index(fields=['-total_hours', 'user'], name='gaming_stats_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='usergenrestats',
+            index=models.Index(fields=['genre', '-hours', 'user'], name='gaming_genre_stats_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='userplatformstats',
+            index=models.Index(fields=['platform', '-hours', 'user'], name='gaming_platform_stats_rank'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0025_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_type', 'object_id', 'timestamp'], name='gaming_comment_object_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='feeditem',
+            index=models.Index(fields=['user', '-timestamp'], name='gaming_feeditem_user_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='friend',
+            index=models.Index(fields=['profile1', 'profile2'], name='gaming_friend_pair'),
+        ),
+        migrations.AddIndex(
+            model_name='friend',
+            index=models.Index(fields=['profile2', 'profile1'], name='gaming_friend_pair_reverse'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['content_type', 'object_id'], name='gaming_like_object'),
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['user', 'completion_status', 'game'], name='gaming_progress_user_status'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:53
+
+from django.db import migrations, models
+from django.db.models import Case, OuterRef, Subquery, Value, When
+
+STATUSES = ['Not Started', 'In Progress', 'Completed', 'Wishlist']
+
+
+def populate_sort_keys(apps, schema_editor):
+    """
+    Fill the new sort columns of the existing Progress entries.
+    """
+    Game = apps.get_model('gaming', 'Game')
+    Progress = apps.get_model('gaming', 'Progress')
+    Progress.objects.update(
+        status_key=Case(
+            *(When(completion_status=status, then=Value(key)) for key, status in enumerate(STATUSES, start=1)),
+            default=Value(len(STATUSES) + 1),
+        ),
+        game_title=Subquery(Game.objects.filter(pk=OuterRef('game_id')).values('title')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0026_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progress',
+            name='game_title',
+            field=models.CharField(default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='progress',
+            name='status_key',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['user', 'status_key', 'game_title'], name='gaming_progress_list_order'),
+        ),
+        migrations.RunPython(populate_sort_keys, migrations.RunPython.noop),
+    ]
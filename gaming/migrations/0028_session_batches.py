@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gaming', '0027_progress_sort_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progress',
+            name='session_minutes',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='SessionBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.CharField(max_length=64)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('result', models.JSONField(default=dict)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='session_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'batch_id')},
+            },
+        ),
+    ]
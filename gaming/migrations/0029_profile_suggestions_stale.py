@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gaming', '0028_session_batches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='suggestions_stale',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+    ]
@@ -19,23 +19,55 @@ Models:
 - StatusMessage
 - Image
 - FeedItem
+- TimelineEntry
+- FriendSuggestion
+- PlayerNeighbour
+- GameCooccurrence
+- UserGamingStats
+- UserGenreStats
+- UserPlatformStats
+- UserGameStats
+- SessionBatch
+- ApiToken
 
 Key Features:
 - Generic relations for comments and likes to support multiple content types.
 - User profile management with friendship functionalities.
 - Progress tracking for games with various attributes.
 - Feed items to display user and friends' activities.
+- Materialized per-user timelines so the news feed is read with a single range scan.
+- Cached friend-id sets, invalidated whenever a Friend row is saved or deleted.
+- Precomputed friend suggestions, refreshed offline and for affected users on change.
+- Precomputed rating-similarity neighbours (see gaming.similarity).
+- Precomputed "players like you also played" game co-occurrences (see gaming.recommendations).
+- Per-user statistics rollups maintained by deltas on every Progress write (see gaming.rollups),
+  which also back the leaderboards (see gaming.leaderboards).
+- Idempotent batched play-session ingestion (see gaming.bulk), open to automated trackers
+  through per-user API tokens.
 """
 
+import hashlib
+import secrets
+
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import Count, Exists, F, OuterRef, Q
 from django.urls import reverse
 from django.utils import timezone
 
 
+# Cache key of a profile's set of friend profile ids, and seconds it is kept. The timeout
+# bounds how long a set re-cached by a reader racing an invalidation can be served.
+FRIEND_IDS_KEY = 'gaming:friend-ids:{}'
+FRIEND_IDS_CACHE_TIMEOUT = 10 * 60
+
+# Maximum number of friend suggestions returned by Profile.get_friend_suggestions
+FRIEND_SUGGESTION_LIMIT = 100
+
+
 class Platform(models.Model):
     """
     Represents a gaming platform (e.g., PC, PlayStation, Xbox).
@@ -96,6 +128,8 @@ class Profile(models.Model):
         city (str): The user's city.
         email_address (EmailField): The user's unique email address.
         profile_image (ImageField): The user's profile image.
+        suggestions_stale (BooleanField): Whether the stored friend suggestions wait for the
+            next refresh_friend_suggestions run (see gaming.suggestions).
     """
     user = models.OneToOneField(
         User,
@@ -107,6 +141,7 @@ class Profile(models.Model):
     city = models.CharField(max_length=50)
     email_address = models.EmailField(unique=True)
     profile_image = models.ImageField(upload_to='profile_images/')
+    suggestions_stale = models.BooleanField(default=False, db_index=True, editable=False)
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -120,6 +155,52 @@ class Profile(models.Model):
         """
         return reverse('gaming:profile-detail', kwargs={'pk': self.pk})
 
+    def get_friend_ids(self):
+        """
+        Retrieves the primary keys of all friends of the current profile, without loading them.
+
+        The set is read from the cache and kept on the instance, so repeated calls during a
+        request cost nothing. It is computed with a single query on a cache miss and
+        invalidated once a change to a Friend row involving this profile is committed
+        (see gaming.signals). Code that must not miss a friendship, such as the timeline
+        fan-out, reads the Friend rows instead.
+
+        Returns:
+            frozenset: The primary keys of the friends' Profile instances.
+        """
+        if getattr(self, '_friend_ids', None) is None:
+            key = FRIEND_IDS_KEY.format(self.pk)
+            friend_ids = cache.get(key)
+            if friend_ids is None:
+                friend_ids = set()
+                friends = Friend.objects.filter(Q(profile1=self) | Q(profile2=self)).values_list('profile1', 'profile2')
+                for p1, p2 in friends:
+                    friend_ids.update((p1, p2))
+                friend_ids.discard(self.pk)
+                friend_ids = frozenset(friend_ids)
+                cache.set(key, friend_ids, timeout=FRIEND_IDS_CACHE_TIMEOUT)
+            self._friend_ids = friend_ids
+        return self._friend_ids
+
+    @staticmethod
+    def invalidate_friend_ids(*profiles):
+        """
+        Discards the cached friend-id sets of the given profiles.
+
+        Args:
+            *profiles (Profile or int): Profile instances or primary keys.
+
+        Returns:
+            None
+        """
+        keys = []
+        for profile in profiles:
+            if isinstance(profile, Profile):
+                profile._friend_ids = None
+                profile = profile.pk
+            keys.append(FRIEND_IDS_KEY.format(profile))
+        cache.delete_many(keys)
+
     def get_friends(self):
         """
         Retrieves all friends of the current profile.
@@ -127,14 +208,7 @@ class Profile(models.Model):
         Returns:
             QuerySet: A queryset of Profile instances representing friends.
         """
-        friends = Friend.objects.filter(Q(profile1=self) | Q(profile2=self)).values_list('profile1', 'profile2')
-        friend_ids = set()
-        for p1, p2 in friends:
-            if p1 != self.pk:
-                friend_ids.add(p1)
-            if p2 != self.pk:
-                friend_ids.add(p2)
-        return Profile.objects.filter(pk__in=friend_ids)
+        return Profile.objects.filter(pk__in=self.get_friend_ids())
 
     def add_friend(self, other):
         """
@@ -160,49 +234,54 @@ class Profile(models.Model):
         else:
             print(f"Friendship already exists between {self} and {other}.")
 
-    def get_friend_suggestions(self):
+    def get_friend_suggestions(self, limit=FRIEND_SUGGESTION_LIMIT):
         """
         Suggests potential friends based on shared game genres and similar game ratings.
 
+        Candidates are scored in a single aggregated query over Progress: one point for each
+        genre they have played that the user has also played, and one for each game they
+        rated exactly as the user did. The user's genres and ratings are matched through
+        subqueries, so the cost does not grow with the number of games the user has rated.
+        A second query loads the top candidates' profiles.
+
+        Args:
+            limit (int): The maximum number of suggestions returned.
+
         Returns:
-            QuerySet: A queryset of Profile instances representing suggested friends.
+            list: Profile instances ordered by descending score, each annotated with
+            score, shared_genres and rating_matches.
         """
-        # Get the user's friends and their PKs
-        friends = self.get_friends()
-        friends_pks = list(friends.values_list('pk', flat=True))
-        friends_pks.append(self.pk)  # Exclude self
-
-        # Start with all profiles that are not the current user or a friend
-        base_suggestions = Profile.objects.exclude(pk__in=friends_pks)
-
-        # Get all games the user has played and their genres
-        user_progress = Progress.objects.filter(user=self.user).select_related('game')
-        user_games = {p.game for p in user_progress}
-        user_genres = {p.game.genre for p in user_progress if p.game.genre}
-
-        # Create lookup dictionaries for user ratings: {game_id: rating}
-        user_ratings = {p.game_id: p.rating for p in user_progress if p.rating}
-
-        # 1. Find profiles who played games of the same genres
-        genre_matched_pks = Progress.objects.filter(
-            game__genre__in=user_genres
-        ).values_list('user__gaming_profile', flat=True)
-
-        # 2. Find profiles who share same game and same rating
-        rating_matched_pks = set()
-        for game_id, rating in user_ratings.items():
-            matched_profiles_for_game = Progress.objects.filter(
-                game_id=game_id,
-                rating=rating
-            ).values_list('user__gaming_profile', flat=True)
-            rating_matched_pks.update(matched_profiles_for_game)
-
-        # Combine genre and rating matches
-        matched_pks = set(genre_matched_pks) | rating_matched_pks
-
-        # Filter the base suggestions to only those who matched by genre or rating
-        suggestions = base_suggestions.filter(pk__in=matched_pks)
-
+        user_genres = Progress.objects.filter(user_id=self.user_id, game__genre__isnull=False).values('game__genre')
+        same_rating = Progress.objects.filter(
+            user_id=self.user_id,
+            game_id=OuterRef('game_id'),
+            rating=OuterRef('rating'),
+        )
+
+        # Candidates are everyone with a profile except the user and existing friends
+        scores = (
+            Progress.objects
+            .filter(user__gaming_profile__isnull=False)
+            .exclude(user_id=self.user_id)
+            .exclude(user__gaming_profile__in=self.get_friend_ids())
+            .values('user_id')
+            .annotate(
+                shared_genres=Count('game__genre', filter=Q(game__genre__in=user_genres), distinct=True),
+                rating_matches=Count('game', filter=Q(Exists(same_rating)), distinct=True),
+            )
+            .annotate(score=F('shared_genres') + F('rating_matches'))
+            .filter(score__gt=0)
+            .order_by('-score', 'user_id')[:limit]
+        )
+        scores = {row['user_id']: row for row in scores}
+
+        suggestions = list(Profile.objects.filter(user_id__in=scores))
+        for profile in suggestions:
+            row = scores[profile.user_id]
+            profile.score = row['score']
+            profile.shared_genres = row['shared_genres']
+            profile.rating_matches = row['rating_matches']
+        suggestions.sort(key=lambda profile: (-profile.score, profile.user_id))
         return suggestions
 
 
@@ -227,6 +306,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # A content object's comment thread, newest first (see gaming.feed and FeedItemCommentsView)
+            models.Index(fields=['content_type', 'object_id', 'timestamp'], name='gaming_comment_object_ts'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.profile} on {self.content_object}"
@@ -251,6 +334,10 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('profile', 'content_type', 'object_id')  # Prevent duplicate likes
+        indexes = [
+            # All likes of a content object; the unique index above only serves one profile's likes
+            models.Index(fields=['content_type', 'object_id'], name='gaming_like_object'),
+        ]
 
     def __str__(self):
         return f"Like by {self.profile} on {self.content_object}"
@@ -263,15 +350,22 @@ class Progress(models.Model):
     Attributes:
         COMPLETION_STATUS_CHOICES (list): Choices for completion status.
         RATING_CHOICES (list): Choices for game rating.
+        STATUS_KEYS (dict): Sort key of each completion status, in the order of the choices.
         game (ForeignKey): The game associated with the progress.
         user (ForeignKey): The user who is tracking the progress.
         platform (ForeignKey): The platform the game is played on.
         completion_status (CharField): The current completion status.
         hours_played (PositiveIntegerField): Total hours played.
+        session_minutes (PositiveSmallIntegerField): Minutes logged by play sessions that do not
+            make up a whole hour yet.
         achievements (PositiveIntegerField): Number of achievements earned.
         rating (IntegerField): User's rating of the game.
         notes (TextField): Additional notes about the progress.
         timestamp (DateTimeField): The time when the progress was recorded.
+        like_count (PositiveIntegerField): Denormalized number of likes.
+        comment_count (PositiveIntegerField): Denormalized number of comments.
+        status_key (PositiveSmallIntegerField): Sort key of the completion status.
+        game_title (CharField): Denormalized title of the game, for sorting.
         comments (GenericRelation): Generic relation to comments.
         likes (GenericRelation): Generic relation to likes.
     """
@@ -290,6 +384,8 @@ class Progress(models.Model):
         (5, '5'),
     ]
 
+    STATUS_KEYS = {status: key for key, (status, _) in enumerate(COMPLETION_STATUS_CHOICES, start=1)}
+
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='progress_entries')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_entries')
     platform = models.ForeignKey('Platform', on_delete=models.CASCADE, related_name='progress_entries')
@@ -299,18 +395,90 @@ class Progress(models.Model):
         default='Not Started'
     )
     hours_played = models.PositiveIntegerField(default=0)
+    session_minutes = models.PositiveSmallIntegerField(default=0, editable=False)
     achievements = models.PositiveIntegerField(default=0)
     rating = models.IntegerField(choices=RATING_CHOICES, null=True, blank=True)
     notes = models.TextField(blank=True, null=True)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    # Denormalized counters, kept in sync by the like/comment views (see gaming.counters)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    # Denormalized sort columns for the progress list, kept in step by save() and gaming.signals
+    status_key = models.PositiveSmallIntegerField(default=1, editable=False)
+    game_title = models.CharField(max_length=200, default='', editable=False)
+
     # GenericRelations for comments and likes
     comments = GenericRelation(Comment, related_query_name='progress_comments')
     likes = GenericRelation(Like, related_query_name='progress_likes')
 
+    # Fields whose changes are rolled up into UserGamingStats (see gaming.rollups)
+    ROLLUP_FIELDS = ('user_id', 'game_id', 'platform_id', 'completion_status', 'hours_played')
+
+    class Meta:
+        indexes = [
+            # Users' entries filtered by status (friends' progress) and matched by game (suggestions)
+            models.Index(fields=['user', 'completion_status', 'game'], name='gaming_progress_user_status'),
+            # The progress list's order, so a page is read straight from the index
+            models.Index(fields=['user', 'status_key', 'game_title'], name='gaming_progress_list_order'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.game.title}"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the progress entry, refreshing its denormalized sort columns.
+
+        game_title is only refreshed when the entry's game changed, so a save that does not
+        move the entry to another game does not load the game; renames are handled by the
+        game_renamed signal handler.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            stored = getattr(self, '_rollup_state', None)
+            refresh_title = stored is None or stored['game_id'] != self.game_id
+        else:
+            refresh_title = bool({'game', 'game_id'}.intersection(update_fields))
+            kwargs['update_fields'] = {*update_fields, 'status_key', *(['game_title'] if refresh_title else [])}
+        self.refresh_sort_columns(title=refresh_title)
+        super().save(*args, **kwargs)
+
+    def refresh_sort_columns(self, title=True):
+        """
+        Set status_key and game_title from the completion status and game.
+
+        Called by save(); bulk writes, which bypass save(), call it themselves.
+
+        Args:
+            title (bool): If False, game_title is left as it is.
+
+        Returns:
+            None
+        """
+        self.status_key = self.STATUS_KEYS.get(self.completion_status, len(self.STATUS_KEYS) + 1)
+        if title:
+            self.game_title = self.game.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values, so a later save can roll up just the difference
+        instance._rollup_state = instance.rollup_state()
+        return instance
+
+    def rollup_state(self):
+        """
+        Returns the values of the rolled-up fields, or None if some of them were not loaded.
+
+        Returns:
+            dict: {field attname: value}
+        """
+        if self.get_deferred_fields().intersection(self.ROLLUP_FIELDS):
+            return None
+        return {field: getattr(self, field) for field in self.ROLLUP_FIELDS}
+
     def get_absolute_url(self):
         """
         Returns the URL to access a particular progress entry.
@@ -334,6 +502,13 @@ class Friend(models.Model):
     profile2 = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='friend_profile2_set')
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Friendships are looked up from either end; both pairs cover the friend-id query
+            models.Index(fields=['profile1', 'profile2'], name='gaming_friend_pair'),
+            models.Index(fields=['profile2', 'profile1'], name='gaming_friend_pair_reverse'),
+        ]
+
     def __str__(self):
         return f"{self.profile1} & {self.profile2}"
 
@@ -346,6 +521,8 @@ class StatusMessage(models.Model):
         profile (ForeignKey): The profile that posted the status message.
         message (TextField): The content of the status message.
         timestamp (DateTimeField): The time when the status was posted.
+        like_count (PositiveIntegerField): Denormalized number of likes.
+        comment_count (PositiveIntegerField): Denormalized number of comments.
         comments (GenericRelation): Generic relation to comments.
         likes (GenericRelation): Generic relation to likes.
     """
@@ -353,6 +530,10 @@ class StatusMessage(models.Model):
     message = models.TextField()
     timestamp = models.DateTimeField(default=timezone.now)
 
+    # Denormalized counters, kept in sync by the like/comment views (see gaming.counters)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
     # GenericRelations for comments and likes
     comments = GenericRelation(Comment, related_query_name='statusmessage_comments')
     likes = GenericRelation(Like, related_query_name='statusmessage_likes')
@@ -406,6 +587,321 @@ class FeedItem(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # An author's feed items, newest first (see gaming.timeline)
+            models.Index(fields=['user', '-timestamp'], name='gaming_feeditem_user_ts'),
+        ]
 
     def __str__(self):
         return f"FeedItem by {self.user.username} at {self.timestamp}"
+
+
+class TimelineEntry(models.Model):
+    """
+    Represents a feed item delivered to a user's materialized news feed.
+
+    Entries are written when a FeedItem is created (fan-out on write) and repaired
+    when a friendship is added or removed, so reading a news feed is a single index
+    range scan over the owner's entries instead of a friend lookup plus an IN scan.
+
+    Attributes:
+        owner (ForeignKey): The user whose news feed contains the feed item.
+        feed_item (ForeignKey): The delivered feed item.
+        timestamp (DateTimeField): Copy of the feed item's timestamp, used for ordering.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')
+    feed_item = models.ForeignKey(FeedItem, on_delete=models.CASCADE, related_name='timeline_entries')
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-timestamp', '-feed_item']
+        unique_together = ('owner', 'feed_item')  # An item is delivered to a timeline once
+        indexes = [
+            models.Index(fields=['owner', '-timestamp', '-feed_item'], name='gaming_timeline_owner_ts'),
+        ]
+
+    def __str__(self):
+        return f"TimelineEntry for {self.owner.username}: {self.feed_item_id}"
+
+
+class FriendSuggestion(models.Model):
+    """
+    Represents a precomputed friend suggestion for a profile.
+
+    Rows are filled by the refresh_friend_suggestions management command and refreshed for
+    the affected profiles when Progress or Friend rows change (see gaming.suggestions), so
+    the suggestions page is a single indexed read.
+
+    Attributes:
+        profile (ForeignKey): The profile the suggestion is shown to.
+        candidate (ForeignKey): The suggested profile.
+        score (PositiveIntegerField): Shared genres plus same-rating games; higher ranks first.
+        reasons (JSONField): The shared genre names and same-rating games behind the score.
+        updated_at (DateTimeField): When the suggestion was last computed.
+    """
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='friend_suggestions')
+    candidate = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='suggested_to')
+    score = models.PositiveIntegerField()
+    reasons = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-score', 'candidate']
+        unique_together = ('profile', 'candidate')
+        indexes = [
+            models.Index(fields=['profile', '-score', 'candidate'], name='gaming_suggestion_rank'),
+        ]
+
+    def __str__(self):
+        return f"Suggest {self.candidate} to {self.profile} ({self.score})"
+
+
+class PlayerNeighbour(models.Model):
+    """
+    Represents a player with similar taste, precomputed from the rating matrix.
+
+    Rows are replaced wholesale by the build_player_neighbours management command
+    (see gaming.similarity).
+
+    Attributes:
+        profile (ForeignKey): The profile the neighbour is computed for.
+        neighbour (ForeignKey): The similar profile.
+        similarity (FloatField): Cosine or Pearson similarity, from 0 to 1.
+        shared_games (PositiveIntegerField): The number of games both have tracked.
+    """
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='player_neighbours')
+    neighbour = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='+')
+    similarity = models.FloatField()
+    shared_games = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['-similarity', 'neighbour']
+        unique_together = ('profile', 'neighbour')
+        indexes = [
+            models.Index(fields=['profile', '-similarity'], name='gaming_neighbour_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.neighbour} is similar to {self.profile} ({self.similarity:.2f})"
+
+
+class GameCooccurrence(models.Model):
+    """
+    Represents a game that is often tracked, enjoyed and played together with another game.
+
+    Rows are replaced wholesale by the build_game_recommendations management command
+    (see gaming.recommendations). Only the top related games of each game are kept.
+
+    Attributes:
+        game (ForeignKey): The game players have tracked.
+        related_game (ForeignKey): A game the same players also tracked.
+        score (FloatField): Co-occurrence weighted by rating and hours played, from 0 to 1.
+    """
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='cooccurrences')
+    related_game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['-score', 'related_game']
+        unique_together = ('game', 'related_game')
+        indexes = [
+            models.Index(fields=['game', '-score'], name='gaming_cooccurrence_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.game} -> {self.related_game} ({self.score:.2f})"
+
+
+class UserGamingStats(models.Model):
+    """
+    Represents the rolled-up statistics of a user's progress entries.
+
+    Kept up to date by deltas whenever a Progress entry is written (see gaming.rollups), so
+    the summary dashboard reads this row and its small per-genre, per-platform and per-game
+    child rows instead of aggregating the user's whole history.
+
+    Attributes:
+        user (OneToOneField): The user the statistics belong to.
+        total_hours (PositiveIntegerField): Hours played over all entries.
+        entry_count (PositiveIntegerField): Number of progress entries.
+        completed_count (PositiveIntegerField): Entries with status 'Completed'.
+        in_progress_count (PositiveIntegerField): Entries with status 'In Progress'.
+        not_started_count (PositiveIntegerField): Entries with status 'Not Started'.
+        wishlist_count (PositiveIntegerField): Entries with status 'Wishlist'.
+        updated_at (DateTimeField): When the statistics last changed.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='gaming_stats')
+    total_hours = models.PositiveIntegerField(default=0)
+    entry_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    not_started_count = models.PositiveIntegerField(default=0)
+    wishlist_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Global leaderboard order and rank counting (see gaming.leaderboards)
+            models.Index(fields=['-total_hours', 'user'], name='gaming_stats_rank'),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.user.username}"
+
+
+class UserGenreStats(models.Model):
+    """
+    Represents a user's rolled-up entries and hours for one genre.
+
+    Attributes:
+        user (ForeignKey): The user the statistics belong to.
+        genre (ForeignKey): The genre of the games.
+        entry_count (PositiveIntegerField): Number of progress entries for games of the genre.
+        hours (PositiveIntegerField): Hours played on games of the genre.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='genre_stats')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='+')
+    entry_count = models.PositiveIntegerField(default=0)
+    hours = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'genre')
+        indexes = [
+            models.Index(fields=['genre', '-hours', 'user'], name='gaming_genre_stats_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.genre}: {self.hours} hours"
+
+
+class UserPlatformStats(models.Model):
+    """
+    Represents a user's rolled-up entries for one platform.
+
+    Attributes:
+        user (ForeignKey): The user the statistics belong to.
+        platform (ForeignKey): The platform of the entries.
+        entry_count (PositiveIntegerField): Number of progress entries on the platform.
+        hours (PositiveIntegerField): Hours played on the platform.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='platform_stats')
+    platform = models.ForeignKey(Platform, on_delete=models.CASCADE, related_name='+')
+    entry_count = models.PositiveIntegerField(default=0)
+    hours = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'platform')
+        indexes = [
+            models.Index(fields=['platform', '-hours', 'user'], name='gaming_platform_stats_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.platform}: {self.entry_count} entries"
+
+
+class UserGameStats(models.Model):
+    """
+    Represents a user's rolled-up hours for one game, over all platforms.
+
+    Attributes:
+        user (ForeignKey): The user the statistics belong to.
+        game (ForeignKey): The game played.
+        entry_count (PositiveIntegerField): Number of progress entries for the game.
+        hours (PositiveIntegerField): Hours played on the game.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='game_stats')
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='+')
+    entry_count = models.PositiveIntegerField(default=0)
+    hours = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'game')
+        indexes = [
+            models.Index(fields=['user', '-hours'], name='gaming_game_stats_hours'),
+            models.Index(fields=['game', '-hours', 'user'], name='gaming_game_stats_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.game}: {self.hours} hours"
+
+
+class SessionBatch(models.Model):
+    """
+    Represents a batch of play sessions ingested for a user.
+
+    The client-supplied batch id is unique per user, so a retried batch is recognised and
+    answered with the stored result instead of being applied twice (see gaming.bulk).
+
+    Attributes:
+        user (ForeignKey): The user the sessions were logged for.
+        batch_id (CharField): The client-supplied batch id.
+        session_count (PositiveIntegerField): Number of sessions in the batch.
+        result (JSONField): The response returned when the batch was applied.
+        received_at (DateTimeField): When the batch was applied.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='session_batches')
+    batch_id = models.CharField(max_length=64)
+    session_count = models.PositiveIntegerField(default=0)
+    result = models.JSONField(default=dict)
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'batch_id')  # A batch is applied once
+
+    def __str__(self):
+        return f"Batch {self.batch_id} of {self.user.username}"
+
+
+class ApiToken(models.Model):
+    """
+    Represents the API token with which a user's automated trackers post play sessions.
+
+    Only a SHA-256 digest of the token is stored; the token itself is shown once, when
+    issued (see the issue_api_token management command).
+
+    Attributes:
+        user (OneToOneField): The user the token acts for.
+        key_digest (CharField): The hex SHA-256 digest of the token.
+        created_at (DateTimeField): When the token was issued.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='api_token')
+    key_digest = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"API token of {self.user.username}"
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user):
+        """
+        Issue a new API token for a user, revoking their previous one.
+
+        Args:
+            user (User): The user the token acts for.
+
+        Returns:
+            str: The token. It cannot be recovered later.
+        """
+        key = secrets.token_urlsafe(32)
+        cls.objects.update_or_create(user=user, defaults={'key_digest': cls.digest(key)})
+        return key
+
+    @classmethod
+    def authenticate(cls, key):
+        """
+        Return the active user a token acts for.
+
+        Args:
+            key (str): The token presented by the client.
+
+        Returns:
+            User: The user, or None if the token is unknown or the user is inactive.
+        """
+        token = cls.objects.select_related('user').filter(key_digest=cls.digest(key)).first()
+        if token is None or not token.user.is_active:
+            return None
+        return token.user
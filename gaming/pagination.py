@@ -0,0 +1,174 @@
+# gaming/pagination.py
+
+"""
+Keyset (Cursor) Pagination for the Gaming Application.
+
+Offset pagination counts the whole result set and scans past every skipped row, so deep pages
+get slower the further a user scrolls. Keyset pagination instead seeks directly to the last row
+shown, using an opaque cursor that encodes its (timestamp, id) sort key. There is no total
+count, and every page costs O(page size) regardless of depth.
+
+Classes:
+- KeysetPage
+- KeysetPaginator
+
+Functions:
+- encode_cursor
+- decode_cursor
+- parse_id
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+# Largest primary key a 64-bit integer column can hold
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor(timestamp, pk, direction=NEXT):
+    """
+    Encode a sort key and paging direction into an opaque URL-safe token.
+
+    Args:
+        timestamp (datetime): The timestamp of the boundary row.
+        pk (int): The id of the boundary row.
+        direction (str): NEXT to page towards older rows, PREVIOUS towards newer rows.
+
+    Returns:
+        str: The cursor token.
+    """
+    payload = json.dumps([timestamp.isoformat(), pk, direction], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token (str): The cursor token.
+
+    Raises:
+        ValidationError: If the token is malformed.
+
+    Returns:
+        tuple: (timestamp, pk, direction)
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, pk, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        timestamp = parse_datetime(timestamp)
+        if timestamp is None or direction not in (NEXT, PREVIOUS):
+            raise ValueError(token)
+        pk = parse_id(pk)
+        if pk is None:
+            raise ValueError(token)
+        return timestamp, pk, direction
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor.")
+
+
+def parse_id(value):
+    """
+    Parse a primary key taken from a request.
+
+    Args:
+        value (str or int): The raw value, e.g. a POST parameter or a decoded cursor field.
+
+    Returns:
+        int: The primary key, or None if the value is not a positive integer an id column can hold.
+    """
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        return None
+    return pk if 0 < pk <= MAX_ID else None
+
+
+class KeysetPage:
+    """
+    A page of results produced by KeysetPaginator.
+
+    Attributes:
+        object_list (list): The rows on the page, newest first.
+        has_next (bool): Whether older rows exist.
+        has_previous (bool): Whether newer rows exist.
+        next_cursor (str): Token for the page of older rows, or None.
+        previous_cursor (str): Token for the page of newer rows, or None.
+    """
+
+    def __init__(self, object_list, has_next, has_previous, key):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = encode_cursor(*key(object_list[-1]), NEXT) if has_next and object_list else None
+        self.previous_cursor = encode_cursor(*key(object_list[0]), PREVIOUS) if has_previous and object_list else None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset in descending (timestamp, id) order using cursors.
+
+    The queryset should be served by an index on its filter columns followed by the
+    timestamp and id fields, so each page is a single index range scan.
+    """
+
+    def __init__(self, queryset, per_page, timestamp_field='timestamp', id_field='pk'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.timestamp_field = timestamp_field
+        self.id_field = id_field
+
+    def key(self, obj):
+        """
+        Return the (timestamp, id) sort key of a row.
+        """
+        return getattr(obj, self.timestamp_field), getattr(obj, self.id_field)
+
+    def page(self, cursor=None):
+        """
+        Return the page after (or before) the given cursor.
+
+        Args:
+            cursor (str): A token from a previous page, or None for the first page.
+
+        Raises:
+            ValidationError: If the cursor is malformed.
+
+        Returns:
+            KeysetPage: The requested page.
+        """
+        ts, pk = self.timestamp_field, self.id_field
+        if cursor is None:
+            rows = list(self.queryset.order_by(f'-{ts}', f'-{pk}')[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], len(rows) > self.per_page, False, self.key)
+
+        timestamp, boundary_pk, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            older = Q(**{f'{ts}__lt': timestamp}) | Q(**{ts: timestamp, f'{pk}__lt': boundary_pk})
+            rows = list(self.queryset.filter(older).order_by(f'-{ts}', f'-{pk}')[:self.per_page + 1])
+            # The boundary row itself is newer, so a previous page exists.
+            return KeysetPage(rows[:self.per_page], len(rows) > self.per_page, True, self.key)
+
+        newer = Q(**{f'{ts}__gt': timestamp}) | Q(**{ts: timestamp, f'{pk}__gt': boundary_pk})
+        rows = list(self.queryset.filter(newer).order_by(ts, pk)[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, True, has_previous, self.key)
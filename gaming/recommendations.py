@@ -0,0 +1,107 @@
+# gaming/recommendations.py
+
+"""
+"Players Like You Also Played" Game Recommendations for the Gaming Application.
+
+Games that appear together in players' Progress entries are related. The co-occurrence of two
+games is the sum, over players who tracked both, of the product of the players' values for
+each game. Those values are the rating-times-log-hours values of the similarity engine (see
+gaming.similarity.entry_values), normalized to a cosine score so blockbusters do not relate
+to everything. The index is built offline into the GameCooccurrence table, with only the top
+related games of each game kept, so a request reads at most SEED_GAMES x k rows. Already
+tracked games are filtered out among those candidates only, so no query grows with the
+number of games a user has tracked.
+
+Constants:
+- SEED_GAMES: Number of a user's most recently tracked games used as recommendation seeds.
+
+Functions:
+- build_cooccurrence: Rebuild the GameCooccurrence table from Progress.
+- recommend_games: Recommend games a user has not tracked yet.
+"""
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import Game, GameCooccurrence, Progress
+from .similarity import RatingMatrix, top_k_neighbours
+
+SEED_GAMES = 10
+
+# Number of GameCooccurrence rows inserted per INSERT statement
+BATCH_SIZE = 1000
+
+
+def build_cooccurrence(k=20, chunk_size=None):
+    """
+    Rebuild the GameCooccurrence table from Progress.
+
+    The user x game matrix is transposed so each game is a row, and every game's k most
+    related games are computed with the similarity engine. The table is replaced in one
+    transaction, so readers never see a partial index.
+
+    Args:
+        k (int): The number of related games stored per game.
+        chunk_size (int): The number of games processed per vectorized step.
+
+    Returns:
+        int: The number of rows stored.
+    """
+    by_game = RatingMatrix.from_progress().transpose()
+    stored = 0
+    with transaction.atomic():
+        GameCooccurrence.objects.all().delete()
+        for games, related_games, scores, _ in top_k_neighbours(by_game, k=k, chunk_size=chunk_size):
+            rows = [
+                GameCooccurrence(game_id=game_id, related_game_id=related_game_id, score=score)
+                for game_id, related_game_id, score in zip(games.tolist(), related_games.tolist(), scores.tolist())
+            ]
+            GameCooccurrence.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            stored += len(rows)
+    return stored
+
+
+def recommend_games(user, limit=5):
+    """
+    Recommend games a user has not tracked yet, from the games they tracked most recently.
+
+    The related games of up to SEED_GAMES seeds are summed per game in one indexed query,
+    and the candidates the user already tracks are dropped with one more query over just
+    those candidates. The cost is bounded by the index size per game, not by the catalogue,
+    the user base or the user's library.
+
+    Args:
+        user (User): The user to recommend games to.
+        limit (int): The maximum number of games recommended.
+
+    Returns:
+        list: Game instances, best first, each annotated with recommendation_score.
+    """
+    seeds = set(
+        Progress.objects.filter(user=user).order_by('-timestamp').values_list('game_id', flat=True)[:SEED_GAMES]
+    )
+    if not seeds:
+        return []
+
+    # At most SEED_GAMES x k candidates, whatever the size of the user's library
+    candidates = list(
+        GameCooccurrence.objects
+        .filter(game_id__in=seeds)
+        .exclude(related_game_id__in=seeds)
+        .values('related_game_id')
+        .annotate(total=Sum('score'))
+        .order_by('-total', 'related_game_id')
+    )
+    tracked = set(
+        Progress.objects
+        .filter(user=user, game_id__in=[row['related_game_id'] for row in candidates])
+        .values_list('game_id', flat=True)
+    )
+    scores = [row for row in candidates if row['related_game_id'] not in tracked][:limit]
+    games = Game.objects.select_related('genre').in_bulk([row['related_game_id'] for row in scores])
+    recommendations = []
+    for row in scores:
+        game = games[row['related_game_id']]
+        game.recommendation_score = row['total']
+        recommendations.append(game)
+    return recommendations
@@ -0,0 +1,251 @@
+# gaming/rollups.py
+
+"""
+Per-User Statistics Rollups for the Gaming Application.
+
+UserGamingStats holds each user's totals (hours, entries, entries per completion status),
+with small child tables for hours and entries per genre, per platform and per game. Every
+Progress write is turned into a delta between the entry's old and new state (see
+Progress.rollup_state and gaming.signals) and applied with atomic F() updates, so reading a
+user's statistics never aggregates their Progress history.
+
+Writes that bypass the model signals (QuerySet.update, bulk_create, raw SQL, a game moved to
+another genre) must call apply_changes themselves or be repaired afterwards with
+rebuild_user_stats; check_user_stats finds users whose rollups have drifted.
+
+Constants:
+- STATUS_FIELDS: UserGamingStats count column per completion status.
+
+Functions:
+- apply_changes: Apply the deltas of Progress state changes to the rollup tables.
+- rebuild_user_stats: Recompute the rollups of users from their Progress entries.
+- check_user_stats: Find users whose stored rollups differ from their Progress entries.
+"""
+
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Game, Progress, UserGameStats, UserGamingStats, UserGenreStats, UserPlatformStats
+
+STATUS_FIELDS = {
+    'Completed': 'completed_count',
+    'In Progress': 'in_progress_count',
+    'Not Started': 'not_started_count',
+    'Wishlist': 'wishlist_count',
+}
+
+# Child rollup model -> (its key column, the matching Progress lookup)
+CHILD_ROLLUPS = {
+    UserGenreStats: ('genre_id', 'game__genre_id'),
+    UserPlatformStats: ('platform_id', 'platform_id'),
+    UserGameStats: ('game_id', 'game_id'),
+}
+
+
+def _add_state(deltas, state, genre_ids, sign):
+    """
+    Add (sign=1) or subtract (sign=-1) one Progress state to the per-row deltas.
+    """
+    user_id, hours = state['user_id'], state['hours_played'] * sign
+    totals = deltas[UserGamingStats][(user_id, None)]
+    totals['entry_count'] += sign
+    totals['total_hours'] += hours
+    totals[STATUS_FIELDS[state['completion_status']]] += sign
+
+    keys = {
+        UserGenreStats: genre_ids.get(state['game_id']),
+        UserPlatformStats: state['platform_id'],
+        UserGameStats: state['game_id'],
+    }
+    for model, key in keys.items():
+        if key is not None:
+            row = deltas[model][(user_id, key)]
+            row['entry_count'] += sign
+            row['hours'] += hours
+
+
+def _bump(model, lookup, delta, **values):
+    """
+    Add a delta to one rollup row and set the given values, creating the row when it does not exist yet.
+    """
+    changes = {field: Greatest(F(field) + amount, Value(0)) for field, amount in delta.items() if amount}
+    if not changes and not values:
+        return
+    changes.update(values)
+    if model.objects.filter(**lookup).update(**changes) or not any(amount > 0 for amount in delta.values()):
+        # A missing row has nothing to subtract from, e.g. while its user is being deleted
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **values, **{field: max(amount, 0) for field, amount in delta.items()})
+    except IntegrityError:
+        # Created concurrently: apply the delta to that row instead
+        model.objects.filter(**lookup).update(**changes)
+
+
+def _create_missing(model, key_field, deltas):
+    """
+    Create the missing child rollup rows of a batch in one statement.
+
+    Returns:
+        set: The (user id, key) pairs whose rows were created with their deltas applied.
+    """
+    existing = set(
+        model.objects
+        .filter(user_id__in={user_id for user_id, _ in deltas}, **{f'{key_field}__in': {key for _, key in deltas}})
+        .values_list('user_id', key_field)
+    )
+    missing = {
+        pair: delta for pair, delta in deltas.items()
+        if pair not in existing and any(amount > 0 for amount in delta.values())
+    }
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([
+                model(user_id=user_id, **{key_field: key}, **{field: max(amount, 0) for field, amount in delta.items()})
+                for (user_id, key), delta in missing.items()
+            ])
+    except IntegrityError:
+        # Some were created concurrently: fall back to adding the deltas row by row
+        return set()
+    return set(missing)
+
+
+def apply_changes(changes):
+    """
+    Apply the deltas of Progress state changes to the rollup tables.
+
+    Deltas are netted per rollup row first, so a batch of changes costs one UPDATE per
+    touched existing row plus one query for the games' genres; the missing child rows of
+    a batch are created together. Child rows left with no entries are deleted. The
+    updated_at of every touched user's UserGamingStats is advanced, even when only a child
+    row changed, so it marks the last change to any of their rollups.
+
+    Args:
+        changes (iterable): (old state, new state) pairs as returned by Progress.rollup_state;
+            old is None for a created entry and new is None for a deleted one.
+
+    Returns:
+        dict: The applied deltas, {rollup model: {(user id, key): {field: delta}}}, with key
+            None for UserGamingStats.
+    """
+    changes = [(old, new) for old, new in changes if old != new]
+    if not changes:
+        return {}
+    game_ids = {state['game_id'] for change in changes for state in change if state is not None}
+    genre_ids = dict(Game.objects.filter(pk__in=game_ids).values_list('pk', 'genre_id'))
+
+    deltas = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    for old, new in changes:
+        if old is not None:
+            _add_state(deltas, old, genre_ids, -1)
+        if new is not None:
+            _add_state(deltas, new, genre_ids, 1)
+
+    with transaction.atomic():
+        for (user_id, _), delta in deltas[UserGamingStats].items():
+            _bump(UserGamingStats, {'user_id': user_id}, delta, updated_at=timezone.now())
+        for model, (key_field, _) in CHILD_ROLLUPS.items():
+            created = _create_missing(model, key_field, deltas[model]) if len(deltas[model]) > 1 else set()
+            for (user_id, key), delta in deltas[model].items():
+                if (user_id, key) not in created:
+                    _bump(model, {'user_id': user_id, key_field: key}, delta)
+            touched = {user_id for user_id, _ in deltas[model]}
+            model.objects.filter(user_id__in=touched, entry_count=0).delete()
+    return deltas
+
+
+def _empty_totals():
+    return {'entry_count': 0, 'total_hours': 0, **{field: 0 for field in STATUS_FIELDS.values()}}
+
+
+def _expected_rollups(user_ids):
+    """
+    Aggregate the rollups of the given users from their Progress entries.
+
+    Returns:
+        dict: {user id: {rollup model: {key: {field: value}}}}, keyed None for UserGamingStats.
+    """
+    progress = Progress.objects.filter(user_id__in=user_ids).order_by()
+    rollups = defaultdict(lambda: defaultdict(dict))
+
+    rows = progress.values('user_id', 'completion_status').annotate(count=Count('pk'), hours=Sum('hours_played'))
+    for row in rows:
+        totals = rollups[row['user_id']][UserGamingStats].setdefault(None, _empty_totals())
+        totals['entry_count'] += row['count']
+        totals['total_hours'] += row['hours']
+        totals[STATUS_FIELDS[row['completion_status']]] += row['count']
+
+    for model, (_, lookup) in CHILD_ROLLUPS.items():
+        rows = progress.filter(**{f'{lookup}__isnull': False}).values('user_id', lookup)
+        for row in rows.annotate(count=Count('pk'), hours=Sum('hours_played')):
+            rollups[row['user_id']][model][row[lookup]] = {'entry_count': row['count'], 'hours': row['hours']}
+    return rollups
+
+
+def _stored_rollups(user_ids):
+    """
+    Read the stored rollups of the given users, in the shape of _expected_rollups.
+    """
+    rollups = defaultdict(lambda: defaultdict(dict))
+    fields = list(_empty_totals())
+    for row in UserGamingStats.objects.filter(user_id__in=user_ids).values('user_id', *fields):
+        totals = {field: row[field] for field in fields}
+        if totals != _empty_totals():
+            rollups[row['user_id']][UserGamingStats][None] = totals
+    for model, (key_field, _) in CHILD_ROLLUPS.items():
+        for row in model.objects.filter(user_id__in=user_ids).values('user_id', key_field, 'entry_count', 'hours'):
+            rollups[row['user_id']][model][row[key_field]] = {'entry_count': row['entry_count'], 'hours': row['hours']}
+    return rollups
+
+
+def rebuild_user_stats(user_ids):
+    """
+    Recompute the rollups of the given users from their Progress entries.
+
+    The users' rollup rows are replaced in one transaction.
+
+    Args:
+        user_ids (iterable): Primary keys of the users to rebuild.
+
+    Returns:
+        int: The number of users rebuilt.
+    """
+    user_ids = list(user_ids)
+    expected = _expected_rollups(user_ids)
+    with transaction.atomic():
+        UserGamingStats.objects.filter(user_id__in=user_ids).delete()
+        UserGamingStats.objects.bulk_create([
+            UserGamingStats(user_id=user_id, **rollup[UserGamingStats].get(None, _empty_totals()))
+            for user_id, rollup in expected.items()
+        ])
+        for model, (key_field, _) in CHILD_ROLLUPS.items():
+            model.objects.filter(user_id__in=user_ids).delete()
+            model.objects.bulk_create([
+                model(user_id=user_id, **{key_field: key}, **values)
+                for user_id, rollup in expected.items()
+                for key, values in rollup[model].items()
+            ])
+    return len(user_ids)
+
+
+def check_user_stats(user_ids):
+    """
+    Find users whose stored rollups differ from their Progress entries.
+
+    Args:
+        user_ids (iterable): Primary keys of the users to check.
+
+    Returns:
+        list: Primary keys of the users whose rollups have drifted, in ascending order.
+    """
+    user_ids = list(user_ids)
+    expected, stored = _expected_rollups(user_ids), _stored_rollups(user_ids)
+    return sorted(
+        user_id for user_id in set(expected) | set(stored)
+        if expected.get(user_id, {}) != stored.get(user_id, {})
+    )
@@ -0,0 +1,202 @@
+# gaming/signals.py
+
+"""
+Signal Handlers for the Gaming Application.
+
+This module keeps derived data in sync with the models it is computed from. Handlers are
+connected when the app registry is ready (see GamingConfig.ready).
+
+Handlers:
+- feed_item_created: Fans a new FeedItem out to the materialized timelines.
+- friend_saved: Backfills both timelines when a friendship is created.
+- friend_deleted: Prunes both timelines when a friendship is removed.
+- friendship_changed: Invalidates both profiles' cached friend-id sets once the change is committed.
+- suggestions_friend_changed: Refreshes both profiles' friend suggestions.
+- suggestions_progress_changed: Marks stale the friend suggestions a progress change may affect.
+- rollup_progress_saving: Remembers the stored state of a progress entry about to be saved.
+- rollup_progress_saved: Applies a saved progress entry's delta to the user's statistics rollups
+  and invalidates the cached leaderboards it changed.
+- rollup_progress_deleted: Subtracts a deleted progress entry from the user's statistics rollups
+  and invalidates the cached leaderboards it changed.
+- summary_progress_changed: Invalidates the user's cached summary statistics.
+- game_renamed: Refreshes the denormalized game title of the game's progress entries.
+- content_changed: Invalidates the cached feed fragments of a status message or progress entry.
+- interaction_changed: Invalidates the cached feed fragments of the object a comment or like is on.
+- image_changed: Invalidates the cached feed fragments of an image's status message.
+- name_changed: Invalidates every cached feed fragment when a game, platform or profile changes.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .feed import bump_content_version, bump_names_version
+from .models import Comment, FeedItem, Friend, Game, Image, Like, Platform, Profile, Progress, StatusMessage
+from .leaderboards import invalidate_leaderboards
+from .rollups import apply_changes
+from .stats import invalidate_summary
+from .suggestions import progress_changed, refresh_profiles
+from .timeline import backfill_friendship, fan_out_feed_item, prune_friendship
+
+
+@receiver(post_save, sender=FeedItem)
+def feed_item_created(sender, instance, created, **kwargs):
+    """
+    Deliver a newly created feed item to its author's and friends' timelines.
+    """
+    if created:
+        fan_out_feed_item(instance)
+
+
+@receiver([post_save, post_delete], sender=Friend)
+def friendship_changed(sender, instance, **kwargs):
+    """
+    Invalidate both profiles' cached friend-id sets once the friendship change is committed.
+
+    Invalidating before the commit would let a concurrent reader re-cache the set from
+    before the change. Profile instances already attached to the friendship are reset at once,
+    so a view that just added a friend sees the change on the same request.
+    """
+    profiles = []
+    for field_name, profile_id in (('profile1', instance.profile1_id), ('profile2', instance.profile2_id)):
+        field = Friend._meta.get_field(field_name)
+        if field.is_cached(instance):
+            field.get_cached_value(instance)._friend_ids = None
+        profiles.append(profile_id)
+    transaction.on_commit(lambda: Profile.invalidate_friend_ids(*profiles))
+
+
+@receiver(post_save, sender=Friend)
+def friend_saved(sender, instance, created, **kwargs):
+    """
+    Deliver each new friend's existing feed items to the other's timeline.
+    """
+    if created:
+        backfill_friendship(instance.profile1_id, instance.profile2_id)
+
+
+@receiver(post_delete, sender=Friend)
+def friend_deleted(sender, instance, **kwargs):
+    """
+    Remove each former friend's feed items from the other's timeline.
+    """
+    prune_friendship(instance.profile1_id, instance.profile2_id)
+
+
+@receiver([post_save, post_delete], sender=Friend)
+def suggestions_friend_changed(sender, instance, **kwargs):
+    """
+    Refresh both profiles' friend suggestions once the friendship change is committed.
+    """
+    profile_ids = (instance.profile1_id, instance.profile2_id)
+    transaction.on_commit(lambda: refresh_profiles(profile_ids))
+
+
+@receiver([post_save, post_delete], sender=Progress)
+def suggestions_progress_changed(sender, instance, **kwargs):
+    """
+    Mark stale the friend suggestions the change may affect once it is committed.
+
+    Both the entry's game and, for a save that moved it, its previous game are passed on.
+    """
+    user_id = instance.user_id
+    previous = getattr(instance, '_rollup_previous', None)
+    game_ids = {instance.game_id, previous['game_id']} if previous else {instance.game_id}
+    transaction.on_commit(lambda: progress_changed(user_id, game_ids))
+
+
+@receiver(pre_save, sender=Progress)
+def rollup_progress_saving(sender, instance, **kwargs):
+    """
+    Remember the stored state of a progress entry about to be saved.
+
+    Entries loaded from the database carry a snapshot of their stored state, so only an
+    entry saved with an explicit primary key or with deferred fields costs a query.
+    """
+    previous = getattr(instance, '_rollup_state', None)
+    if previous is None and instance.pk is not None:
+        previous = Progress.objects.filter(pk=instance.pk).values(*Progress.ROLLUP_FIELDS).first()
+    instance._rollup_previous = previous
+
+
+@receiver(post_save, sender=Progress)
+def rollup_progress_saved(sender, instance, **kwargs):
+    """
+    Apply the difference between a progress entry's previous and saved state to the user's rollups.
+
+    The cached leaderboards whose hours changed are invalidated.
+    """
+    state = instance.rollup_state()
+    if state is None:
+        state = Progress.objects.filter(pk=instance.pk).values(*Progress.ROLLUP_FIELDS).first()
+    invalidate_leaderboards(apply_changes([(getattr(instance, '_rollup_previous', None), state)]))
+    instance._rollup_state = state
+
+
+@receiver(post_delete, sender=Progress)
+def rollup_progress_deleted(sender, instance, **kwargs):
+    """
+    Subtract a deleted progress entry from the user's rollups and invalidate the leaderboards it left.
+    """
+    state = getattr(instance, '_rollup_state', None) or instance.rollup_state()
+    if state is not None:
+        invalidate_leaderboards(apply_changes([(state, None)]))
+
+
+@receiver([post_save, post_delete], sender=Progress)
+def summary_progress_changed(sender, instance, **kwargs):
+    """
+    Invalidate the cached summary statistics of the user whose progress changed.
+    """
+    invalidate_summary(instance.user_id)
+
+
+@receiver(post_save, sender=Game)
+def game_renamed(sender, instance, created, **kwargs):
+    """
+    Refresh the denormalized game title that orders the game's progress entries.
+    """
+    if not created:
+        Progress.objects.filter(game=instance).exclude(game_title=instance.title).update(game_title=instance.title)
+
+
+@receiver([post_save, post_delete], sender=StatusMessage)
+@receiver([post_save, post_delete], sender=Progress)
+def content_changed(sender, instance, **kwargs):
+    """
+    Invalidate the cached feed fragments of a changed status message or progress entry.
+    """
+    bump_content_version(ContentType.objects.get_for_model(sender).pk, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Like)
+def interaction_changed(sender, instance, **kwargs):
+    """
+    Invalidate the cached feed fragments of the object a comment or like belongs to.
+    """
+    if instance.content_type_id is not None and instance.object_id is not None:
+        bump_content_version(instance.content_type_id, instance.object_id)
+
+
+@receiver([post_save, post_delete], sender=Image)
+def image_changed(sender, instance, **kwargs):
+    """
+    Invalidate the cached feed fragments of the status message an image belongs to.
+    """
+    bump_content_version(ContentType.objects.get_for_model(StatusMessage).pk, instance.status_message_id)
+
+
+@receiver([post_save, post_delete], sender=Game)
+@receiver([post_save, post_delete], sender=Platform)
+@receiver([post_save, post_delete], sender=Profile)
+def name_changed(sender, instance, created=False, **kwargs):
+    """
+    Invalidate every cached feed fragment, which may render the changed game, platform or profile name.
+
+    Renames are rare, so they move all fragments to a new version instead of finding the
+    items that mention the name. A new game, platform or profile is in no fragment yet.
+    """
+    if not created:
+        bump_names_version()
@@ -0,0 +1,371 @@
+# gaming/similarity.py
+
+"""
+Rating-Matrix Similarity Engine for the Gaming Application.
+
+Players are matched on their whole gaming history instead of identical ratings of identical
+games. Progress entries are turned into a sparse user x game matrix in compressed sparse row
+(CSR) form, and every player's top-k most similar players are found with vectorized NumPy:
+
+- Each entry's value is the player's rating (NEUTRAL_RATING when unrated), scaled up by the
+  log of the hours they played, so both opinion and engagement count.
+- Similarities are sparse dot products. For a chunk of players, every (player, game) entry
+  is expanded against the other players of that game through the game-major (CSC) copy of
+  the matrix, and the products are summed per (player, other player) pair with np.bincount
+  into a dense block whose size is capped, so memory stays bounded.
+- "cosine" divides by the players' vector norms; "pearson" first subtracts each player's
+  mean value, so players who rate everything high are not matched on that alone.
+
+The neighbours are persisted in the PlayerNeighbour table (see store_neighbours), which
+ShowFriendSuggestionsView reads. NumPy is installed with pandas, already a dependency.
+
+Constants:
+- NEUTRAL_RATING: Rating assumed for entries without one.
+- METRICS: The supported similarity metrics.
+
+Classes:
+- RatingMatrix: A sparse user x game matrix in CSR form.
+
+Functions:
+- entry_values: Combine ratings and hours played into matrix values.
+- top_k_neighbours: Compute every player's most similar players, chunk by chunk.
+- store_neighbours: Replace the PlayerNeighbour table with freshly computed neighbours.
+- synthetic_matrix: Build a random rating matrix for benchmarking.
+"""
+
+import numpy as np
+from django.db import transaction
+
+from .models import PlayerNeighbour, Profile, Progress
+
+NEUTRAL_RATING = 3
+
+METRICS = ('cosine', 'pearson')
+
+# Number of PlayerNeighbour rows inserted per INSERT statement
+BATCH_SIZE = 1000
+
+# Upper bound on the cells of the dense chunk x players block (8 bytes each, two blocks)
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def entry_values(ratings, hours):
+    """
+    Combine ratings and hours played into matrix values.
+
+    Args:
+        ratings (ndarray): Ratings from 1 to 5, with 0 for unrated entries.
+        hours (ndarray): Hours played.
+
+    Returns:
+        ndarray: float32 values; higher means the player likes the game more.
+    """
+    ratings = np.where(ratings > 0, ratings, NEUTRAL_RATING).astype(np.float32)
+    return ratings * (1 + np.log1p(hours.astype(np.float32)))
+
+
+class RatingMatrix:
+    """
+    A sparse user x game matrix in compressed sparse row (CSR) form.
+
+    Row i holds the values of user user_ids[i]: its games are
+    game_ids[indices[indptr[i]:indptr[i + 1]]] and its values data[indptr[i]:indptr[i + 1]].
+
+    Attributes:
+        user_ids (ndarray): The user primary key of each row.
+        game_ids (ndarray): The game primary key of each column.
+        indptr (ndarray): Row start offsets into indices and data, of length rows + 1.
+        indices (ndarray): The column of each stored value.
+        data (ndarray): The stored values.
+    """
+
+    def __init__(self, user_ids, game_ids, indptr, indices, data):
+        self.user_ids = user_ids
+        self.game_ids = game_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @property
+    def shape(self):
+        return len(self.user_ids), len(self.game_ids)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @classmethod
+    def from_entries(cls, users, games, values):
+        """
+        Build a matrix from (user, game, value) triples, summing duplicate pairs.
+
+        Args:
+            users (ndarray): The user primary key of each entry.
+            games (ndarray): The game primary key of each entry.
+            values (ndarray): The value of each entry.
+
+        Returns:
+            RatingMatrix: The matrix, with rows and columns in ascending primary key order.
+        """
+        user_ids, rows = np.unique(users, return_inverse=True)
+        game_ids, cols = np.unique(games, return_inverse=True)
+
+        # Sort by (row, column) and merge entries for the same pair (e.g. one game on two platforms)
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], np.asarray(values, dtype=np.float32)[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        starts = np.flatnonzero(first)
+        data = np.add.reduceat(values, starts) if len(starts) else values
+        rows, indices = rows[starts], cols[starts].astype(np.int32)
+
+        indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(user_ids)), out=indptr[1:])
+        return cls(user_ids, game_ids, indptr, indices, data.astype(np.float32))
+
+    @classmethod
+    def from_progress(cls, queryset=None):
+        """
+        Build a matrix from Progress entries.
+
+        Args:
+            queryset (QuerySet): The Progress entries to use; all of them by default.
+
+        Returns:
+            RatingMatrix: The user x game matrix.
+        """
+        queryset = Progress.objects.all() if queryset is None else queryset
+        rows = np.array(
+            list(queryset.order_by().values_list('user_id', 'game_id', 'rating', 'hours_played').iterator()),
+            dtype=object,
+        ).reshape(-1, 4)
+        ratings = np.array([rating or 0 for rating in rows[:, 2]], dtype=np.int64)
+        return cls.from_entries(
+            rows[:, 0].astype(np.int64),
+            rows[:, 1].astype(np.int64),
+            entry_values(ratings, rows[:, 3].astype(np.int64)),
+        )
+
+    def row_lengths(self):
+        """
+        Return the number of stored values in each row.
+        """
+        return np.diff(self.indptr)
+
+    def row_ids(self):
+        """
+        Return the row of each stored value.
+        """
+        return np.repeat(np.arange(self.shape[0]), self.row_lengths())
+
+    def centered(self):
+        """
+        Return a copy with each row's mean subtracted from its stored values.
+
+        Returns:
+            RatingMatrix: The mean-centered matrix, as used by the Pearson correlation.
+        """
+        lengths = self.row_lengths()
+        sums = np.bincount(self.row_ids(), weights=self.data, minlength=self.shape[0])
+        means = np.divide(sums, lengths, out=np.zeros_like(sums), where=lengths > 0)
+        data = (self.data - np.repeat(means, lengths)).astype(np.float32)
+        return RatingMatrix(self.user_ids, self.game_ids, self.indptr, self.indices, data)
+
+    def row_norms(self):
+        """
+        Return the Euclidean norm of each row.
+        """
+        squares = np.bincount(self.row_ids(), weights=self.data.astype(np.float64) ** 2, minlength=self.shape[0])
+        return np.sqrt(squares)
+
+    def top_per_row(self, limit):
+        """
+        Return a copy keeping only the limit largest stored values of each row.
+
+        Args:
+            limit (int): The maximum number of values kept per row.
+
+        Returns:
+            RatingMatrix: The pruned matrix.
+        """
+        rows = self.row_ids()
+        order = np.lexsort((-self.data, rows))
+        ranks = np.arange(self.nnz) - np.repeat(self.indptr[:-1], self.row_lengths())
+        keep = np.sort(order[ranks < limit])
+        indptr = np.zeros(len(self.indptr), dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=self.shape[0]), out=indptr[1:])
+        return RatingMatrix(self.user_ids, self.game_ids, indptr, self.indices[keep], self.data[keep])
+
+    def transpose(self):
+        """
+        Return the game x user matrix in CSR form (the CSC form of this matrix).
+
+        Returns:
+            RatingMatrix: The transposed matrix; its user_ids are this matrix's game_ids.
+        """
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+        return RatingMatrix(
+            self.game_ids, self.user_ids, indptr,
+            self.row_ids()[order].astype(np.int32), self.data[order],
+        )
+
+
+def _expand(indptr, positions):
+    """
+    For each CSR row listed in positions, return the offsets of all its stored values.
+
+    Returns:
+        tuple: (index into positions of each offset, the offsets)
+    """
+    counts = indptr[positions + 1] - indptr[positions]
+    owners = np.repeat(np.arange(len(positions)), counts)
+    firsts = np.repeat(indptr[positions] - np.cumsum(counts) + counts, counts)
+    return owners, firsts + np.arange(counts.sum())
+
+
+def top_k_neighbours(matrix, k=20, metric='cosine', chunk_size=None, min_overlap=1, max_game_players=None,
+                     max_block_cells=MAX_BLOCK_CELLS):
+    """
+    Compute the k most similar players of every player, one chunk of players at a time.
+
+    For each chunk, the products of every (player, game) entry with the other players of
+    that game are summed into a dense chunk x players block with np.bincount, and the top
+    k of each row are selected from its non-zero cells. The block never exceeds
+    max_block_cells cells, which bounds memory whatever the number of players.
+
+    Very popular games pair every player with a large share of all others. With
+    max_game_players set, only that many of each game's players (those who value it most)
+    are paired through it, which makes the cost per player independent of the catalogue's
+    most popular titles at the price of approximating those players' similarities.
+
+    Only positive similarities between players sharing at least min_overlap games are kept.
+
+    Args:
+        matrix (RatingMatrix): The user x game matrix.
+        k (int): The maximum number of neighbours per player.
+        metric (str): 'cosine' or 'pearson'.
+        chunk_size (int): The number of players per step; derived from max_block_cells by default.
+        min_overlap (int): The minimum number of games two players must share.
+        max_game_players (int): Players paired through each game, or None for exact results.
+        max_block_cells (int): The maximum size of the dense per-chunk block.
+
+    Raises:
+        ValueError: If the metric is unknown.
+
+    Yields:
+        tuple: Arrays (user ids, neighbour user ids, similarities, shared game counts) for one
+        chunk, ordered by user and then by descending similarity.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown similarity metric: {metric}")
+    if metric == 'pearson':
+        matrix = matrix.centered()
+
+    n_users = matrix.shape[0]
+    if not n_users:
+        return
+    chunk_size = min(chunk_size or n_users, max(1, max_block_cells // n_users))
+    norms = matrix.row_norms()
+    by_game = matrix.transpose()
+    if max_game_players:
+        by_game = by_game.top_per_row(max_game_players)
+
+    for start in range(0, n_users, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, n_users))
+
+        # Every (chunk row, game) entry...
+        local, offsets = _expand(matrix.indptr, rows)
+        games, values = matrix.indices[offsets], matrix.data[offsets]
+
+        # ...times every other player of that game, summed per (row, other) cell
+        entry, other_offsets = _expand(by_game.indptr, games.astype(np.int64))
+        cells = local[entry] * n_users + by_game.indices[other_offsets]
+        size = len(rows) * n_users
+        dots = np.bincount(cells, weights=values[entry] * by_game.data[other_offsets], minlength=size)
+        overlaps = np.bincount(cells, minlength=size)
+        overlaps[(rows - start) * n_users + rows] = 0  # Never pair a player with themselves
+
+        # Compact the block to the qualifying pairs and turn their dot products into similarities
+        cells = np.flatnonzero(overlaps >= max(min_overlap, 1))
+        local_rows, others = cells // n_users, cells % n_users
+        denominators = norms[local_rows + start] * norms[others]
+        similarities = np.divide(dots[cells], denominators, out=np.zeros(len(cells)), where=denominators > 0)
+        keep = similarities > 0
+        cells, local_rows, others, similarities = cells[keep], local_rows[keep], others[keep], similarities[keep]
+
+        # Keep the k best per row: similarities are at most 1, so this key sorts by row, then by
+        # descending similarity
+        order = np.argsort(local_rows * 4.0 - similarities)
+        local_rows = local_rows[order]
+        row_starts = np.flatnonzero(np.r_[True, local_rows[1:] != local_rows[:-1]]) if len(order) else order
+        ranks = np.arange(len(order)) - np.repeat(row_starts, np.diff(np.r_[row_starts, len(order)]))
+        top = order[ranks < k]
+
+        yield (
+            matrix.user_ids[start + local_rows[ranks < k]],
+            matrix.user_ids[others[top]],
+            similarities[top],
+            overlaps[cells[top]],
+        )
+
+
+def store_neighbours(chunks):
+    """
+    Replace the PlayerNeighbour table with the neighbours produced by top_k_neighbours.
+
+    Users without a gaming profile are skipped. The table is replaced in one transaction,
+    so readers never see a partial set.
+
+    Args:
+        chunks (iterable): Chunks yielded by top_k_neighbours.
+
+    Returns:
+        int: The number of neighbour rows stored.
+    """
+    profile_ids = dict(Profile.objects.values_list('user_id', 'pk'))
+    stored = 0
+    with transaction.atomic():
+        PlayerNeighbour.objects.all().delete()
+        for users, neighbours, similarities, overlaps in chunks:
+            rows = [
+                PlayerNeighbour(
+                    profile_id=profile_ids[user_id],
+                    neighbour_id=profile_ids[neighbour_id],
+                    similarity=float(similarity),
+                    shared_games=int(overlap),
+                )
+                for user_id, neighbour_id, similarity, overlap
+                in zip(users.tolist(), neighbours.tolist(), similarities.tolist(), overlaps.tolist())
+                if user_id in profile_ids and neighbour_id in profile_ids
+            ]
+            PlayerNeighbour.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            stored += len(rows)
+    return stored
+
+
+def synthetic_matrix(n_users, n_games, per_user, seed=0):
+    """
+    Build a random rating matrix for benchmarking.
+
+    Game popularity follows a Zipf-like distribution, as real catalogues do, and each user
+    has per_user entries with random ratings and hours.
+
+    Args:
+        n_users (int): The number of users.
+        n_games (int): The number of games.
+        per_user (int): The number of entries per user.
+        seed (int): The random seed.
+
+    Returns:
+        RatingMatrix: The synthetic matrix.
+    """
+    rng = np.random.default_rng(seed)
+    popularity = 1 / np.arange(1, n_games + 1) ** 0.8
+    popularity /= popularity.sum()
+    users = np.repeat(np.arange(1, n_users + 1), per_user)
+    games = rng.choice(np.arange(1, n_games + 1), size=len(users), p=popularity)
+    ratings = rng.integers(0, 6, size=len(users))
+    hours = rng.exponential(20, size=len(users)).astype(np.int64)
+    return RatingMatrix.from_entries(users, games, entry_values(ratings, hours))
@@ -0,0 +1,144 @@
+# gaming/stats.py
+
+"""
+Summary Dashboard Statistics for the Gaming Application.
+
+The summary dashboard reads the per-user rollups that are maintained by deltas on every
+Progress write (see gaming.rollups): the UserGamingStats row for the scalars and the small
+per-game, per-genre and per-platform rollup rows for the charts, so its cost does not grow
+with the user's history. The result is cached per user and invalidated whenever one of the
+user's Progress entries is written (see gaming.signals); it names games and platforms, so it
+is also discarded when the names version of gaming.feed moves on.
+
+The rollups' updated_at and the names version also version the summary, so clients can
+revalidate the summary JSON with an ETag (see summary_etag) without any statistics being read.
+
+Constants:
+- SUMMARY_CACHE_TIMEOUT: Seconds a cached summary is kept.
+
+Functions:
+- compute_summary: Aggregate a user's summary statistics.
+- get_summary: Return a user's summary statistics, from the cache when possible.
+- summary_etag: Return an entity tag identifying the current version of a user's summary.
+- invalidate_summary: Discard a user's cached summary statistics.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+from .feed import get_names_version
+from .models import UserGameStats, UserGamingStats, UserGenreStats, UserPlatformStats
+
+SUMMARY_CACHE_TIMEOUT = 60 * 60
+
+SUMMARY_KEY = 'gaming:summary:{}'
+
+TOP_GAMES = 5
+
+
+def compute_summary(user):
+    """
+    Read a user's summary statistics from their rollups in four queries.
+
+    Args:
+        user (User): The user whose Progress entries are summarized.
+
+    Returns:
+        dict: The summary values and chart datasets, keyed as the summary template expects.
+    """
+    totals = UserGamingStats.objects.filter(user=user).first() or UserGamingStats(user=user)
+
+    # Hours per game: the top game is the first of the top 5
+    top_games = list(
+        UserGameStats.objects.filter(user=user)
+        .values('game__title', 'hours')
+        .order_by('-hours', 'game__title')[:TOP_GAMES]
+    )
+
+    # Entries and hours per genre, shared by the genre pie and the hours-by-genre bars
+    genres = list(
+        UserGenreStats.objects.filter(user=user)
+        .values('genre__name', 'entry_count', 'hours')
+        .order_by('-hours', 'genre__name')
+    )
+    total_entries = sum(g['entry_count'] for g in genres)
+
+    # Entries per platform
+    platforms = list(
+        UserPlatformStats.objects.filter(user=user)
+        .values('platform__name', 'entry_count')
+        .order_by('platform__name')
+    )
+
+    return {
+        'total_hours': totals.total_hours,
+        'games_completed': totals.completed_count,
+        'top_game_title': top_games[0]['game__title'] if top_games else "No games played",
+        'top_game_hours': top_games[0]['hours'] if top_games else 0,
+        'chart_labels': [entry['game__title'] for entry in top_games],
+        'chart_data': [entry['hours'] for entry in top_games],
+        'genre_labels': [g['genre__name'] for g in genres],
+        'genre_data': [round(g['entry_count'] / total_entries * 100, 2) for g in genres],
+        'platform_labels': [p['platform__name'] for p in platforms],
+        'platform_data': [p['entry_count'] for p in platforms],
+        'status_labels': ["Status"],
+        'completed_data': [totals.completed_count],
+        'in_progress_data': [totals.in_progress_count],
+        'not_started_data': [totals.not_started_count],
+        'wishlist_data': [totals.wishlist_count],
+        'hours_genre_labels': [g['genre__name'] for g in genres],
+        'hours_genre_data': [g['hours'] for g in genres],
+    }
+
+
+def get_summary(user):
+    """
+    Return a user's summary statistics, computing and caching them on a miss.
+
+    Args:
+        user (User): The user whose Progress entries are summarized.
+
+    Returns:
+        dict: See compute_summary.
+    """
+    key = SUMMARY_KEY.format(user.pk)
+    names_version = get_names_version()
+    cached = cache.get(key)
+    if cached is not None and cached[0] == names_version:
+        return cached[1]
+    summary = compute_summary(user)
+    cache.set(key, (names_version, summary), timeout=SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def summary_etag(user):
+    """
+    Return an entity tag identifying the current version of a user's summary.
+
+    The tag is derived from the time the user's rollups last changed, which every Progress
+    write that affects the summary advances, and from the names version, which a rename of a
+    game or platform shown in it advances, so it costs one indexed read and one cache read.
+
+    Args:
+        user (User): The user whose summary is tagged.
+
+    Returns:
+        str: The unquoted entity tag.
+    """
+    updated_at = UserGamingStats.objects.filter(user=user).values_list('updated_at', flat=True).first()
+    version = f'{user.pk}:{updated_at.isoformat() if updated_at else "empty"}:{get_names_version()}'
+    return hashlib.sha1(version.encode()).hexdigest()
+
+
+def invalidate_summary(user_id):
+    """
+    Discard a user's cached summary statistics.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        None
+    """
+    cache.delete(SUMMARY_KEY.format(user_id))
@@ -0,0 +1,171 @@
+# gaming/suggestions.py
+
+"""
+Precomputed Friend Suggestions for the Gaming Application.
+
+Scoring candidates is an all-pairs style computation, so it is kept off the request path:
+suggestions are stored in the FriendSuggestion table and filled offline by the
+refresh_friend_suggestions management command. When a user's progress changes, nothing is
+recomputed on the request path: the profiles it may affect, the user's own included, are
+marked stale with one UPDATE and left to the command's --stale run. A friendship change
+refreshes the two profiles involved (see gaming.signals).
+
+Profiles are refreshed independently, one transaction each, so disjoint profile ranges
+can be refreshed by several processes in parallel.
+
+Functions:
+- explain_suggestions: Compute the reasons behind a profile's suggestions from one progress fetch.
+- refresh_suggestions: Recompute and store the suggestions of one profile.
+- refresh_profile_range: Recompute the suggestions of every profile in a primary key range.
+- refresh_profiles: Recompute the suggestions of selected profiles.
+- progress_changed: Mark stale the profiles whose suggestions a progress change may affect.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Friend, FriendSuggestion, Game, Profile, Progress
+
+
+def explain_suggestions(profile, candidates):
+    """
+    Compute the shared genres and same-rating games behind each suggested candidate.
+
+    The progress of the profile and all candidates is fetched in one query and matched
+    in a single pass.
+
+    Args:
+        profile (Profile): The profile the suggestions are for.
+        candidates (iterable): The suggested Profile instances.
+
+    Returns:
+        dict: {candidate pk: {'genres': [genre names], 'ratings': [{'game': {'id', 'title'}, 'rating'}]}}
+    """
+    candidates = list(candidates)
+    progress_by_user = defaultdict(list)
+    for progress in Progress.objects.filter(
+        user_id__in=[profile.user_id, *(candidate.user_id for candidate in candidates)]
+    ).select_related('game__genre'):
+        progress_by_user[progress.user_id].append(progress)
+
+    user_progress = progress_by_user[profile.user_id]
+    user_genres = {p.game.genre for p in user_progress if p.game.genre is not None}
+    user_ratings = {p.game_id: p.rating for p in user_progress if p.rating}
+
+    reasons = {}
+    for candidate in candidates:
+        candidate_progress = progress_by_user[candidate.user_id]
+
+        # Genres that both have played
+        candidate_genres = {cp.game.genre for cp in candidate_progress if cp.game.genre is not None}
+        shared_genres = sorted(genre.name for genre in user_genres & candidate_genres)
+
+        # Games both have rated the same; each game is reported once
+        matched = {}
+        for cp in candidate_progress:
+            if cp.rating and user_ratings.get(cp.game_id) == cp.rating:
+                matched.setdefault(cp.game_id, {
+                    'game': {'id': cp.game_id, 'title': cp.game.title},
+                    'rating': cp.rating,
+                })
+
+        reasons[candidate.pk] = {'genres': shared_genres, 'ratings': list(matched.values())}
+    return reasons
+
+
+def refresh_suggestions(profile):
+    """
+    Recompute a profile's friend suggestions and replace its stored ones.
+
+    Args:
+        profile (Profile): The profile to refresh.
+
+    Returns:
+        int: The number of suggestions stored.
+    """
+    candidates = profile.get_friend_suggestions()
+    reasons = explain_suggestions(profile, candidates)
+    suggestions = [
+        FriendSuggestion(profile=profile, candidate=candidate, score=candidate.score, reasons=reasons[candidate.pk])
+        for candidate in candidates
+    ]
+    with transaction.atomic():
+        FriendSuggestion.objects.filter(profile=profile).delete()
+        FriendSuggestion.objects.bulk_create(suggestions)
+        Profile.objects.filter(pk=profile.pk, suggestions_stale=True).update(suggestions_stale=False)
+    return len(suggestions)
+
+
+def refresh_profile_range(start=None, end=None, stale_only=False):
+    """
+    Recompute the friend suggestions of every profile with start <= pk < end.
+
+    Args:
+        start (int): The smallest primary key refreshed, or None for no lower bound.
+        end (int): The primary key to stop before, or None for no upper bound.
+        stale_only (bool): If True, only profiles marked stale are refreshed.
+
+    Returns:
+        tuple: (number of profiles refreshed, number of suggestions stored)
+    """
+    profiles = Profile.objects.order_by('pk')
+    if start is not None:
+        profiles = profiles.filter(pk__gte=start)
+    if end is not None:
+        profiles = profiles.filter(pk__lt=end)
+    if stale_only:
+        profiles = profiles.filter(suggestions_stale=True)
+
+    refreshed = stored = 0
+    for profile in profiles.iterator():
+        stored += refresh_suggestions(profile)
+        refreshed += 1
+    return refreshed, stored
+
+
+def refresh_profiles(profile_ids):
+    """
+    Recompute the friend suggestions of the given profiles.
+
+    Args:
+        profile_ids (iterable): Profile primary keys. Missing profiles are skipped.
+
+    Returns:
+        int: The number of profiles refreshed.
+    """
+    profiles = list(Profile.objects.filter(pk__in=set(profile_ids)))
+    for profile in profiles:
+        refresh_suggestions(profile)
+    return len(profiles)
+
+
+def progress_changed(user_id, game_ids):
+    """
+    Mark stale every profile whose friend suggestions a change to a user's progress may affect.
+
+    Recomputing suggestions is an all-pairs style aggregate, so nothing is recomputed here;
+    the affected profiles are flagged, with one UPDATE, for the next
+    refresh_friend_suggestions --stale run. They are the user's own profile, the profiles
+    the user is already suggested to, and the non-friends who play a game of the same genre
+    as a changed game and so may newly gain the user as a candidate.
+
+    Args:
+        user_id (int): The primary key of the user whose progress changed.
+        game_ids (iterable): The games of the changed entries, before and after the change.
+
+    Returns:
+        int: The number of profiles newly marked stale.
+    """
+    genre_ids = Game.objects.filter(pk__in=set(game_ids)).values('genre_id')
+    shown_to = FriendSuggestion.objects.filter(candidate__user_id=user_id).values('profile_id')
+    same_genre = Progress.objects.filter(game__genre_id__in=genre_ids).values('user_id')
+    candidates = Q(pk__in=shown_to) | Q(user_id__in=same_genre)
+    candidates &= ~Q(pk__in=Friend.objects.filter(profile1__user_id=user_id).values('profile2_id'))
+    candidates &= ~Q(pk__in=Friend.objects.filter(profile2__user_id=user_id).values('profile1_id'))
+    return (
+        Profile.objects
+        .filter(Q(user_id=user_id) | candidates, suggestions_stale=False)
+        .update(suggestions_stale=True)
+    )
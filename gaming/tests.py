@@ -1,3 +1,1115 @@
-from django.test import TestCase
+import json
+import re
+from datetime import date, timedelta
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .bulk import import_library
+from .counters import reconcile_counters
+from .feed import feed_query_budget, load_feed_items
+from .models import (
+    Comment,
+    FeedItem,
+    Friend,
+    FriendSuggestion,
+    Game,
+    Genre,
+    Image,
+    Like,
+    Platform,
+    PlayerNeighbour,
+    Profile,
+    Progress,
+    StatusMessage,
+    TimelineEntry,
+    UserGameStats,
+    UserGamingStats,
+    UserGenreStats,
+    UserPlatformStats,
+)
+from .leaderboards import get_rank, top_players
+from .recommendations import SEED_GAMES, recommend_games
+from .rollups import check_user_stats, rebuild_user_stats
+from .similarity import synthetic_matrix, top_k_neighbours
+from .timeline import SYNC_POLL_INTERVAL, rebuild_timeline, timeline_events
+
+
+class GamingTestCase(TestCase):
+    """
+    Base test case providing a small social graph with games to play.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(name='RPG')
+        cls.platform = Platform.objects.create(name='PC')
+        cls.game = Game.objects.create(
+            title='Elden Ring', genre=cls.genre, release_date=date(2022, 2, 25),
+            developer='FromSoftware', publisher='Bandai Namco',
+        )
+        cls.game.platforms.add(cls.platform)
+        cls.user, cls.profile = cls.create_profile('alice')
+        cls.friend_user, cls.friend_profile = cls.create_profile('bob')
+        Friend.objects.create(profile1=cls.profile, profile2=cls.friend_profile)
+
+    def setUp(self):
+        cache.clear()  # Feed fragments and content versions must not leak between tests
+
+    @staticmethod
+    def create_profile(username):
+        user = User.objects.create_user(username=username, password='password')
+        profile = Profile.objects.create(
+            user=user, first_name=username.title(), last_name='Tester', city='Boston',
+            email_address=f'{username}@example.com', profile_image='profile_images/test.jpg',
+        )
+        return user, profile
+
+    def post_status(self, profile, message='Hello'):
+        status = StatusMessage.objects.create(profile=profile, message=message)
+        Image.objects.create(status_message=status, image_file='status_images/test.jpg')
+        Comment.objects.create(profile=self.friend_profile, content_object=status, content='Nice')
+        Like.objects.create(profile=self.friend_profile, content_object=status)
+        return FeedItem.objects.create(user=profile.user, content_object=status)
+
+    def share_progress(self, user, hours=10):
+        progress = Progress.objects.create(
+            user=user, game=self.game, platform=self.platform, hours_played=hours, rating=5,
+        )
+        Comment.objects.create(profile=self.profile, content_object=progress, content='GG')
+        return FeedItem.objects.create(user=user, content_object=progress)
+
+
+class FeedLoaderTests(GamingTestCase):
+    """
+    Tests for batched content object resolution on the news feed.
+    """
+
+    def populate_feed(self, count):
+        for i in range(count):
+            if i % 2:
+                self.post_status(self.friend_profile if i % 3 else self.profile)
+            else:
+                self.share_progress(self.friend_user if i % 3 else self.user)
+
+    def test_load_feed_items_stays_within_query_budget(self):
+        self.populate_feed(8)
+        FeedItem.objects.create(user=self.user, content_object=self.game)  # A type without a loader
+        items = list(FeedItem.objects.select_related('user__gaming_profile'))
+        budget = feed_query_budget(items)
+        self.assertEqual(budget, 6)
+
+        with self.assertNumQueries(budget):
+            load_feed_items(items, profile=self.friend_profile)
+
+        with self.assertNumQueries(0):
+            for item in items:
+                obj = item.content_object
+                item.content_type.model
+                self.assertEqual(obj.user_liked, isinstance(obj, StatusMessage))
+                [comment.profile.first_name for comment in obj.latest_comments]
+                if isinstance(obj, Progress):
+                    obj.like_count, obj.comment_count
+                    obj.game.title, obj.platform.name, obj.user.username
+                elif isinstance(obj, StatusMessage):
+                    obj.like_count, obj.comment_count
+                    list(obj.images.all()), obj.profile.user.username
+
+    def test_news_feed_query_count_does_not_grow_with_page_size(self):
+        self.client.login(username='alice', password='password')
+        self.populate_feed(2)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(reverse('gaming:news-feed'))
+
+        self.populate_feed(8)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(reverse('gaming:news-feed'))
+
+        self.assertEqual(len(response.context['news_feed']), 10)
+        self.assertEqual(len(small_page), len(full_page))
+
+
+class CounterTests(GamingTestCase):
+    """
+    Tests for the denormalized like and comment counters.
+    """
+
+    def test_toggle_like_and_comment_adjust_counters(self):
+        self.client.login(username='alice', password='password')
+        status = StatusMessage.objects.create(profile=self.friend_profile, message='Hello')
+        feed_item = FeedItem.objects.create(user=self.friend_user, content_object=status)
+
+        self.client.post(reverse('gaming:toggle-like'), {'feed_item_id': feed_item.pk})
+        self.client.post(reverse('gaming:create-comment'), {'feed_item_id': feed_item.pk, 'content': 'Hi'})
+        status.refresh_from_db()
+        self.assertEqual((status.like_count, status.comment_count), (1, 1))
+
+        self.client.post(reverse('gaming:toggle-like'), {'feed_item_id': feed_item.pk})
+        status.refresh_from_db()
+        self.assertEqual(status.like_count, 0)
+
+    def test_reconcile_counters_repairs_drift(self):
+        feed_item = self.post_status(self.profile)
+        status = feed_item.content_object
+        StatusMessage.objects.filter(pk=status.pk).update(like_count=7)
+
+        self.assertEqual(reconcile_counters(), {'StatusMessage': 1, 'Progress': 0})
+        status.refresh_from_db()
+        self.assertEqual((status.like_count, status.comment_count), (1, 1))
+        self.assertEqual(reconcile_counters(), {'StatusMessage': 0, 'Progress': 0})
+
+
+class KeysetPaginationTests(GamingTestCase):
+    """
+    Tests for cursor pagination on the news feed.
+    """
+
+    def test_news_feed_pages_by_cursor_without_counting(self):
+        self.client.login(username='alice', password='password')
+        feed_items = [self.post_status(self.friend_profile, message=str(i)) for i in range(25)]
+        expected = sorted(feed_items, key=lambda item: (item.timestamp, item.pk), reverse=True)
+
+        seen, cursor, pages = [], None, []
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('gaming:news-feed'), {'cursor': cursor} if cursor else {})
+            self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+            page = response.context['page_obj']
+            pages.append(page)
+            seen.extend(item.pk for item in response.context['news_feed'])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(seen, [item.pk for item in expected])
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+
+        response = self.client.get(reverse('gaming:news-feed'), {'cursor': pages[-1].previous_cursor})
+        self.assertEqual([item.pk for item in response.context['news_feed']], [item.pk for item in expected[10:20]])
+
+    def test_invalid_cursor_returns_404(self):
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:news-feed'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class ToggleLikeJsonTests(GamingTestCase):
+    """
+    Tests for the AJAX like toggle.
+    """
+
+    def test_toggle_returns_state_and_exact_count(self):
+        self.client.login(username='alice', password='password')
+        feed_item = self.post_status(self.friend_profile)  # Already liked by bob
+        url = reverse('gaming:toggle-like-json')
+
+        response = self.client.post(url, {'feed_item_id': feed_item.pk})
+        self.assertEqual(response.json(), {'feed_item_id': feed_item.pk, 'liked': True, 'like_count': 2})
+
+        response = self.client.post(url, {'feed_item_id': feed_item.pk})
+        self.assertEqual(response.json(), {'feed_item_id': feed_item.pk, 'liked': False, 'like_count': 1})
+
+    def test_toggle_recomputes_a_drifted_count(self):
+        self.client.login(username='alice', password='password')
+        feed_item = self.post_status(self.friend_profile)
+        StatusMessage.objects.filter(pk=feed_item.object_id).update(like_count=5)
+
+        response = self.client.post(reverse('gaming:toggle-like-json'), {'feed_item_id': feed_item.pk})
+        self.assertEqual(response.json()['like_count'], 2)
+
+    def test_missing_feed_item_returns_404(self):
+        self.client.login(username='alice', password='password')
+        response = self.client.post(reverse('gaming:toggle-like-json'), {'feed_item_id': 999})
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_feed_item_ids_are_rejected(self):
+        self.client.login(username='alice', password='password')
+        for feed_item_id in ('abc', '1.5', str(2 ** 70)):
+            response = self.client.post(reverse('gaming:toggle-like-json'), {'feed_item_id': feed_item_id})
+            self.assertEqual(response.status_code, 400)
+            response = self.client.post(reverse('gaming:toggle-like'), {'feed_item_id': feed_item_id})
+            self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('gaming:feed-item-comments', args=[2 ** 70]))
+        self.assertEqual(response.status_code, 404)
+
+
+class CommentThreadTests(GamingTestCase):
+    """
+    Tests for the latest-comments window and the older comments endpoint.
+    """
+
+    def test_feed_shows_latest_comments_and_pages_the_rest(self):
+        self.client.login(username='alice', password='password')
+        feed_item = self.post_status(self.friend_profile)
+        status = feed_item.content_object
+        for i in range(14):
+            Comment.objects.create(profile=self.profile, content_object=status, content=f'#{i}')
+        StatusMessage.objects.filter(pk=status.pk).update(comment_count=15)
+
+        response = self.client.get(reverse('gaming:news-feed'))
+        shown = response.context['news_feed'][0].content_object
+        self.assertEqual([c.content for c in shown.latest_comments], ['#11', '#12', '#13'])
+
+        url = reverse('gaming:feed-item-comments', args=[feed_item.pk])
+        page = self.client.get(url, {'cursor': shown.comments_cursor}).json()
+        self.assertIn('#10', page['html'])
+        self.assertIn('#1<', page['html'])
+        self.assertNotIn('#11', page['html'])
+
+        page = self.client.get(url, {'cursor': page['next_cursor']}).json()
+        self.assertIn('#0', page['html'])
+        self.assertIn('Nice', page['html'])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_comments_of_items_outside_the_feed_are_hidden(self):
+        _, stranger = self.create_profile('carol')
+        feed_item = self.post_status(stranger)
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:feed-item-comments', args=[feed_item.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class FragmentCacheTests(GamingTestCase):
+    """
+    Tests for the versioned feed item fragment cache.
+    """
+
+    def test_cached_fragment_is_invalidated_by_content_changes(self):
+        self.client.login(username='alice', password='password')
+        feed_item = self.post_status(self.friend_profile, message='First draft')
+        status = feed_item.content_object
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'First draft')
+
+        # A change that bypasses signals keeps serving the cached fragment...
+        StatusMessage.objects.filter(pk=status.pk).update(message='Sneaky edit')
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'First draft')
+
+        # ...while saves, comments and likes move the item to a new version
+        status.message = 'Final text'
+        status.save()
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'Final text')
+
+        Comment.objects.create(profile=self.profile, content_object=status, content='Fresh comment')
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'Fresh comment')
+
+    def test_renames_invalidate_the_fragments_that_render_them(self):
+        self.share_progress(self.friend_user)  # Commented on by alice
+        self.client.login(username='alice', password='password')
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'Elden Ring')
+
+        self.game.title = 'Elden Ring Deluxe'
+        self.game.save()
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'Elden Ring Deluxe')
+
+        self.profile.first_name = 'Alicia'
+        self.profile.save()
+        self.assertContains(self.client.get(reverse('gaming:news-feed')), 'Alicia Tester')
+
+    def test_per_viewer_state_is_not_cached(self):
+        feed_item = self.post_status(self.profile)  # Liked by bob, owned by alice
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:news-feed'))
+        self.assertContains(response, reverse('gaming:update-feed-item', args=[feed_item.pk]))
+        self.assertContains(response, '>Like</button>')
+
+        self.client.login(username='bob', password='password')
+        response = self.client.get(reverse('gaming:news-feed'))
+        self.assertNotContains(response, reverse('gaming:update-feed-item', args=[feed_item.pk]))
+        self.assertContains(response, '>Unlike</button>')
+
+
+class TimelineTests(GamingTestCase):
+    """
+    Tests for the materialized news feed timelines.
+    """
+
+    def timeline(self, user):
+        return set(TimelineEntry.objects.filter(owner=user).values_list('feed_item_id', flat=True))
+
+    def test_new_items_are_fanned_out_to_the_author_and_friends(self):
+        carol, carol_profile = self.create_profile('carol')
+        item = self.post_status(self.friend_profile)
+
+        self.assertIn(item.pk, self.timeline(self.user))
+        self.assertIn(item.pk, self.timeline(self.friend_user))
+        self.assertNotIn(item.pk, self.timeline(carol))
+
+    def test_befriending_backfills_and_unfriending_prunes_both_timelines(self):
+        carol, carol_profile = self.create_profile('carol')
+        own_item = self.post_status(self.profile)
+        carol_item = self.post_status(carol_profile)
+
+        friendship = Friend.objects.create(profile1=carol_profile, profile2=self.profile)
+        self.assertIn(carol_item.pk, self.timeline(self.user))
+        self.assertIn(own_item.pk, self.timeline(carol))
+
+        friendship.delete()
+        self.assertNotIn(carol_item.pk, self.timeline(self.user))
+        self.assertEqual(self.timeline(carol), {carol_item.pk})
+        self.assertIn(own_item.pk, self.timeline(self.user))
+
+    def test_rebuild_restores_a_drifted_timeline(self):
+        item = self.post_status(self.friend_profile)
+        TimelineEntry.objects.filter(owner=self.user).delete()
+
+        self.assertEqual(rebuild_timeline(self.user), 1)
+        self.assertEqual(self.timeline(self.user), {item.pk})
+
+
+class LiveFeedTests(GamingTestCase):
+    """
+    Tests for the server-sent event stream and the items it points at.
+    """
+
+    def collect_events(self, owner_id, after_id):
+        async def collect():
+            return [chunk async for chunk in timeline_events(owner_id, after_id, poll_interval=0, lifetime=0)]
+        return async_to_sync(collect)()
+
+    def test_stream_announces_only_entries_after_the_last_event_id(self):
+        seen = self.post_status(self.friend_profile, message='Old news')
+        last_id = TimelineEntry.objects.get(owner=self.user, feed_item=seen).pk
+        new_items = [self.post_status(self.friend_profile, message=str(i)) for i in range(2)]
+
+        chunks = self.collect_events(self.user.pk, last_id)
+        events = [chunk for chunk in chunks if chunk.startswith('id: ')]
+        self.assertEqual(len(events), 1)
+        event_id, event_name, data = events[0].strip().split('\n')
+        self.assertEqual(event_name, 'event: feed')
+        self.assertEqual(json.loads(data[len('data: '):]), {'feed_item_ids': [item.pk for item in new_items]})
+
+        resumed = event_id[len('id: '):]
+        self.assertFalse([c for c in self.collect_events(self.user.pk, int(resumed)) if c.startswith('id: ')])
+
+    def test_items_endpoint_renders_only_the_viewers_timeline(self):
+        _, stranger = self.create_profile('carol')
+        friend_item = self.post_status(self.friend_profile, message='From a friend')
+        stranger_item = self.post_status(stranger, message='From a stranger')
+
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:news-feed-items'), {'ids': f'{friend_item.pk},{stranger_item.pk},x'})
+        self.assertContains(response, 'From a friend')
+        self.assertNotContains(response, 'From a stranger')
+
+    def test_stream_answers_one_poll_under_wsgi(self):
+        seen = self.post_status(self.friend_profile)
+        item = self.post_status(self.friend_profile)
+        self.client.login(username='alice', password='password')
+        after = TimelineEntry.objects.get(owner=self.user, feed_item=seen).pk
+        response = self.client.get(reverse('gaming:news-feed-stream'), {'after': after})
+
+        # Consumed the way a WSGI server does; the stream must end on its own
+        with self.assertWarnsRegex(Warning, 'consume asynchronous iterators'):
+            body = b''.join(response).decode()
+        self.assertTrue(body.startswith(f'retry: {SYNC_POLL_INTERVAL * 1000}\n'))
+        self.assertIn(json.dumps({'feed_item_ids': [item.pk]}), body)
+
+    def test_first_page_subscribes_from_the_newest_entry(self):
+        self.post_status(self.friend_profile)
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:news-feed'))
+        latest = TimelineEntry.objects.filter(owner=self.user).latest('pk').pk
+        self.assertEqual(response.context['stream_after'], latest)
+        self.assertContains(response, f"{reverse('gaming:news-feed-stream')}?after={latest}")
+
+
+class FriendIdCacheTests(GamingTestCase):
+    """
+    Tests for the cached friend-id sets.
+    """
+
+    def test_friend_ids_are_cached_and_invalidated_by_friend_changes(self):
+        _, carol = self.create_profile('carol')
+        profile, same_profile = Profile.objects.get(pk=self.profile.pk), Profile.objects.get(pk=self.profile.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(profile.get_friend_ids(), {self.friend_profile.pk})
+            self.assertEqual(same_profile.get_friend_ids(), {self.friend_profile.pk})
+
+        self.assertEqual(carol.get_friend_ids(), set())
+        friendship = Friend(profile1=carol, profile2=profile)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            friendship.save()
+            # The cache is only invalidated once the friendship is committed
+            self.assertEqual(Profile.objects.get(pk=carol.pk).get_friend_ids(), set())
+        self.assertTrue(callbacks)
+        self.assertEqual(profile.get_friend_ids(), {self.friend_profile.pk, carol.pk})
+        self.assertEqual(Profile.objects.get(pk=carol.pk).get_friend_ids(), {profile.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            friendship.delete()
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).get_friend_ids(), {self.friend_profile.pk})
+        self.assertEqual(Profile.objects.get(pk=carol.pk).get_friend_ids(), set())
+
+
+class FriendSuggestionTests(GamingTestCase):
+    """
+    Tests for scored friend suggestions.
+    """
+
+    def rate(self, user, game, rating):
+        return Progress.objects.create(user=user, game=game, platform=self.platform, hours_played=1, rating=rating)
+
+    def test_suggestions_are_scored_ranked_and_limited(self):
+        other_game = Game.objects.create(
+            title='Hades', genre=Genre.objects.create(name='Roguelike'), release_date=date(2020, 9, 17),
+            developer='Supergiant', publisher='Supergiant',
+        )
+        carol, dave, erin = (self.create_profile(name)[0] for name in ('carol', 'dave', 'erin'))
+        self.rate(self.user, self.game, 5)
+        self.rate(self.user, other_game, 4)
+        self.rate(self.friend_user, self.game, 5)  # A friend: never suggested
+        self.rate(carol, self.game, 5)             # RPG + same rating
+        self.rate(carol, other_game, 4)            # Roguelike + same rating
+        self.rate(dave, self.game, 2)              # RPG only
+        self.rate(erin, other_game, 4)             # Roguelike + same rating
+
+        with self.assertNumQueries(3):  # Friend ids, scores, profiles
+            suggestions = self.profile.get_friend_suggestions()
+        self.assertEqual(
+            [(p.user.username, p.shared_genres, p.rating_matches, p.score) for p in suggestions],
+            [('carol', 2, 2, 4), ('erin', 1, 1, 2), ('dave', 1, 0, 1)],
+        )
+        self.assertEqual([p.user_id for p in self.profile.get_friend_suggestions(limit=1)], [carol.pk])
+
+    def test_view_reads_a_page_of_precomputed_suggestions(self):
+        self.rate(self.user, self.game, 5)
+        for i in range(15):
+            self.rate(self.create_profile(f'fan{i}')[0], self.game, 5)
+        call_command('refresh_friend_suggestions', stdout=StringIO())
+
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:friend-suggestions'))
+        self.assertEqual(len(response.context['suggestions']), 10)
+        self.assertTrue(response.context['is_paginated'])
+        suggestion = response.context['suggestions'][0]
+        self.assertEqual(suggestion.score, 2)
+        self.assertEqual(suggestion.reasons, {
+            'genres': ['RPG'],
+            'ratings': [{'game': {'id': self.game.pk, 'title': 'Elden Ring'}, 'rating': 5}],
+        })
+        self.assertContains(response, 'Elden Ring</strong> with a rating of 5/5')
+
+    def test_suggestions_are_refreshed_for_affected_profiles(self):
+        carol_user, carol = self.create_profile('carol')
+        self.rate(self.user, self.game, 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            progress = self.rate(carol_user, self.game, 5)
+        # Nothing is recomputed inline: carol and alice, who plays the same genre, are marked stale
+        self.assertFalse(FriendSuggestion.objects.exists())
+        self.assertEqual(set(Profile.objects.filter(suggestions_stale=True)), {self.profile, carol})
+        call_command('refresh_friend_suggestions', stale=True, stdout=StringIO())
+        self.assertEqual(list(FriendSuggestion.objects.filter(profile=carol).values_list('candidate', 'score')),
+                         [(self.profile.pk, 2)])
+        self.assertEqual(list(self.profile.friend_suggestions.values_list('candidate', 'score')), [(carol.pk, 2)])
+
+        # A rating change marks carol and everyone who is shown her stale, for the --stale run
+        with self.captureOnCommitCallbacks(execute=True):
+            progress.rating = 3
+            progress.save()
+        self.assertEqual(list(self.profile.friend_suggestions.values_list('candidate', 'score')), [(carol.pk, 2)])
+        self.assertEqual(set(Profile.objects.filter(suggestions_stale=True)), {self.profile, carol})
+        call_command('refresh_friend_suggestions', stale=True, stdout=StringIO())
+        self.assertEqual(list(self.profile.friend_suggestions.values_list('candidate', 'score')), [(carol.pk, 1)])
+        self.assertFalse(Profile.objects.filter(suggestions_stale=True).exists())
+
+        # Becoming friends removes the suggestion on both sides
+        with self.captureOnCommitCallbacks(execute=True):
+            Friend.objects.create(profile1=self.profile, profile2=carol)
+        self.assertFalse(FriendSuggestion.objects.filter(profile__in=[self.profile, carol]).exists())
+
+
+class SimilarityTests(GamingTestCase):
+    """
+    Tests for the rating-matrix similarity engine.
+    """
+
+    def test_neighbours_match_a_dense_computation(self):
+        matrix = synthetic_matrix(60, 12, 5, seed=3)
+        dense = np.zeros(matrix.shape)
+        dense[matrix.row_ids(), matrix.indices] = matrix.data
+        norms = np.linalg.norm(dense, axis=1)
+        expected = dense @ dense.T / np.outer(norms, norms)
+        np.fill_diagonal(expected, 0)
+
+        found = 0
+        for users, neighbours, similarities, _ in top_k_neighbours(matrix, k=3, max_block_cells=600):
+            rows, cols = np.searchsorted(matrix.user_ids, users), np.searchsorted(matrix.user_ids, neighbours)
+            np.testing.assert_allclose(similarities, expected[rows, cols], rtol=1e-5)
+            for row in np.unique(rows):
+                best = np.sort(expected[row])[::-1][:3]
+                np.testing.assert_allclose(similarities[rows == row], best[best > 0], rtol=1e-5)
+            found += len(users)
+        self.assertEqual(found, 60 * 3)
+
+    def test_build_command_feeds_the_suggestions_page(self):
+        carol_user, carol = self.create_profile('carol')
+        for user, rating in ((self.user, 5), (carol_user, 5), (self.friend_user, 4)):
+            Progress.objects.create(user=user, game=self.game, platform=self.platform, hours_played=30, rating=rating)
+        call_command('build_player_neighbours', '--metric', 'cosine', stdout=StringIO())
+
+        self.assertEqual(PlayerNeighbour.objects.filter(profile=self.profile).count(), 2)
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:friend-suggestions'))
+        self.assertEqual([match.neighbour for match in response.context['similar_players']], [carol])
+
+
+class GameRecommendationTests(GamingTestCase):
+    """
+    Tests for the "players like you also played" recommendations.
+    """
+
+    def test_recommends_untracked_games_played_by_similar_players(self):
+        hades, celeste = (
+            Game.objects.create(title=title, genre=self.genre, release_date=date(2020, 1, 1), developer='Dev', publisher='Pub')
+            for title in ('Hades', 'Celeste')
+        )
+        carol_user, _ = self.create_profile('carol')
+        for user, game, hours in (
+            (self.friend_user, self.game, 50), (self.friend_user, hades, 40),
+            (carol_user, self.game, 5), (carol_user, celeste, 2), (carol_user, hades, 30),
+            (self.user, self.game, 20),
+        ):
+            Progress.objects.create(user=user, game=game, platform=self.platform, hours_played=hours, rating=5)
+        call_command('build_game_recommendations', stdout=StringIO())
+
+        self.client.login(username='alice', password='password')
+        response = self.client.get(reverse('gaming:progress-add'))
+        recommended = response.context['recommended_games']
+        self.assertEqual([game.title for game in recommended], ['Hades', 'Celeste'])
+        self.assertGreater(recommended[0].recommendation_score, recommended[1].recommendation_score)
+        self.assertContains(response, 'Players Like You Also Played')
+
+        # A game tracked long ago is still excluded once it is no longer a seed
+        Progress.objects.create(user=self.user, game=celeste, platform=self.platform, hours_played=1)
+        for i in range(SEED_GAMES):
+            game = Game.objects.create(
+                title=f'Filler {i}', genre=self.genre, release_date=date(2020, 1, 1), developer='Dev', publisher='Pub',
+            )
+            Progress.objects.create(user=self.user, game=game, platform=self.platform)
+        Progress.objects.filter(user=self.user, game=celeste).update(timestamp=timezone.now() - timedelta(days=365))
+        Progress.objects.filter(user=self.user, game=self.game).update(timestamp=timezone.now() + timedelta(days=1))
+        self.assertEqual([game.title for game in recommend_games(self.user)], ['Hades'])
+
+
+class SummaryTests(GamingTestCase):
+    """
+    Tests for the summary dashboard statistics.
+    """
+
+    def test_summary_is_aggregated_once_and_invalidated_by_progress_writes(self):
+        hades = Game.objects.create(
+            title='Hades', genre=Genre.objects.create(name='Roguelike'), release_date=date(2020, 9, 17),
+            developer='Supergiant', publisher='Supergiant',
+        )
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=30,
+                                completion_status='Completed')
+        progress = Progress.objects.create(user=self.user, game=hades, platform=self.platform, hours_played=10,
+                                           completion_status='In Progress')
+        self.client.login(username='alice', password='password')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('gaming:summary'))
+        self.assertFalse([q for q in queries.captured_queries if 'gaming_progress' in q['sql']])
+        rollup_queries = [q for q in queries.captured_queries if 'gaming_user' in q['sql']]
+        self.assertEqual(len(rollup_queries), 4)
+        self.assertEqual((response.context['total_hours'], response.context['games_completed']), (40, 1))
+        self.assertEqual(response.context['top_game_title'], 'Elden Ring')
+        self.assertEqual(response.context['genre_labels'], ['RPG', 'Roguelike'])
+        self.assertEqual(response.context['genre_data'], [50.0, 50.0])
+        self.assertEqual(response.context['hours_genre_data'], [30, 10])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('gaming:summary'))
+        self.assertFalse([q for q in queries.captured_queries if 'gaming_user' in q['sql']])
+
+        progress.hours_played = 50
+        progress.save()
+        response = self.client.get(reverse('gaming:summary'))
+        self.assertEqual((response.context['total_hours'], response.context['top_game_title']), (80, 'Hades'))
+
+    def test_summary_data_is_revalidated_by_etag(self):
+        progress = Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=30)
+        self.client.login(username='alice', password='password')
+
+        response = self.client.get(reverse('gaming:summary-data'))
+        etag = response['ETag']
+        self.assertEqual(response.json()['platform_labels'], ['PC'])
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('private', response['Cache-Control'])
+
+        # An unchanged summary is answered 304 after reading only its version
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('gaming:summary-data'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len([q for q in queries.captured_queries if 'gaming_user' in q['sql']]), 1)
+
+        # A change that only moves an entry between platforms still changes the version
+        progress.platform = Platform.objects.create(name='Switch')
+        progress.save()
+        response = self.client.get(reverse('gaming:summary-data'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['platform_labels'], ['Switch'])
+
+        # Renaming a game shown in the summary changes the version too
+        etag = response['ETag']
+        self.game.title = 'Elden Ring: Nightreign'
+        self.game.save()
+        response = self.client.get(reverse('gaming:summary-data'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['top_game_title'], 'Elden Ring: Nightreign')
+
+
+class UserStatsRollupTests(GamingTestCase):
+    """
+    Tests for the per-user statistics rollups maintained by deltas.
+    """
+
+    def rollup(self, user):
+        stats = UserGamingStats.objects.get(user=user)
+        return {
+            'totals': (stats.entry_count, stats.total_hours, stats.completed_count, stats.in_progress_count),
+            'genres': set(UserGenreStats.objects.filter(user=user).values_list('genre__name', 'entry_count', 'hours')),
+            'platforms': set(UserPlatformStats.objects.filter(user=user).values_list('platform__name', 'entry_count')),
+            'games': set(UserGameStats.objects.filter(user=user).values_list('game__title', 'hours')),
+        }
+
+    def test_progress_writes_apply_deltas(self):
+        hades = Game.objects.create(
+            title='Hades', genre=Genre.objects.create(name='Roguelike'), release_date=date(2020, 9, 17),
+            developer='Supergiant', publisher='Supergiant',
+        )
+        switch = Platform.objects.create(name='Switch')
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=30,
+                                completion_status='Completed')
+        progress = Progress.objects.create(user=self.user, game=self.game, platform=switch, hours_played=5,
+                                           completion_status='In Progress')
+        self.assertEqual(self.rollup(self.user), {
+            'totals': (2, 35, 1, 1),
+            'genres': {('RPG', 2, 35)},
+            'platforms': {('PC', 1), ('Switch', 1)},
+            'games': {('Elden Ring', 35)},
+        })
+
+        # Reloaded entries carry their stored state, so the update needs no extra read
+        progress = Progress.objects.get(pk=progress.pk)
+        progress.game, progress.platform, progress.hours_played = hades, self.platform, 12
+        progress.completion_status = 'Completed'
+        progress.save()
+        self.assertEqual(self.rollup(self.user), {
+            'totals': (2, 42, 2, 0),
+            'genres': {('RPG', 1, 30), ('Roguelike', 1, 12)},
+            'platforms': {('PC', 2)},
+            'games': {('Elden Ring', 30), ('Hades', 12)},
+        })
+
+        progress.delete()
+        self.assertEqual(self.rollup(self.user), {
+            'totals': (1, 30, 1, 0),
+            'genres': {('RPG', 1, 30)},
+            'platforms': {('PC', 1)},
+            'games': {('Elden Ring', 30)},
+        })
+        self.assertEqual(check_user_stats([self.user.pk, self.friend_user.pk]), [])
+
+    def test_checker_finds_and_rebuild_repairs_drift(self):
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=30)
+        Progress.objects.filter(user=self.user).update(hours_played=40)  # Bypasses the signals
+        self.assertEqual(check_user_stats([self.user.pk, self.friend_user.pk]), [self.user.pk])
+
+        out = StringIO()
+        call_command('check_user_stats', '--fix', stdout=out)
+        self.assertIn(f"User {self.user.pk}: statistics rollup has drifted", out.getvalue())
+        self.assertEqual(self.rollup(self.user)['totals'], (1, 40, 0, 0))
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+
+        UserGameStats.objects.all().delete()
+        self.assertEqual(rebuild_user_stats([self.user.pk]), 1)
+        self.assertEqual(self.rollup(self.user)['games'], {('Elden Ring', 40)})
+
+
+class LeaderboardTests(GamingTestCase):
+    """
+    Tests for the leaderboards backed by the statistics rollups.
+    """
+
+    def test_rankings_share_ties_and_follow_progress_writes(self):
+        carol, _ = self.create_profile('carol')
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=30)
+        Progress.objects.create(user=self.friend_user, game=self.game, platform=self.platform, hours_played=30)
+        progress = Progress.objects.create(user=carol, game=self.game, platform=self.platform, hours_played=10)
+
+        self.assertEqual(
+            [(leader['rank'], leader['username']) for leader in top_players('game', self.game.pk)],
+            [(1, 'alice'), (1, 'bob'), (3, 'carol')],
+        )
+        self.assertEqual(get_rank(carol, 'genre', self.genre.pk), {'rank': 3, 'hours': 10})
+
+        # Cached until a change touches the board's hours
+        top_players('global')
+        with self.assertNumQueries(0):
+            top_players('global')
+        progress.hours_played = 45
+        progress.save()
+        self.assertEqual(top_players('global')[0]['username'], 'carol')
+        self.assertEqual(get_rank(self.user, 'platform', self.platform.pk), {'rank': 2, 'hours': 30})
+
+        progress.delete()
+        self.assertIsNone(get_rank(carol, 'global'))
+        self.assertEqual(len(top_players('game', self.game.pk)), 2)
+
+    def test_leaderboard_view(self):
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=12)
+        self.client.login(username='alice', password='password')
+
+        response = self.client.get(reverse('gaming:leaderboard-scope', args=['game', self.game.pk]))
+        self.assertEqual(response.context['my_rank'], {'rank': 1, 'hours': 12})
+        self.assertContains(response, 'Elden Ring Leaderboard')
+        self.assertEqual(self.client.get(reverse('gaming:leaderboard-scope', args=['studio', 1])).status_code, 404)
+
+
+class QueryPlanTests(GamingTestCase):
+    """
+    Tests that the hot views read the social and progress tables through indexes.
+    """
+
+    # A full scan of any of these tables, even of a covering index, is a regression, and so is
+    # a search of generic relations by content type alone: there are only a couple of types
+    TABLE_SCAN = re.compile(
+        r'^SCAN (gaming_progress|gaming_feeditem|gaming_like|gaming_comment|gaming_friend)\b'
+        r'|^SEARCH (gaming_feeditem|gaming_like|gaming_comment) USING .*\(content_type_id=\?\)$'
+    )
+
+    def table_scans(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data) if data is not None else self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if 'SELECT' not in query['sql']:
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                scans.extend(
+                    f"{row[-1]}: {query['sql']}" for row in cursor.fetchall() if self.TABLE_SCAN.match(row[-1])
+                )
+        return scans
+
+    def test_hot_views_use_indexes(self):
+        for i in range(20):
+            user, profile = self.create_profile(f'player{i}')
+            if i % 2:
+                Friend.objects.create(profile1=self.profile, profile2=profile)
+            else:
+                Friend.objects.create(profile1=profile, profile2=self.profile)
+            self.share_progress(user, hours=i)
+            self.post_status(profile)
+        feed_item = self.post_status(self.friend_profile)
+        self.client.login(username='alice', password='password')
+
+        for url in (
+            reverse('gaming:progress-list'),
+            reverse('gaming:friends-progress-list') + '?completion_status=Not+Started',
+            reverse('gaming:news-feed'),
+            reverse('gaming:feed-item-comments', args=[feed_item.pk]),
+            reverse('gaming:profile-detail', args=[self.profile.pk]),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.table_scans(url), [])
+        self.assertEqual(self.table_scans(reverse('gaming:toggle-like-json'), {'feed_item_id': feed_item.pk}), [])
+
+
+class ProgressListOrderTests(GamingTestCase):
+    """
+    Tests for the indexed completion status ordering of the progress list.
+    """
+
+    def test_progress_list_is_ordered_by_stored_sort_keys(self):
+        hades = Game.objects.create(
+            title='Hades', genre=self.genre, release_date=date(2020, 9, 17),
+            developer='Supergiant', publisher='Supergiant',
+        )
+        celeste = Game.objects.create(
+            title='Celeste', genre=self.genre, release_date=date(2018, 1, 25),
+            developer='Maddy Makes Games', publisher='Maddy Makes Games',
+        )
+        Progress.objects.create(user=self.user, game=self.game, platform=self.platform, completion_status='Wishlist')
+        Progress.objects.create(user=self.user, game=hades, platform=self.platform, completion_status='In Progress')
+        progress = Progress.objects.create(user=self.user, game=celeste, platform=self.platform)
+        self.client.login(username='alice', password='password')
+
+        def listed():
+            response = self.client.get(reverse('gaming:progress-list'))
+            return [(entry.completion_status, entry.game.title) for entry in response.context['progress_entries']]
+
+        self.assertEqual(listed(), [('Not Started', 'Celeste'), ('In Progress', 'Hades'), ('Wishlist', 'Elden Ring')])
+
+        progress.completion_status = 'In Progress'
+        progress.save(update_fields=['completion_status'])
+        hades.title = 'Hades II'
+        hades.save()
+        self.assertEqual(listed(), [('In Progress', 'Celeste'), ('In Progress', 'Hades II'), ('Wishlist', 'Elden Ring')])
+
+        # Saves that keep the game do not load it for its title; moving the entry to another game does
+        progress = Progress.objects.get(pk=progress.pk)
+        progress.hours_played = 3
+        with CaptureQueriesContext(connection) as queries:
+            progress.save(update_fields=['hours_played'])
+            progress.save()
+        self.assertFalse([query for query in queries if '"gaming_game"."title"' in query['sql']])
+        progress.game = hades
+        progress.save()
+        self.assertEqual(Progress.objects.get(pk=progress.pk).game_title, 'Hades II')
+
+        # The page is read in index order, without sorting the user's entries
+        queryset = (
+            Progress.objects.filter(user=self.user)
+            .select_related('game', 'platform')
+            .order_by('status_key', 'game_title')
+        )
+        self.assertIn('gaming_progress_list_order', queryset.explain())
+        self.assertNotIn('TEMP B-TREE', queryset.explain())
+
+
+class LibraryImportTests(GamingTestCase):
+    """
+    Tests for the bulk progress import from game-library exports.
+    """
+
+    def test_csv_import_upserts_entries_and_reports_row_errors(self):
+        progress = Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=5)
+        export = (
+            "title,platform,completion_status,hours_played,genre,release_date\n"
+            "elden ring,PC,completed,80,,\n"
+            "Hades,PC,In Progress,12,RPG,2020-09-17\n"
+            "Nonexistent Quest,PC,,,,\n"
+            "Hades,Switch,,3,,\n"
+            "Tunic,PC,,lots,RPG,2022-03-16\n"
+            "Tunic,PC,,99999999999999999999,RPG,2022-03-16\n"
+        )
+        self.client.login(username='alice', password='password')
+        response = self.client.post(reverse('gaming:progress-import'), {
+            'file': SimpleUploadedFile('library.csv', export.encode()),
+            'share_to_feed': 'on',
+        })
+
+        report = response.context['report']
+        self.assertEqual((report['rows'], report['created'], report['updated'], report['games_created']), (6, 1, 1, 1))
+        self.assertEqual([error['row'] for error in report['errors']], [3, 4, 5, 6])
+        self.assertIn('Nonexistent Quest', report['errors'][0]['error'])
+        self.assertIn('cannot be more than', report['errors'][3]['error'])
+
+        progress.refresh_from_db()
+        self.assertEqual((progress.completion_status, progress.hours_played, progress.status_key), ('Completed', 80, 3))
+        hades = Game.objects.get(title='Hades')
+        self.assertEqual(list(hades.platforms.all()), [self.platform])
+        self.assertEqual(Progress.objects.get(user=self.user, game=hades).game_title, 'Hades')
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+
+        # One feed item announces the new games instead of one per entry
+        feed_items = FeedItem.objects.filter(user=self.user)
+        self.assertEqual(feed_items.count(), 1)
+        self.assertIn('Hades', feed_items.get().content_object.message)
+
+    def test_json_import_queries_do_not_grow_with_rows(self):
+        def library(count, prefix):
+            return [
+                {'title': f'{prefix} {i}', 'platform': 'PC', 'hours_played': str(i), 'genre': 'RPG',
+                 'release_date': '2024-01-01'}
+                for i in range(count)
+            ]
+
+        import_library(self.user, library(1, 'First'), share_to_feed=False)  # Creates the user's rollup row
+        with CaptureQueriesContext(connection) as small:
+            import_library(self.user, library(5, 'Small'), share_to_feed=False)
+        with CaptureQueriesContext(connection) as large:
+            report = import_library(self.user, library(50, 'Large'), share_to_feed=False)
+        self.assertEqual(report['created'], 50)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+
+    def test_unparseable_export_is_rejected(self):
+        self.client.login(username='alice', password='password')
+        response = self.client.post(reverse('gaming:progress-import'), {
+            'file': SimpleUploadedFile('library.json', b'{"games": 3}'),
+        })
+        self.assertFormError(
+            response.context['form'], 'file', 'A JSON export must be a list of games, or {"games": [...]}.',
+        )
+
+
+class SessionIngestTests(GamingTestCase):
+    """
+    Tests for the batched play-session ingestion API.
+    """
+
+    def ingest(self, batch_id, sessions):
+        return self.client.post(
+            reverse('gaming:progress-sessions'),
+            json.dumps({'batch_id': batch_id, 'sessions': sessions}),
+            content_type='application/json',
+        )
+
+    def test_sessions_are_aggregated_and_minutes_carried(self):
+        progress = Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=5)
+        other_game = Game.objects.create(
+            title='Tunic', genre=self.genre, release_date=date(2022, 3, 16),
+            developer='Tunic Team', publisher='Finji',
+        )
+        self.client.login(username='alice', password='password')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.ingest('batch-1', [
+                {'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 50, 'achievements': 1},
+                {'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 20},
+                {'game': other_game.pk, 'platform': self.platform.pk, 'minutes': 95, 'achievements': 2},
+            ])
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual((result['sessions'], result['duplicate']), (3, False))
+        progress.refresh_from_db()
+        self.assertEqual((progress.hours_played, progress.session_minutes, progress.achievements), (6, 10, 1))
+        created = Progress.objects.get(user=self.user, game=other_game)
+        self.assertEqual(
+            (created.completion_status, created.hours_played, created.session_minutes, created.game_title),
+            ('In Progress', 1, 35, 'Tunic'),
+        )
+        self.assertEqual([entry['progress_id'] for entry in result['entries']], [progress.pk, created.pk])
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+        # The newly tracked game may change friend suggestions
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.suggestions_stale)
+        Profile.objects.update(suggestions_stale=False)
+
+        # The carried minutes complete an hour on the next batch, which leaves suggestions alone
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ingest('batch-2', [{'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 55}])
+        progress.refresh_from_db()
+        self.assertEqual((progress.hours_played, progress.session_minutes), (7, 5))
+        self.assertFalse(Profile.objects.filter(suggestions_stale=True).exists())
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+
+    def test_replayed_batch_is_not_applied_twice(self):
+        progress = Progress.objects.create(user=self.user, game=self.game, platform=self.platform, hours_played=5)
+        self.client.login(username='alice', password='password')
+        sessions = [{'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 120}]
+        first = self.ingest('retry-me', sessions).json()
+        replay = self.ingest('retry-me', sessions).json()
+
+        self.assertTrue(replay['duplicate'])
+        self.assertEqual(replay['entries'], first['entries'])
+        progress.refresh_from_db()
+        self.assertEqual(progress.hours_played, 7)
+
+    def test_invalid_batch_is_rejected(self):
+        self.client.login(username='alice', password='password')
+        response = self.ingest('bad', [{'game': self.game.pk, 'platform': self.platform.pk, 'minutes': -5}])
+        self.assertEqual(response.status_code, 400)
+        response = self.ingest('bad', [{'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 2 ** 70}])
+        self.assertEqual(response.status_code, 400)
+        response = self.ingest('bad', [{'game': 2 ** 70, 'platform': self.platform.pk, 'minutes': 5}])
+        self.assertEqual(response.status_code, 400)
+        response = self.ingest('bad', [{'game': 0, 'platform': self.platform.pk, 'minutes': 5}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Progress.objects.filter(user=self.user).exists())
+
+
+class SessionTokenAuthTests(GamingTestCase):
+    """
+    Tests for posting play sessions with an API token instead of a browser session.
+    """
+
+    def post_batch(self, client, **headers):
+        return client.post(
+            reverse('gaming:progress-sessions'),
+            json.dumps({'batch_id': 'tracker-1', 'sessions': [
+                {'game': self.game.pk, 'platform': self.platform.pk, 'minutes': 90},
+            ]}),
+            content_type='application/json',
+            **headers,
+        )
+
+    def test_token_clients_need_no_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        output = StringIO()
+        call_command('issue_api_token', 'alice', stdout=output)
+        token = output.getvalue().split()[0]
+
+        response = self.post_batch(client, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Progress.objects.get(user=self.user).hours_played, 1)
+
+        response = self.post_batch(client, HTTP_AUTHORIZATION='Bearer not-the-token')
+        self.assertEqual(response.status_code, 401)
+
+    def test_browser_sessions_are_still_csrf_checked(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='alice', password='password')
+        self.assertEqual(self.post_batch(client).status_code, 403)
+        self.assertFalse(Progress.objects.filter(user=self.user).exists())
+
+
+class ProgressBulkEditTests(GamingTestCase):
+    """
+    Tests for editing several progress entries at once from the progress list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other_game = Game.objects.create(
+            title='Hades', genre=self.genre, release_date=date(2020, 9, 17),
+            developer='Supergiant Games', publisher='Supergiant Games',
+        )
+        self.other_game.platforms.add(self.platform)
+        self.entries = [
+            Progress.objects.create(user=self.user, game=game, platform=self.platform, hours_played=10)
+            for game in (self.game, self.other_game)
+        ]
+        self.client.login(username='alice', password='password')
+
+    def test_selected_entries_are_updated_and_announced_once(self):
+        response = self.client.post(reverse('gaming:progress-bulk-edit'), {
+            'entries': [progress.pk for progress in self.entries],
+            'completion_status': 'Completed',
+            'share_to_feed': 'on',
+        })
+
+        self.assertRedirects(response, reverse('gaming:progress-list'))
+        for progress in self.entries:
+            progress.refresh_from_db()
+            self.assertEqual((progress.completion_status, progress.status_key), ('Completed', 3))
+        self.assertEqual(check_user_stats([self.user.pk]), [])
+        feed_items = FeedItem.objects.filter(user=self.user)
+        self.assertEqual(feed_items.count(), 1)
+        self.assertEqual(feed_items.get().content_object.message, "Marked 2 games as Completed: Elden Ring, Hades.")
+
+    def test_entries_of_other_users_are_rejected(self):
+        foreign = Progress.objects.create(user=self.friend_user, game=self.game, platform=self.platform)
+        response = self.client.post(reverse('gaming:progress-bulk-edit'), {
+            'entries': [self.entries[0].pk, foreign.pk],
+            'completion_status': 'Wishlist',
+        }, follow=True)
+
+        self.assertContains(response, "You can only edit your own progress entries.")
+        self.assertFalse(Progress.objects.filter(completion_status='Wishlist').exists())
+
+    def test_platform_must_be_available_for_every_game(self):
+        console = Platform.objects.create(name='Console')
+        self.game.platforms.add(console)
+        response = self.client.post(reverse('gaming:progress-bulk-edit'), {
+            'entries': [progress.pk for progress in self.entries],
+            'platform': console.pk,
+        }, follow=True)
+
+        self.assertContains(response, "Not available on Console: Hades.")
+        self.assertFalse(Progress.objects.filter(platform=console).exists())
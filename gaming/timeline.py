@@ -0,0 +1,204 @@
+# gaming/timeline.py
+
+"""
+Materialized News Feed Timelines for the Gaming Application.
+
+Every user owns a timeline of TimelineEntry rows pointing at the FeedItems they should see:
+their own activity and their friends' activity. Timelines are filled on write instead of being
+rebuilt on every news feed request.
+
+Functions:
+- fan_out_feed_item: Deliver a new FeedItem to its author and the author's friends.
+- backfill_friendship: Deliver each friend's existing feed items to the other's timeline.
+- prune_friendship: Remove each former friend's feed items from the other's timeline.
+- rebuild_timeline: Recompute a user's timeline from scratch.
+- timeline_events: Stream new timeline entries as server-sent events.
+
+Because every new feed item a user should see lands on their timeline, the TimelineEntry table
+doubles as a database-backed pub-sub channel for live feed updates: subscribers poll their own
+timeline for entries newer than the last one they received. No external broker is needed.
+"""
+
+import asyncio
+import json
+
+from django.db.models import Q
+
+from .models import FeedItem, Friend, Profile, TimelineEntry
+
+# Number of TimelineEntry rows inserted per INSERT statement
+BATCH_SIZE = 500
+
+# Live stream tuning: seconds between polls, seconds before the client reconnects,
+# and the maximum number of feed item ids sent in one event
+STREAM_POLL_INTERVAL = 2
+STREAM_LIFETIME = 55
+STREAM_BATCH_SIZE = 50
+
+# Seconds between reconnects when the stream cannot be held open (under a WSGI server)
+SYNC_POLL_INTERVAL = 15
+
+
+def _deliver(owner_ids, items):
+    """
+    Insert timeline entries for every owner and item, skipping items already on a timeline.
+
+    Args:
+        owner_ids (iterable): The primary keys of the timeline owners.
+        items (iterable): (feed_item_id, timestamp) pairs to deliver.
+
+    Returns:
+        None
+    """
+    owner_ids = list(owner_ids)
+    entries = [
+        TimelineEntry(owner_id=owner_id, feed_item_id=feed_item_id, timestamp=timestamp)
+        for feed_item_id, timestamp in items
+        for owner_id in owner_ids
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def _friend_user_ids(user_id):
+    """
+    Return the user ids of a user's friends, read from the Friend rows.
+
+    The cached friend-id sets may briefly lag a friendship change, and an item missed by
+    the fan-out never reaches the timeline, so timelines are never built from them.
+    """
+    profile_id = Profile.objects.filter(user_id=user_id).values_list('pk', flat=True).first()
+    if profile_id is None:
+        return set()
+    pairs = (
+        Friend.objects
+        .filter(Q(profile1_id=profile_id) | Q(profile2_id=profile_id))
+        .values_list('profile1__user_id', 'profile2__user_id')
+    )
+    user_ids = {pk for pair in pairs for pk in pair}
+    user_ids.discard(user_id)
+    return user_ids
+
+
+def fan_out_feed_item(feed_item):
+    """
+    Deliver a newly created feed item to its author's timeline and to every friend's timeline.
+
+    Args:
+        feed_item (FeedItem): The feed item that was just created.
+
+    Returns:
+        None
+    """
+    owner_ids = {feed_item.user_id, *_friend_user_ids(feed_item.user_id)}
+    _deliver(owner_ids, [(feed_item.pk, feed_item.timestamp)])
+
+
+def backfill_friendship(profile1_id, profile2_id):
+    """
+    Deliver each profile's existing feed items to the other profile's timeline.
+
+    Args:
+        profile1_id (int): The primary key of one end of the friendship.
+        profile2_id (int): The primary key of the other end of the friendship.
+
+    Returns:
+        None
+    """
+    user_ids = dict(Profile.objects.filter(pk__in=[profile1_id, profile2_id]).values_list('pk', 'user_id'))
+    if len(user_ids) != 2:
+        return
+
+    for owner_pk, author_pk in ((profile1_id, profile2_id), (profile2_id, profile1_id)):
+        items = FeedItem.objects.filter(user_id=user_ids[author_pk]).values_list('pk', 'timestamp')
+        _deliver([user_ids[owner_pk]], items.iterator())
+
+
+def prune_friendship(profile1_id, profile2_id):
+    """
+    Remove each profile's feed items from the other profile's timeline.
+
+    Nothing is removed while another Friend row still links the two profiles.
+
+    Args:
+        profile1_id (int): The primary key of one end of the former friendship.
+        profile2_id (int): The primary key of the other end of the former friendship.
+
+    Returns:
+        None
+    """
+    still_friends = Friend.objects.filter(
+        (Q(profile1_id=profile1_id) & Q(profile2_id=profile2_id)) |
+        (Q(profile1_id=profile2_id) & Q(profile2_id=profile1_id))
+    ).exists()
+    if still_friends:
+        return
+
+    user_ids = dict(Profile.objects.filter(pk__in=[profile1_id, profile2_id]).values_list('pk', 'user_id'))
+    if len(user_ids) != 2:
+        # One side is being deleted; its timeline entries cascade with the user.
+        return
+
+    for owner_pk, author_pk in ((profile1_id, profile2_id), (profile2_id, profile1_id)):
+        TimelineEntry.objects.filter(
+            owner_id=user_ids[owner_pk],
+            feed_item__user_id=user_ids[author_pk],
+        ).delete()
+
+
+def rebuild_timeline(user):
+    """
+    Recompute a user's timeline from their own and their friends' feed items.
+
+    Used to repair timelines that have drifted, e.g. after bulk data changes.
+
+    Args:
+        user (User): The timeline owner.
+
+    Returns:
+        int: The number of entries on the rebuilt timeline.
+    """
+    author_ids = {user.pk, *_friend_user_ids(user.pk)}
+
+    TimelineEntry.objects.filter(owner=user).delete()
+    items = FeedItem.objects.filter(user_id__in=author_ids).values_list('pk', 'timestamp')
+    _deliver([user.pk], items.iterator())
+    return TimelineEntry.objects.filter(owner=user).count()
+
+
+async def timeline_events(owner_id, after_id, poll_interval=STREAM_POLL_INTERVAL, lifetime=STREAM_LIFETIME):
+    """
+    Yield server-sent event chunks announcing timeline entries newer than after_id.
+
+    Each 'feed' event carries the ids of the newly delivered feed items, oldest first, and
+    uses the last timeline entry id as its event id so a reconnecting EventSource resumes
+    where it left off (Last-Event-ID). The stream ends after `lifetime` seconds; clients
+    reconnect automatically.
+
+    Args:
+        owner_id (int): The primary key of the subscribing user.
+        after_id (int): Only entries with a larger primary key are announced.
+        poll_interval (float): Seconds to wait between polls when nothing is new.
+        lifetime (float): Seconds after which the stream ends.
+
+    Yields:
+        str: Server-sent event chunks.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + lifetime
+    yield f"retry: {int(poll_interval * 1000)}\n\n"
+    while True:
+        entries = [
+            entry async for entry in TimelineEntry.objects
+            .filter(owner_id=owner_id, pk__gt=after_id)
+            .order_by('pk')
+            .values_list('pk', 'feed_item_id')[:STREAM_BATCH_SIZE]
+        ]
+        if entries:
+            after_id = entries[-1][0]
+            data = json.dumps({'feed_item_ids': [feed_item_id for _, feed_item_id in entries]})
+            yield f"id: {after_id}\nevent: feed\ndata: {data}\n\n"
+            continue  # Drain any backlog before sleeping
+        if loop.time() >= deadline:
+            return
+        yield ": keep-alive\n\n"
+        await asyncio.sleep(poll_interval)
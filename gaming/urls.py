@@ -11,6 +11,11 @@ urlpatterns = [
     # Summary URL
     path('', views.SummaryView.as_view(), name='summary'),
     path('summary/', views.SummaryView.as_view(), name='summary'),
+    path('summary/data/', views.SummaryDataView.as_view(), name='summary-data'),
+
+    # Leaderboard URLs
+    path('leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'),
+    path('leaderboard/<str:scope>/<int:pk>/', views.LeaderboardView.as_view(), name='leaderboard-scope'),
 
     # Progress URLs
     path('progress/', views.ProgressListView.as_view(), name='progress-list'),
@@ -19,6 +24,9 @@ urlpatterns = [
     path('progress/update/<int:pk>/', views.ProgressUpdateView.as_view(), name='progress-update'),
     path('progress/<int:pk>/edit_form/', views.ProgressEditFormView.as_view(), name='progress-edit-form'),
     path('progress/add/', views.ProgressAddView.as_view(), name='progress-add'),
+    path('progress/import/', views.ProgressImportView.as_view(), name='progress-import'),
+    path('progress/bulk_edit/', views.ProgressBulkEditView.as_view(), name='progress-bulk-edit'),
+    path('progress/sessions/', views.SessionIngestView.as_view(), name='progress-sessions'),
 
     # Social Feature URLs
     path('profiles/', views.ShowAllProfilesView.as_view(), name='show-all-profiles'),
@@ -31,6 +39,8 @@ urlpatterns = [
 
     # News Feed URLs
     path('news-feed/', views.ShowNewsFeedView.as_view(), name='news-feed'),
+    path('news-feed/stream/', views.NewsFeedStreamView.as_view(), name='news-feed-stream'),
+    path('news-feed/items/', views.NewsFeedItemsView.as_view(), name='news-feed-items'),
     path('status/create/', views.CreateStatusMessageView.as_view(), name='create-status-message'),
     path('status/update/<int:pk>/', views.UpdateStatusMessageView.as_view(), name='update-status-message'),
     path('status/delete/<int:pk>/', views.DeleteStatusMessageView.as_view(), name='delete-status-message'),
@@ -38,6 +48,8 @@ urlpatterns = [
     # Interaction URLs
     path('comment/create/', views.CreateCommentView.as_view(), name='create-comment'),
     path('like/toggle/', views.ToggleLikeView.as_view(), name='toggle-like'),
+    path('like/toggle/json/', views.ToggleLikeJsonView.as_view(), name='toggle-like-json'),
+    path('feed_item/<int:pk>/comments/', views.FeedItemCommentsView.as_view(), name='feed-item-comments'),
 
     # Authentication URLs
     path('login/', auth_views.LoginView.as_view(template_name='registration/login.html'), name='login'),
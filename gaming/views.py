@@ -22,53 +22,67 @@ Class-Based Views:
 - ShowFriendSuggestionsView
 - CreateCommentView
 - ToggleLikeView
+- ToggleLikeJsonView
+- FeedItemCommentsView
 - ShowNewsFeedView
+- NewsFeedStreamView
+- NewsFeedItemsView
 - FriendsProgressListView
 - SummaryView
+- SummaryDataView
+- LeaderboardView
 - GameCreateView
 - ProgressCreateView
 - ProgressUpdateView
 - UpdateFeedItemView
 - DeleteFeedItemView
 - ProgressEditFormView
+- ProgressImportView
+- ProgressBulkEditView
+- SessionIngestView
 
 Mixins:
 - ProfileOwnerMixin
 
 """
 
+import json
 from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import (
-    Case,
-    Count,
-    Exists,
-    IntegerField,
-    Max,
-    OuterRef,
-    Q,
-    Sum,
-    When,
-)
-from django.http import HttpResponse, HttpResponseRedirect
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
+    FormView,
     ListView,
     TemplateView,
     UpdateView,
     View,
 )
 
+from .bulk import bulk_edit_progress, clean_sessions, import_library, ingest_sessions
+from .counters import COUNTED_MODELS, adjust_counter, sync_like_count
+from .feed import FRAGMENT_CACHE_TIMEOUT, annotate_user_liked, load_feed_items
 from .forms import (
     CommentForm,
     CreateProfileForm,
@@ -76,28 +90,41 @@ from .forms import (
     FriendsProgressFilterForm,
     GameForm,
     GameSearchForm,
+    ProgressBulkEditForm,
     ProgressForm,
+    ProgressImportForm,
     UpdateProfileForm,
     UpdateStatusMessageForm,
 )
 from .models import (
+    ApiToken,
     Comment,
     FeedItem,
     Friend,
+    FriendSuggestion,
     Game,
+    Genre,
     Like,
     Platform,
+    PlayerNeighbour,
     Profile,
     Progress,
     StatusMessage,
+    TimelineEntry,
 )
+from .leaderboards import get_rank, top_players
+from .pagination import KeysetPaginator, parse_id
+from .recommendations import recommend_games
+from .stats import get_summary, summary_etag
+from .timeline import STREAM_BATCH_SIZE, SYNC_POLL_INTERVAL, timeline_events
 
 
 class ProgressListView(LoginRequiredMixin, ListView):
     """
     Displays a paginated list of the logged-in user's progress entries.
 
-    The entries are ordered based on a custom completion status order and game title.
+    The entries are ordered by completion status, in the order of Progress.COMPLETION_STATUS_CHOICES,
+    and game title.
     """
     model = Progress
     template_name = 'gaming/progress_list.html'
@@ -108,36 +135,45 @@ class ProgressListView(LoginRequiredMixin, ListView):
         """
         Customize the queryset to order progress entries by completion status and game title.
 
+        The order uses the entries' stored sort columns, so a page is read from the
+        (user, status_key, game_title) index without sorting the user's whole progress set.
+
         Returns:
             QuerySet: Ordered queryset of Progress instances for the logged-in user.
         """
-        # Define custom order for completion_status
-        status_order = Case(
-            When(completion_status='Not Started', then=1),
-            When(completion_status='In Progress', then=2),
-            When(completion_status='Completed', then=3),
-            When(completion_status='Wishlist', then=4),
-            default=5,
-            output_field=IntegerField(),
-        )
         return (
             Progress.objects
             .filter(user=self.request.user)
             .select_related('game', 'platform')
-            .annotate(status_order=status_order)
-            .order_by('status_order', 'game__title')
+            .order_by('status_key', 'game_title')
         )
 
+    def get_context_data(self, **kwargs):
+        """
+        Add the bulk-edit form for the listed entries to the context.
+
+        Args:
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            dict: Context data for the template.
+        """
+        context = super().get_context_data(**kwargs)
+        context['bulk_edit_form'] = ProgressBulkEditForm(user=self.request.user)
+        return context
+
 
 class ProgressAddView(LoginRequiredMixin, ListView):
     """
     Displays a list of games to add progress entries, with search and filtering capabilities.
 
-    If no games match the search query, offers an option to create a new game.
+    If no games match the search query, offers an option to create a new game. Games that players
+    with similar libraries also played are recommended from the precomputed co-occurrence index.
     """
     model = Game
     template_name = 'gaming/progress_add.html'
     context_object_name = 'games'
+    recommendation_limit = 5  # Number of recommended games shown
 
     def get_queryset(self):
         """
@@ -167,7 +203,7 @@ class ProgressAddView(LoginRequiredMixin, ListView):
         """
         Add additional context data to the template.
 
-        Includes the search form and logic to display a creation option if no games are found.
+        Includes the search form, game recommendations, and logic to display a creation option if no games are found.
 
         Returns:
             dict: Context data for the template.
@@ -175,6 +211,7 @@ class ProgressAddView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         form = GameSearchForm(self.request.GET or None)
         context['form'] = form
+        context['recommended_games'] = recommend_games(self.request.user, limit=self.recommendation_limit)
         query = self.request.GET.get('q', '')
         platform_id = self.request.GET.get('platform', '')
         release_year = self.request.GET.get('release_year', '')
@@ -195,6 +232,17 @@ class ProgressDetailView(LoginRequiredMixin, DetailView):
     template_name = 'gaming/progress_detail.html'
     context_object_name = 'progress_entry'
 
+    def get_object(self, queryset=None):
+        """
+        Retrieve the progress entry and mark whether the logged-in user has liked it.
+
+        Returns:
+            Progress: The progress entry, with user_liked set.
+        """
+        progress_entry = super().get_object(queryset)
+        annotate_user_liked([progress_entry], getattr(self.request.user, 'gaming_profile', None))
+        return progress_entry
+
 
 # Social Feature Views
 
@@ -584,10 +632,15 @@ class CreateFriendView(LoginRequiredMixin, View):
 class ShowFriendSuggestionsView(LoginRequiredMixin, DetailView):
     """
     Displays a list of suggested friends based on shared game genres and similar game ratings.
+
+    The suggestions are precomputed into the FriendSuggestion table and ranked by score. The
+    players whose overall ratings and play time are most similar are read from PlayerNeighbour.
     """
     model = Profile
     template_name = 'gaming/friend_suggestions.html'
     context_object_name = 'profile'
+    paginate_by = 10  # Number of suggestions per page
+    similar_players = 5  # Number of rating-similarity neighbours shown
 
     def get_object(self):
         """
@@ -600,49 +653,32 @@ class ShowFriendSuggestionsView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         """
-        Add friend suggestions and detailed match information to the context.
+        Add a page of friend suggestions and detailed match information to the context.
+
+        Suggestions and their reasons are precomputed (see gaming.suggestions), so the page
+        is read from the FriendSuggestion table with one query.
 
         Returns:
             dict: Context data for the template.
         """
         context = super().get_context_data(**kwargs)
-        suggestions = self.object.get_friend_suggestions()
-        context['suggestions'] = suggestions
-
-        # Gather user data
-        user_profile = self.object
-        user_progress = Progress.objects.filter(user=user_profile.user).select_related('game')
-        user_games = {p.game for p in user_progress}
-        user_genres = {p.game.genre for p in user_progress if p.game.genre is not None}
-        user_ratings = {p.game_id: p.rating for p in user_progress if p.rating}
-
-        for suggestion in suggestions:
-            suggestion_data = {
-                "genres": [],
-                "ratings": []
-            }
-
-            # Find genres that both have played
-            suggestion_progress = Progress.objects.filter(user=suggestion.user).select_related('game')
-            suggestion_genres = {sp.game.genre for sp in suggestion_progress if sp.game.genre is not None}
-            shared_genres = user_genres & suggestion_genres
-            if shared_genres:
-                suggestion_data["genres"] = [g.name for g in shared_genres]
-
-            # Find games and ratings that match
-            suggestion_ratings = {sp.game_id: sp.rating for sp in suggestion_progress if sp.rating}
-            for g_id, u_rating in user_ratings.items():
-                if g_id in suggestion_ratings and suggestion_ratings[g_id] == u_rating:
-                    shared_game = next((gm for gm in user_games if gm.pk == g_id), None)
-                    if shared_game is not None:
-                        suggestion_data["ratings"].append({
-                            "game": shared_game,
-                            "rating": u_rating
-                        })
-
-            # Attach details to the suggestion object
-            suggestion.details = suggestion_data
-
+        suggestions = FriendSuggestion.objects.filter(profile=self.object).select_related('candidate')
+        paginator = Paginator(suggestions, self.paginate_by)
+        page = paginator.get_page(self.request.GET.get('page'))
+        context.update({
+            'suggestions': page.object_list,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+        })
+
+        # Players with the most similar taste overall (see gaming.similarity), minus friends
+        context['similar_players'] = (
+            PlayerNeighbour.objects
+            .filter(profile=self.object)
+            .exclude(neighbour_id__in=self.object.get_friend_ids())
+            .select_related('neighbour')[:self.similar_players]
+        )
         return context
 
 
@@ -666,7 +702,9 @@ class CreateCommentView(LoginRequiredMixin, View):
             HttpResponse: Redirects to the news feed with a success message.
         """
         form = CommentForm(request.POST)
-        feed_item_id = request.POST.get('feed_item_id')
+        feed_item_id = parse_id(request.POST.get('feed_item_id'))
+        if feed_item_id is None:
+            raise Http404("Feed item not found.")
         feed_item = get_object_or_404(FeedItem, id=feed_item_id)
         content_object = feed_item.content_object
 
@@ -675,6 +713,7 @@ class CreateCommentView(LoginRequiredMixin, View):
             comment.profile = request.user.gaming_profile
             comment.content_object = content_object
             comment.save()
+            adjust_counter(content_object, 'comment_count', 1)
             messages.success(request, "Your comment has been added.")
 
         return redirect('gaming:news-feed')
@@ -689,7 +728,7 @@ class ToggleLikeView(LoginRequiredMixin, View):
         """
         Process POST requests to like or unlike a feed item.
 
-        Checks if the user has already liked the content object and toggles the like accordingly.
+        Removes the user's like if one exists, otherwise adds one, and adjusts the denormalized like count.
 
         Args:
             request (HttpRequest): The HTTP request object.
@@ -699,7 +738,9 @@ class ToggleLikeView(LoginRequiredMixin, View):
         Returns:
             HttpResponse: Redirects to the news feed with an appropriate message.
         """
-        feed_item_id = request.POST.get('feed_item_id')
+        feed_item_id = parse_id(request.POST.get('feed_item_id'))
+        if feed_item_id is None:
+            raise Http404("Feed item not found.")
         feed_item = get_object_or_404(FeedItem, id=feed_item_id)
         user_profile = request.user.gaming_profile
 
@@ -708,20 +749,15 @@ class ToggleLikeView(LoginRequiredMixin, View):
         content_type = ContentType.objects.get_for_model(type(content_object))
         object_id = content_object.pk
 
-        # Check if the user has already liked this content_object
-        like_exists = Like.objects.filter(
+        # Unlike the content_object if the user has already liked it
+        unliked, _ = Like.objects.filter(
             content_type=content_type,
             object_id=object_id,
             profile=user_profile
-        ).exists()
+        ).delete()
 
-        if like_exists:
-            # Unlike the content_object
-            Like.objects.filter(
-                content_type=content_type,
-                object_id=object_id,
-                profile=user_profile
-            ).delete()
+        if unliked:
+            adjust_counter(content_object, 'like_count', -unliked)
             messages.info(request, "You have unliked this post.")
         else:
             # Like the content_object
@@ -730,16 +766,123 @@ class ToggleLikeView(LoginRequiredMixin, View):
                 object_id=object_id,
                 profile=user_profile
             )
+            adjust_counter(content_object, 'like_count', 1)
             messages.success(request, "You have liked this post.")
 
         return redirect('gaming:news-feed')
 
 
+class ToggleLikeJsonView(LoginRequiredMixin, View):
+    """
+    Toggles a like on a feed item's content via AJAX and returns the new state as JSON.
+
+    The toggle is a conditional delete followed, only if nothing was deleted, by an insert that
+    ignores conflicts on the Like unique constraint. Concurrent clicks therefore never raise an
+    IntegrityError, and the like count is recomputed in the same transaction so it cannot drift.
+    """
+    raise_exception = True  # Respond 403 instead of redirecting AJAX requests to the login page
+
+    def post(self, request, *args, **kwargs):
+        """
+        Process POST requests to like or unlike a feed item.
+
+        Args:
+            request (HttpRequest): The HTTP request object (expects 'feed_item_id').
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse: {'feed_item_id', 'liked', 'like_count'}, or {'error'} with status 400.
+
+        Raises:
+            Http404: If the feed item does not exist.
+        """
+        feed_item_id = parse_id(request.POST.get('feed_item_id'))
+        if feed_item_id is None:
+            return JsonResponse({'error': "feed_item_id must be a feed item id."}, status=400)
+        feed_item = (
+            FeedItem.objects
+            .filter(pk=feed_item_id)
+            .values('pk', 'content_type_id', 'object_id')
+            .first()
+        )
+        if feed_item is None:
+            raise Http404("Feed item not found.")
+        model = ContentType.objects.get_for_id(feed_item['content_type_id']).model_class()
+        if model not in COUNTED_MODELS:
+            return JsonResponse({'error': "This item cannot be liked."}, status=400)
+
+        like = {
+            'profile': request.user.gaming_profile,
+            'content_type_id': feed_item['content_type_id'],
+            'object_id': feed_item['object_id'],
+        }
+        with transaction.atomic():
+            unliked, _ = Like.objects.filter(**like).delete()
+            if not unliked:
+                Like.objects.bulk_create([Like(**like)], ignore_conflicts=True)
+            like_count = sync_like_count(model, feed_item['object_id'])
+
+        return JsonResponse({
+            'feed_item_id': feed_item['pk'],
+            'liked': not unliked,
+            'like_count': like_count,
+        })
+
+
+class FeedItemCommentsView(LoginRequiredMixin, View):
+    """
+    Returns a page of older comments on a feed item's content as rendered HTML in JSON.
+
+    Comments are paged newest first by (timestamp, id) cursors, starting from the
+    comments_cursor rendered with the feed item.
+    """
+    paginate_by = 10  # Number of comments per page
+
+    def get(self, request, *args, **kwargs):
+        """
+        Process GET requests for the page of comments before the 'cursor' GET parameter.
+
+        Only feed items on the user's own news feed can be read.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments (expects 'pk', the feed item id).
+
+        Returns:
+            JsonResponse: {'html', 'next_cursor'}
+        """
+        feed_item_id = parse_id(kwargs.get('pk'))
+        if feed_item_id is None:
+            raise Http404("Feed item not found.")
+        feed_item = get_object_or_404(FeedItem, pk=feed_item_id, timeline_entries__owner=request.user)
+        comments = Comment.objects.filter(
+            content_type_id=feed_item.content_type_id,
+            object_id=feed_item.object_id,
+        ).select_related('profile')
+
+        paginator = KeysetPaginator(comments, self.paginate_by)
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except ValidationError:
+            raise Http404("Invalid cursor.")
+
+        # Pages are newest first; render them oldest first above the comments already shown
+        html = render_to_string(
+            'gaming/comment_list.html',
+            {'comments': page.object_list[::-1]},
+            request=request,
+        )
+        return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
+
 class ShowNewsFeedView(LoginRequiredMixin, ListView):
     """
     Displays the news feed consisting of feed items from the user and their friends.
 
-    The feed is ordered by the most recent items first and includes pagination.
+    The feed is ordered by the most recent items first and is paginated with opaque
+    (timestamp, id) cursors, so no total count is taken and deep pages cost the same as the first.
     """
     model = FeedItem
     template_name = 'gaming/news_feed.html'
@@ -750,20 +893,42 @@ class ShowNewsFeedView(LoginRequiredMixin, ListView):
         """
         Customize the queryset to include feed items from the user and their friends.
 
+        Reads the user's materialized timeline, which is filled when feed items are created
+        and when friendships change, so no friend lookup is needed here.
+
         Returns:
-            QuerySet: Ordered queryset of FeedItem instances.
+            QuerySet: Queryset of the user's TimelineEntry instances.
         """
-        user_profile = self.request.user.gaming_profile
-        friends = user_profile.get_friends()
-        user_qs = Profile.objects.filter(pk=user_profile.pk)
-        profiles = friends | user_qs
-        user_pks = profiles.values_list('user__pk', flat=True)
+        return TimelineEntry.objects.filter(
+            owner=self.request.user
+        ).select_related('feed_item__user__gaming_profile')
 
-        queryset = FeedItem.objects.filter(
-            user__pk__in=user_pks
-        ).select_related('user').order_by('-timestamp')
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate the timeline with the cursor from the 'cursor' GET parameter.
 
-        return queryset
+        The content objects of the page are loaded in batches before rendering.
+
+        Args:
+            queryset (QuerySet): The timeline entries to paginate.
+            page_size (int): Number of feed items per page.
+
+        Raises:
+            Http404: If the cursor is malformed.
+
+        Returns:
+            tuple: (paginator, page, feed items, is_paginated)
+        """
+        paginator = KeysetPaginator(queryset, page_size, id_field='feed_item_id')
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except ValidationError:
+            raise Http404("Invalid cursor.")
+        feed_items = load_feed_items(
+            [entry.feed_item for entry in page],
+            profile=self.request.user.gaming_profile,
+        )
+        return paginator, page, feed_items, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         """
@@ -775,8 +940,15 @@ class ShowNewsFeedView(LoginRequiredMixin, ListView):
             dict: Context data for the template.
         """
         context = super().get_context_data(**kwargs)
+        context['fragment_cache_timeout'] = FRAGMENT_CACHE_TIMEOUT
         context['comment_form'] = CommentForm()
         context['form'] = CreateStatusMessageForm()  # Status message form
+
+        # Only the newest page subscribes to live updates, from the newest entry already shown
+        context['stream_after'] = None
+        if not context['page_obj'].has_previous:
+            latest = TimelineEntry.objects.filter(owner=self.request.user).aggregate(latest=Max('pk'))['latest']
+            context['stream_after'] = latest or 0
         context['progress_form'] = ProgressForm()      # Progress entry form
 
         # Add user's own progress entries to context
@@ -786,6 +958,93 @@ class ShowNewsFeedView(LoginRequiredMixin, ListView):
         return context
 
 
+class NewsFeedStreamView(View):
+    """
+    Streams live news feed updates to the browser as server-sent events.
+
+    Each event lists the ids of feed items newly delivered to the user's timeline; the
+    browser then fetches just those items from NewsFeedItemsView. The view is asynchronous,
+    so under an ASGI server an open stream holds no worker thread while it waits.
+
+    A WSGI server consumes the whole stream before sending it and holds a worker meanwhile,
+    so under WSGI the stream answers one poll and ends at once, telling the browser to
+    reconnect after SYNC_POLL_INTERVAL seconds: the EventSource degrades to a short poll.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Process GET requests by opening the event stream.
+
+        The stream starts after the timeline entry id in the Last-Event-ID header (sent by
+        reconnecting browsers) or the 'after' GET parameter, defaulting to the newest entry.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Raises:
+            PermissionDenied: If the user is not logged in.
+
+        Returns:
+            StreamingHttpResponse: A text/event-stream response.
+        """
+        user = await sync_to_async(lambda: request.user if request.user.is_authenticated else None)()
+        if user is None:
+            raise PermissionDenied
+
+        after_id = parse_id(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+        if after_id is None:
+            latest = await TimelineEntry.objects.filter(owner=user).aaggregate(latest=Max('pk'))
+            after_id = latest['latest'] or 0
+
+        if isinstance(request, ASGIRequest):
+            events = timeline_events(user.pk, after_id)
+        else:
+            events = timeline_events(user.pk, after_id, poll_interval=SYNC_POLL_INTERVAL, lifetime=0)
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Keep reverse proxies from buffering the stream
+        return response
+
+
+class NewsFeedItemsView(LoginRequiredMixin, View):
+    """
+    Renders selected feed items of the user's news feed, for insertion by the live stream.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Process GET requests for the comma-separated feed item ids in the 'ids' GET parameter.
+
+        Only items on the user's own timeline are rendered, newest first. Their content
+        objects are loaded in batches, exactly as on the news feed page.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            HttpResponse: The rendered feed items.
+        """
+        ids = [parse_id(value) for value in request.GET.get('ids', '').split(',')]
+        ids = [pk for pk in ids if pk is not None][:STREAM_BATCH_SIZE]
+        entries = TimelineEntry.objects.filter(
+            owner=request.user,
+            feed_item_id__in=ids,
+        ).select_related('feed_item__user__gaming_profile').order_by('-timestamp', '-feed_item_id')
+        feed_items = load_feed_items(
+            [entry.feed_item for entry in entries],
+            profile=request.user.gaming_profile,
+        )
+        return render(request, 'gaming/feed_items.html', {
+            'news_feed': feed_items,
+            'comment_form': CommentForm(),
+            'fragment_cache_timeout': FRAGMENT_CACHE_TIMEOUT,
+        })
+
+
 class FriendsProgressListView(LoginRequiredMixin, ListView):
     """
     Displays a list of progress entries from the user's friends, with filtering options.
@@ -805,8 +1064,8 @@ class FriendsProgressListView(LoginRequiredMixin, ListView):
             QuerySet: Filtered queryset of Progress instances from friends.
         """
         user_profile = self.request.user.gaming_profile
-        friends = user_profile.get_friends()
-        queryset = Progress.objects.filter(user__gaming_profile__in=friends).select_related('user', 'game', 'platform')
+        friend_ids = user_profile.get_friend_ids()
+        queryset = Progress.objects.filter(user__gaming_profile__in=friend_ids).select_related('user', 'game', 'platform')
 
         # Get filters from GET parameters
         completion_status = self.request.GET.get('completion_status', '')
@@ -847,112 +1106,86 @@ class SummaryView(LoginRequiredMixin, TemplateView):
         """
         Add summary statistics to the context.
 
-        Includes total hours played, games completed, top games, genre distribution, platform popularity,
-        completion status breakdown, and hours played by genre.
+        Includes total hours played, games completed and the top game. The charts load their datasets
+        from SummaryDataView. The statistics are read from the user's rollups and cached until the
+        user's progress changes (see gaming.stats).
 
         Returns:
             dict: Context data for the template.
         """
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        progress_entries = Progress.objects.filter(user=user).select_related('game', 'platform')
+        context.update(get_summary(self.request.user))
+        return context
 
-        # Total Hours Played
-        total_hours = progress_entries.aggregate(total=Sum('hours_played'))['total'] or 0
 
-        # Games Completed
-        games_completed = progress_entries.filter(completion_status='Completed').count()
+@method_decorator(condition(etag_func=lambda request, *args, **kwargs: summary_etag(request.user)), name='get')
+class SummaryDataView(LoginRequiredMixin, View):
+    """
+    Returns the summary statistics and chart datasets of the user as JSON.
 
-        # Top game by hours
-        top_game_data = (
-            progress_entries
-            .values('game__title')
-            .annotate(total=Sum('hours_played'))
-            .order_by('-total')
-            .first()
-        )
-        top_game_title = top_game_data['game__title'] if top_game_data else "No games played"
-        top_game_hours = top_game_data['total'] if top_game_data else 0
-
-        # Top 5 games by hours
-        top_5 = (
-            progress_entries
-            .values('game__title')
-            .annotate(total=Sum('hours_played'))
-            .order_by('-total')[:5]
-        )
-        chart_labels = [entry['game__title'] for entry in top_5]
-        chart_data = [entry['total'] for entry in top_5]
-
-        # Genre Distribution (Pie)
-        genre_counts = (
-            progress_entries
-            .values('game__genre__name')
-            .annotate(count=Count('id'))
-            .filter(game__genre__name__isnull=False)
-        )
-        total_entries = sum(g['count'] for g in genre_counts)
-        genre_labels = [g['game__genre__name'] for g in genre_counts]
-        genre_data = [
-            (g['count'] / total_entries) * 100 if total_entries > 0 else 0
-            for g in genre_counts
-        ]
-        genre_data = [round(val, 2) for val in genre_data]
-
-        # Platform Popularity (Bar)
-        platform_counts = (
-            progress_entries
-            .values('platform__name')
-            .annotate(count=Count('id'))
-            .order_by()
-        )
-        platform_labels = [p['platform__name'] for p in platform_counts]
-        platform_data = [p['count'] for p in platform_counts]
-
-        # Completion Status Breakdown (Stacked Bar)
-        completed_count = progress_entries.filter(completion_status='Completed').count()
-        in_progress_count = progress_entries.filter(completion_status='In Progress').count()
-        not_started_count = progress_entries.filter(completion_status='Not Started').count()
-        wishlist_count = progress_entries.filter(completion_status='Wishlist').count()
-
-        status_labels = ["Status"]
-        completed_data = [completed_count]
-        in_progress_data = [in_progress_count]
-        wishlist_data = [wishlist_count]
-
-        # Hours Played by Genre (Horizontal Bar)
-        hours_by_genre = (
-            progress_entries
-            .values('game__genre__name')
-            .annotate(total=Sum('hours_played'))
-            .filter(game__genre__name__isnull=False)
-            .order_by('-total')
-        )
-        hours_genre_labels = [h['game__genre__name'] for h in hours_by_genre]
-        hours_genre_data = [h['total'] for h in hours_by_genre]
+    Responses carry a strong ETag versioned by the user's last progress change, so a
+    conditional request for an unchanged summary is answered 304 without reading it.
+    """
 
-        # Add to context
-        context['total_hours'] = total_hours
-        context['games_completed'] = games_completed
-        context['top_game_title'] = top_game_title
-        context['top_game_hours'] = top_game_hours
-        context['chart_labels'] = chart_labels
-        context['chart_data'] = chart_data
+    def get(self, request, *args, **kwargs):
+        """
+        Process GET requests for the summary datasets.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse: The summary values and chart datasets, keyed as in gaming.stats.compute_summary.
+        """
+        response = JsonResponse(get_summary(request.user))
+        # Per-user data: browsers may keep it but must revalidate it; shared caches must not store it
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class LeaderboardView(LoginRequiredMixin, TemplateView):
+    """
+    Displays the players with the most hours, globally or for one game, genre or platform.
+    """
+    template_name = 'gaming/leaderboard.html'
 
-        context['genre_labels'] = genre_labels
-        context['genre_data'] = genre_data
+    # Scope in the URL -> model of the ranked subject
+    SUBJECTS = {
+        'game': Game,
+        'genre': Genre,
+        'platform': Platform,
+    }
 
-        context['platform_labels'] = platform_labels
-        context['platform_data'] = platform_data
+    def get_context_data(self, **kwargs):
+        """
+        Add the top players of the leaderboard and the current user's rank to the context.
 
-        context['status_labels'] = status_labels
-        context['completed_data'] = completed_data
-        context['in_progress_data'] = in_progress_data
-        context['wishlist_data'] = wishlist_data
+        The top players are cached and the rank is read from the materialized rankings
+        (see gaming.leaderboards), so neither aggregates Progress entries.
 
-        context['hours_genre_labels'] = hours_genre_labels
-        context['hours_genre_data'] = hours_genre_data
+        Returns:
+            dict: Context data for the template.
 
+        Raises:
+            Http404: If the scope is unknown or its game, genre or platform does not exist.
+        """
+        context = super().get_context_data(**kwargs)
+        scope, pk = self.kwargs.get('scope', 'global'), self.kwargs.get('pk')
+        if scope == 'global':
+            subject = None
+        elif scope in self.SUBJECTS:
+            subject = get_object_or_404(self.SUBJECTS[scope], pk=pk)
+        else:
+            raise Http404("Unknown leaderboard.")
+
+        context['scope'] = scope
+        context['subject'] = subject
+        context['leaders'] = top_players(scope, pk)
+        context['my_rank'] = get_rank(self.request.user, scope, pk)
+        context['genres'] = Genre.objects.order_by('name')
+        context['platforms'] = Platform.objects.order_by('name')
         return context
 
 
@@ -1329,3 +1562,158 @@ class ProgressEditFormView(LoginRequiredMixin, DetailView):
         }
         html = render_to_string(self.template_name, context, request=request)
         return HttpResponse(html)
+
+
+class ProgressImportView(LoginRequiredMixin, FormView):
+    """
+    Imports progress entries in bulk from an uploaded CSV or JSON game-library export.
+
+    Rows are matched to the user's existing entries by game and platform and written in
+    chunked bulk transactions (see gaming.bulk); the page then reports the counts,
+    throughput and any rows that failed.
+    """
+    form_class = ProgressImportForm
+    template_name = 'gaming/progress_import.html'
+
+    def form_valid(self, form):
+        """
+        Import the parsed library rows and render the import report.
+
+        Args:
+            form (Form): The ProgressImportForm.
+
+        Returns:
+            HttpResponse: The import page with the report.
+        """
+        report = import_library(
+            self.request.user,
+            form.cleaned_data['file'],
+            share_to_feed=form.cleaned_data['share_to_feed'],
+        )
+        if report['created'] or report['updated']:
+            messages.success(
+                self.request,
+                f"Imported {report['created']} new and {report['updated']} updated progress entries.",
+            )
+        return self.render_to_response(self.get_context_data(form=self.form_class(), report=report))
+
+
+class ProgressBulkEditView(LoginRequiredMixin, FormView):
+    """
+    Sets the completion status and/or platform of the progress entries selected on the progress list.
+
+    Replaces one ProgressUpdateView round trip per entry: the selection is checked for
+    ownership in one query and written with one bulk_update (see gaming.bulk.bulk_edit_progress),
+    optionally announced by a single feed item.
+    """
+    form_class = ProgressBulkEditForm
+    http_method_names = ['post']
+    success_url = reverse_lazy('gaming:progress-list')
+
+    def get_form_kwargs(self):
+        """
+        Pass the logged-in user to the form, to limit the selectable entries.
+
+        Returns:
+            dict: Keyword arguments for the form.
+        """
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    def form_valid(self, form):
+        """
+        Apply the change to the selected entries and return to the progress list.
+
+        Args:
+            form (Form): The ProgressBulkEditForm.
+
+        Returns:
+            HttpResponse: A redirect to the progress list.
+        """
+        edited = bulk_edit_progress(
+            self.request.user,
+            form.cleaned_data['entries'],
+            completion_status=form.cleaned_data['completion_status'] or None,
+            platform=form.cleaned_data['platform'],
+            share_to_feed=form.cleaned_data['share_to_feed'],
+        )
+        messages.success(self.request, f"Updated {edited} progress entries.")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        """
+        Report the validation errors on the progress list.
+
+        Args:
+            form (Form): The ProgressBulkEditForm.
+
+        Returns:
+            HttpResponse: A redirect to the progress list.
+        """
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.success_url)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SessionIngestView(LoginRequiredMixin, View):
+    """
+    Ingests a batch of play sessions as JSON and applies them to the user's progress.
+
+    Sessions are aggregated per progress entry and written with atomic increments in one
+    transaction (see gaming.bulk.ingest_sessions). Each batch carries a client-chosen id, so a
+    client can safely retry a batch whose response it did not receive.
+
+    Automated trackers authenticate with an 'Authorization: Bearer <token>' header (see the
+    issue_api_token management command) and need no CSRF token; requests authenticated by a
+    browser session are still CSRF-checked.
+    """
+    raise_exception = True  # Respond 403 instead of redirecting API clients to the login page
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Authenticate API token requests, and CSRF-check the others.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            HttpResponse: The view's response, {'error'} with status 401 for an invalid token,
+                or a 403 for a failed CSRF check.
+        """
+        scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+        if scheme == 'Bearer':
+            user = ApiToken.authenticate(key.strip())
+            if user is None:
+                return JsonResponse({'error': "Invalid API token."}, status=401)
+            request.user = user
+        else:
+            rejected = CsrfViewMiddleware(lambda request: None).process_view(request, None, (), {})
+            if rejected is not None:
+                return rejected
+        return super().dispatch(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        """
+        Process POST requests with a batch of play sessions.
+
+        Args:
+            request (HttpRequest): The HTTP request object (expects a JSON body
+                {'batch_id', 'sessions': [{'game', 'platform', 'minutes', 'achievements'}]}).
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse: {'batch_id', 'sessions', 'entries', 'duplicate'}, or {'error'} with status 400.
+        """
+        try:
+            batch_id, sessions = clean_sessions(json.loads(request.body))
+        except ValueError as error:  # Includes malformed JSON
+            return JsonResponse({'error': str(error)}, status=400)
+
+        result, duplicate = ingest_sessions(request.user, batch_id, sessions)
+        return JsonResponse({**result, 'duplicate': duplicate})
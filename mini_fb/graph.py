@@ -0,0 +1,149 @@
+# graph.py
+
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.core.cache import cache
+
+from .models import Friend
+
+# Pending friendships merged into the CSR arrays at once
+MERGE_THRESHOLD = 1000
+
+# Bumped (see signals.py) when friendships are added or deleted, so a refresh needs no query
+# unless the graph changed
+ADDED_VERSION_KEY = 'mini_fb:friend-graph:added'
+DELETED_VERSION_KEY = 'mini_fb:friend-graph:deleted'
+
+
+def _new_version():
+    # A fresh version number that cannot repeat one evicted from the cache
+    return time.time_ns() // 1000
+
+
+def bump_graph_version(deleted=False):
+    """
+    Tell every process's graph that friendships were added or, if deleted, removed.
+    """
+    key = DELETED_VERSION_KEY if deleted else ADDED_VERSION_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def graph_versions():
+    """
+    Return the (added, deleted) versions of the friendship graph, starting missing ones afresh.
+    """
+    versions = cache.get_many([ADDED_VERSION_KEY, DELETED_VERSION_KEY])
+    missing = {key: _new_version() for key in (ADDED_VERSION_KEY, DELETED_VERSION_KEY) if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions[ADDED_VERSION_KEY], versions[DELETED_VERSION_KEY]
+
+
+class FriendGraph:
+    """
+    The friendship graph as a compact CSR adjacency, cached per process.
+
+    Neighbours of profile pk are indices[indptr[pk]:indptr[pk + 1]]. Whether the graph
+    changed is read from the cached graph versions; new Friend rows are then read
+    incrementally (by primary key) and kept in a small pending adjacency until
+    MERGE_THRESHOLD of them have accumulated; only a deletion forces a full reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.pending = defaultdict(set)
+        self.pending_edges = []
+        self.last_pk = 0
+        self.versions = None
+
+    def refresh(self):
+        # The cached versions tell us whether rows were added or deleted since the last refresh
+        versions = graph_versions()
+        with self._lock:
+            if versions == self.versions:
+                return
+            if self.versions is None or versions[1] != self.versions[1]:
+                # Friendships were deleted: reload everything
+                self._reset()
+
+            rows = list(Friend.objects.filter(pk__gt=self.last_pk).order_by('pk').values_list('pk', 'profile1_id', 'profile2_id'))
+            edges = [(a, b) for _, a, b in rows]
+            for a, b in edges:
+                if a != b:
+                    self.pending[a].add(b)
+                    self.pending[b].add(a)
+            self.pending_edges.extend(edges)
+            if rows:
+                self.last_pk = rows[-1][0]
+            self.versions = versions
+            if len(self.pending_edges) >= MERGE_THRESHOLD or not len(self.indices):
+                self._merge()
+
+    def _merge(self):
+        # Rebuild the CSR arrays from the current edges plus the pending ones
+        pending = np.array(self.pending_edges, dtype=np.int64).reshape(-1, 2)
+        src = np.concatenate([np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr)), pending[:, 0], pending[:, 1]])
+        dst = np.concatenate([self.indices, pending[:, 1], pending[:, 0]])
+        keep = src != dst
+        pairs = np.unique(np.stack([src[keep], dst[keep]], axis=1), axis=0)  # Sorted, without duplicate friendships
+
+        size = int(pairs.max()) + 2 if len(pairs) else 1
+        self.indptr = np.zeros(size, dtype=np.int64)
+        np.cumsum(np.bincount(pairs[:, 0], minlength=size - 1), out=self.indptr[1:])
+        self.indices = pairs[:, 1].copy()
+        self.pending = defaultdict(set)
+        self.pending_edges = []
+
+    def neighbours(self, pks):
+        # (profile, neighbour) pairs for the given profiles, each pair once; call with the lock held
+        pks = np.asarray(pks, dtype=np.int64)
+        known = pks[pks < len(self.indptr) - 1]
+        counts = self.indptr[known + 1] - self.indptr[known]
+        offsets = np.repeat(self.indptr[known] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        pairs = [np.stack([np.repeat(known, counts), self.indices[offsets]], axis=1)]
+        for pk in pks.tolist():
+            if pk in self.pending:
+                found = np.fromiter(self.pending[pk], dtype=np.int64)
+                pairs.append(np.stack([np.full(len(found), pk), found], axis=1))
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def friends(self, pk):
+        # Call with the lock held
+        return self.neighbours([pk])[:, 1]
+
+    def rank_non_friends(self, pk, limit):
+        """
+        Rank non-friends of a profile by the number of friends they have in common.
+
+        The ranking and the friend list are read from the same snapshot of the graph, under
+        the lock, so a concurrent refresh cannot mix two versions of the arrays.
+
+        Returns:
+            tuple: (up to limit (profile pk, mutual friend count) pairs, most mutual friends
+                first; the profile's friends' pks)
+        """
+        self.refresh()
+        with self._lock:
+            friends = self.friends(pk)
+            if not len(friends):
+                return [], []
+            candidates, counts = np.unique(self.neighbours(friends)[:, 1], return_counts=True)
+        keep = (candidates != pk) & ~np.isin(candidates, friends)
+        candidates, counts = candidates[keep], counts[keep]
+        order = np.lexsort((candidates, -counts))[:limit]
+        return list(zip(candidates[order].tolist(), counts[order].tolist())), friends.tolist()
+
+
+friend_graph = FriendGraph()
@@ -39,12 +39,23 @@ class Profile(models.Model):
         else:
             print(f"Friendship already exists between {self} and {other}.")
 
-    def get_friend_suggestions(self):
-        friends = self.get_friends()
-        friends_pks = [friend.pk for friend in friends]
-        friends_pks.append(self.pk)  # Exclude self
-
-        suggestions = Profile.objects.exclude(pk__in=friends_pks)
+    def get_friend_suggestions(self, limit=10):
+        # Rank non-friends by mutual friends using the in-memory friendship graph
+        from .graph import friend_graph
+        ranked, friends = friend_graph.rank_non_friends(self.pk, limit)
+        profiles = Profile.objects.in_bulk([pk for pk, _ in ranked])
+        suggestions = []
+        for pk, mutual_friends in ranked:
+            if pk in profiles:
+                profiles[pk].mutual_friends = mutual_friends
+                suggestions.append(profiles[pk])
+
+        # Fill any remaining slots with other non-friends
+        if len(suggestions) < limit:
+            excluded = [self.pk, *friends, *profiles]
+            for profile in Profile.objects.exclude(pk__in=excluded).order_by('pk')[:limit - len(suggestions)]:
+                profile.mutual_friends = 0
+                suggestions.append(profile)
         return suggestions
 
     def get_news_feed(self):
@@ -0,0 +1,27 @@
+# signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .graph import bump_graph_version
+from .models import Friend
+
+
+@receiver(post_save, sender=Friend)
+def friend_saved(sender, instance, created, **kwargs):
+    """
+    Tell the cached friendship graphs about a new friendship once it is committed.
+
+    An edited friendship may have changed its profiles, which needs the same full reload as
+    a deletion.
+    """
+    transaction.on_commit(lambda: bump_graph_version(deleted=not created))
+
+
+@receiver(post_delete, sender=Friend)
+def friend_deleted(sender, instance, **kwargs):
+    """
+    Tell the cached friendship graphs to reload once a friendship's deletion is committed.
+    """
+    transaction.on_commit(lambda: bump_graph_version(deleted=True))
@@ -1,3 +1,86 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from .graph import FriendGraph, friend_graph
+from .models import Friend, Profile
+
+
+class FriendGraphTests(TestCase):
+    """
+    Tests for the CSR friendship graph and the suggestions ranked from it.
+    """
+
+    def setUp(self):
+        # The process-wide graph and its cached versions must not carry state between tests
+        cache.clear()
+        friend_graph._reset()
+        self.profiles = [
+            Profile.objects.create(
+                first_name=name, last_name='Tester', city='Boston', email_address=f'{name}@example.com',
+            )
+            for name in ('ann', 'ben', 'cat', 'dan', 'eve', 'fay')
+        ]
+        self.ann, self.ben, self.cat, self.dan, self.eve, self.fay = self.profiles
+
+    def befriend(self, *pairs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [Friend.objects.create(profile1=a, profile2=b) for a, b in pairs]
+
+    def friends(self, graph, profile):
+        with graph._lock:
+            return sorted(graph.friends(profile.pk).tolist())
+
+    def test_refresh_merges_pending_friendships_and_reloads_after_deletions(self):
+        graph = FriendGraph()
+        self.befriend((self.ann, self.ben))
+        graph.refresh()  # The first refresh builds the CSR arrays
+        self.assertEqual(graph.indices.tolist(), [self.ben.pk, self.ann.pk])
+
+        with mock.patch('mini_fb.graph.MERGE_THRESHOLD', 2):
+            self.befriend((self.ann, self.cat))
+            graph.refresh()
+            self.assertEqual(graph.pending_edges, [(self.ann.pk, self.cat.pk)])  # Below the threshold
+            self.assertEqual(self.friends(graph, self.ann), [self.ben.pk, self.cat.pk])
+
+            self.befriend((self.dan, self.ann))
+            graph.refresh()
+            self.assertEqual(graph.pending_edges, [])  # Merged into the CSR arrays
+            self.assertEqual(self.friends(graph, self.ann), [self.ben.pk, self.cat.pk, self.dan.pk])
+            self.assertEqual(self.friends(graph, self.dan), [self.ann.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Friend.objects.filter(profile1=self.ann, profile2=self.ben).delete()
+        graph.refresh()
+        self.assertEqual(self.friends(graph, self.ann), [self.cat.pk, self.dan.pk])
+        self.assertEqual(self.friends(graph, self.ben), [])
+
+        # An unchanged graph is refreshed without querying the Friend table
+        with self.assertNumQueries(0):
+            graph.refresh()
+
+    def test_suggestions_are_ranked_by_mutual_friends(self):
+        # ann's friends are ben and cat; dan knows both of them, eve only ben
+        self.befriend(
+            (self.ann, self.ben), (self.cat, self.ann),
+            (self.ben, self.dan), (self.cat, self.dan), (self.eve, self.ben),
+        )
+        suggestions = self.ann.get_friend_suggestions(limit=2)
+        self.assertEqual(
+            [(profile.pk, profile.mutual_friends) for profile in suggestions],
+            [(self.dan.pk, 2), (self.eve.pk, 1)],
+        )
+
+    def test_suggestions_exclude_self_and_friends_and_fill_with_non_friends(self):
+        self.befriend((self.ann, self.ben), (self.ben, self.cat))
+        suggestions = self.ann.get_friend_suggestions()
+
+        # cat shares ben; the remaining slots are filled with the other non-friends
+        self.assertEqual(
+            [(profile.pk, profile.mutual_friends) for profile in suggestions],
+            [(self.cat.pk, 1), (self.dan.pk, 0), (self.eve.pk, 0), (self.fay.pk, 0)],
+        )
+        self.assertEqual([profile.pk for profile in self.fay.get_friend_suggestions(limit=3)], [
+            self.ann.pk, self.ben.pk, self.cat.pk,
+        ])
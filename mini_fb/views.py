@@ -177,13 +177,14 @@ class ShowFriendSuggestionsView(LoginRequiredMixin, DetailView):
     model = Profile
     template_name = 'mini_fb/friend_suggestions.html'
     context_object_name = 'profile'
+    suggestion_limit = 10  # Top N suggestions shown
 
     def get_object(self):
         return get_object_or_404(Profile, user=self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['suggestions'] = self.object.get_friend_suggestions()
+        context['suggestions'] = self.object.get_friend_suggestions(limit=self.suggestion_limit)
         return context
 
     